@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from enum import Enum
+from threading import Lock
+
+import numpy as np
+
+from ghedesigner.profiling import record_cache_access
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache for expensive intermediate results.
+
+    The caches below are disabled (maxsize of 0) by default, so one-off library and CLI runs
+    do not hold on to results. Long-running processes, such as the design server, enable them
+    to reuse g-functions, STS g-functions, preprocessed loads and field domains between designs.
+
+    Cached values are shared, so callers must not mutate them.
+    """
+
+    def __init__(self, name: str, maxsize: int = 0):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                record_cache_access(self.name, True)
+                return self._data[key]
+            self.misses += 1
+            record_cache_access(self.name, False)
+            return None
+
+    def put(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def as_dict(self) -> dict:
+        return {'name': self.name, 'size': len(self._data), 'maxsize': self.maxsize,
+                'hits': self.hits, 'misses': self.misses}
+
+
+G_FUNCTION_CACHE = LRUCache('g_function')
+STS_CACHE = LRUCache('sts_g_function')
+LOAD_CACHE = LRUCache('load_preprocessing')
+DOMAIN_CACHE = LRUCache('field_domain')
+
+ALL_CACHES = [G_FUNCTION_CACHE, STS_CACHE, LOAD_CACHE, DOMAIN_CACHE]
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Sets the maximum number of entries of all caches, 0 disables caching."""
+    for cache in ALL_CACHES:
+        cache.maxsize = maxsize
+
+
+def cache_stats() -> list:
+    return [cache.as_dict() for cache in ALL_CACHES]
+
+
+def clear_caches() -> None:
+    for cache in ALL_CACHES:
+        cache.clear()
+
+
+def cache_key(*args):
+    """
+    Builds a hashable key from numbers, strings, enums, arrays, containers and plain objects.
+
+    Plain objects, such as the media and borehole classes, are keyed by their attributes.
+    Frozen dataclasses, such as the design states, are hashable values and are used as is.
+    """
+
+    def make_key(obj):
+        if obj is None or isinstance(obj, (bool, int, float, str, bytes, Enum)):
+            return obj
+        if is_dataclass(obj) and obj.__dataclass_params__.frozen:
+            return obj
+        if isinstance(obj, np.ndarray):
+            return obj.shape, obj.dtype.str, obj.tobytes()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, (list, tuple)):
+            return tuple(make_key(x) for x in obj)
+        if isinstance(obj, dict):
+            return tuple((k, make_key(v)) for k, v in sorted(obj.items()))
+        if hasattr(obj, '__dict__'):
+            return type(obj).__name__, make_key(vars(obj))
+        return repr(obj)
+
+    return make_key(args)
@@ -0,0 +1,129 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ghedesigner.constants import TWO_PI
+from ghedesigner.ground_heat_exchangers import GHE
+from ghedesigner.ground_loads import HybridLoad
+from ghedesigner.profiling import timed
+
+
+class LoadCapacity:
+    """
+    Heat pump entering fluid temperatures of a sized design for scaled heating and cooling loads.
+
+    The hybrid loads are linear in the hourly heating and cooling loads, and the fluid temperatures
+    are linear in the hybrid loads, so the temperatures for any multipliers of the heating and cooling
+    loads follow from two unit responses. These are computed once from the hybrid loads of the design
+    at its borehole height, after which each query takes a few vector operations.
+    """
+
+    @timed('load_capacity')
+    def __init__(self, ghe: GHE):
+        self.min_eft_allowable = ghe.sim_params.min_EFT_allowable
+        self.max_eft_allowable = ghe.sim_params.max_EFT_allowable
+        self.ground_temperature = ghe.bhe.soil.ugt
+
+        # hybrid loads for doubled cooling or heating differ from the design loads by the cooling or heating part
+        raw_loads = np.asarray(ghe.hourly_extraction_ground_loads, dtype=np.float64)
+        hybrid_loads = []
+        for cooling_scale, heating_scale in [(1.0, 1.0), (2.0, 1.0), (1.0, 2.0)]:
+            scaled_loads = np.where(raw_loads >= 0.0, heating_scale * raw_loads, cooling_scale * raw_loads)
+            hybrid_loads.append(HybridLoad(scaled_loads, ghe.bhe_eq, ghe.radial_numerical, ghe.sim_params,
+                                           years=ghe.hybrid_load.years))
+        base, double_cooling, double_heating = hybrid_loads
+        time_values = base.hour[2:]
+
+        self.cooling_response = self.unit_response(ghe, (double_cooling.load - base.load)[2:], time_values)
+        self.heating_response = self.unit_response(ghe, (double_heating.load - base.load)[2:], time_values)
+
+    @staticmethod
+    def unit_response(ghe: GHE, load: np.ndarray, time_values: np.ndarray) -> np.ndarray:
+        """
+        Computes the change of the heat pump entering fluid temperature caused by a hybrid load, as in
+        GHE._simulate_detailed, with the superposition written as one matrix-vector product.
+
+        :param ghe: sized ground heat exchanger.
+        :param load: hybrid load, in kW.
+        :param time_values: end hour of each hybrid time step.
+        :returns: the fluid temperature change at the end of each time step, in C
+        """
+
+        g, _ = ghe.grab_g_function(ghe.B_spacing / ghe.bhe.b.H)
+        h = ghe.bhe.b.H
+        q_dot_b = np.hstack((0.0, load * 1000.0 / float(ghe.nbh)))
+        time_values = np.hstack((0.0, time_values))
+
+        mask = np.tri(q_dot_b.size - 1, dtype=bool)
+        g_matrix = np.zeros(mask.shape)
+        elapsed = (time_values[1:, None] - time_values[None, :-1])[mask]
+        g_matrix[mask] = g(np.log(elapsed * 3600.0 / ghe.radial_numerical.t_s))
+
+        delta_tb = g_matrix.dot(q_dot_b[1:] - q_dot_b[:-1]) / (h * TWO_PI * ghe.bhe.soil.k)
+        tf_bulk = delta_tb + q_dot_b[1:] / h * ghe.bhe.calc_effective_borehole_resistance()
+        return tf_bulk - q_dot_b[1:] / (2.0 * ghe.bhe.m_flow_borehole * ghe.bhe.fluid.cp)
+
+    def entering_temperatures(self, cooling_multiplier: float = 1.0, heating_multiplier: float = 1.0) -> np.ndarray:
+        """
+        :returns: the heat pump entering fluid temperature at each hybrid time step, in C, for the multiplied loads
+        """
+        return (self.ground_temperature + cooling_multiplier * self.cooling_response
+                + heating_multiplier * self.heating_response)
+
+    def entering_temperature_range(self, cooling_multiplier: float = 1.0,
+                                   heating_multiplier: float = 1.0) -> Tuple[float, float]:
+        """
+        :returns: the max and min heat pump entering fluid temperatures, in C, for the multiplied loads
+        """
+        eft = self.entering_temperatures(cooling_multiplier, heating_multiplier)
+        return float(eft.max()), float(eft.min())
+
+    def max_multiplier(self, cooling: bool = True, heating: bool = True) -> Optional[float]:
+        """
+        Finds the largest multiplier of the cooling loads, heating loads or both that keeps the heat pump
+        entering fluid temperatures within the limits. Loads that are not multiplied are kept as designed.
+
+        :param cooling: whether to multiply the cooling loads.
+        :param heating: whether to multiply the heating loads.
+        :returns: the max multiplier, 0 if no multiplier keeps the temperatures within the limits,
+         or None if any multiplier does
+        """
+
+        # eft = fixed + multiplier * scaled
+        fixed = np.full(self.cooling_response.shape, self.ground_temperature)
+        scaled = np.zeros(self.cooling_response.shape)
+        for multiplied, response in [(cooling, self.cooling_response), (heating, self.heating_response)]:
+            if multiplied:
+                scaled += response
+            else:
+                fixed += response
+
+        lower = 0.0
+        upper = np.inf
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for limit, sign in [(self.max_eft_allowable, 1.0), (self.min_eft_allowable, -1.0)]:
+                # sign * (fixed + multiplier * scaled) <= sign * limit
+                slope = sign * scaled
+                room = sign * (limit - fixed)
+                if np.any((slope == 0.0) & (room < 0.0)):
+                    return 0.0
+                rising = slope > 0.0
+                falling = slope < 0.0
+                if np.any(rising):
+                    upper = min(upper, float(np.min(room[rising] / slope[rising])))
+                if np.any(falling):
+                    lower = max(lower, float(np.max(room[falling] / slope[falling])))
+
+        if lower > upper:
+            return 0.0
+        return None if np.isinf(upper) else upper
+
+    def as_dict(self) -> dict:
+        max_eft, min_eft = self.entering_temperature_range()
+        return {
+            'cooling_multiplier': self.max_multiplier(cooling=True, heating=False),
+            'heating_multiplier': self.max_multiplier(cooling=False, heating=True),
+            'total_multiplier': self.max_multiplier(cooling=True, heating=True),
+            'max_hp_entering_temp': {'value': max_eft, 'units': 'C'},
+            'min_hp_entering_temp': {'value': min_eft, 'units': 'C'},
+        }
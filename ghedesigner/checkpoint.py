@@ -0,0 +1,143 @@
+from hashlib import sha256
+from json import dumps, loads
+from os import replace
+from pathlib import Path
+from sys import stderr
+from typing import Optional
+
+import numpy as np
+
+from ghedesigner.coordinates import as_coordinate_array
+
+CHECKPOINT_VERSION = 1
+
+
+def evaluation_key(kind: str, coordinates, h: float, field_specifier: str) -> str:
+    """
+    Builds the key of a candidate evaluation, from the field coordinates, borehole height and field specifier.
+    """
+    digest = sha256(as_coordinate_array(coordinates).tobytes())
+    digest.update(repr((kind, float(h), str(field_specifier))).encode())
+    return digest.hexdigest()
+
+
+def search_inputs_key(search) -> str:
+    """
+    Builds the key of the inputs of a search, so a checkpoint is only resumed by a search of the same design.
+
+    The load years change the hybrid loads through leap years, so they are part of the key as well as the loads.
+    """
+    sim_params = sorted(vars(search.sim_params).items())
+    # the row-wise search names its field type fieldType
+    field_type = getattr(search, 'field_type', getattr(search, 'fieldType', None))
+    digest = sha256(repr((search.design_state, sim_params, search.method, search.max_iter, search.load_years,
+                          search.flow_type, field_type, type(search).__name__)).encode())
+    digest.update(np.asarray(search.hourly_extraction_ground_loads, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _json_value(value):
+    """Converts search state, e.g. tracking rows and dicts with integer keys, to JSON compatible values."""
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(x) for x in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class SearchCheckpoint:
+    """
+    Checkpoint of a field search, written to a JSON file after each evaluated candidate.
+
+    The file holds the results of the evaluated candidates, by evaluation key, and a snapshot of the
+    search state: the bracket, calculated temperatures and advanced tracking. A resumed search replays
+    its steps, and takes the results of completed evaluations from the checkpoint instead of solving
+    their g-functions and simulations again.
+
+    The whole file is rewritten after each evaluation, which takes time and disk writes growing with the number of
+    evaluations. This is small next to the g-function solve and simulation of an evaluation, but checkpoints are
+    only worth it for searches long enough to be interrupted, so the CLI only writes them when asked to.
+    """
+
+    def __init__(self, path: Path, resume: bool = False):
+        """
+        :param path: path of the checkpoint file.
+        :param resume: continue from the checkpoint file, if it exists and belongs to the same design.
+        """
+        self.path = Path(path)
+        self.resume = resume
+        self.inputs_key = None
+        self.evaluations = {}
+        self.sizings = {}
+        # keys of the evaluations loaded from the file not reused yet, and how many have been reused
+        self.resumed_keys = set()
+        self.resumed_evaluations = 0
+
+    def bind(self, search) -> None:
+        """
+        Binds the checkpoint to a search, loading the completed evaluations when resuming.
+        """
+        self.inputs_key = search_inputs_key(search)
+        if not self.resume or not self.path.exists():
+            return
+        try:
+            data = loads(self.path.read_text())
+        except ValueError:
+            print(f"Checkpoint file {self.path} is not valid JSON, starting a new search", file=stderr)
+            return
+        if data.get('version') != CHECKPOINT_VERSION or data.get('inputs_key') != self.inputs_key:
+            print(f"Checkpoint file {self.path} belongs to a different design, starting a new search", file=stderr)
+            return
+        self.evaluations = data['evaluations']
+        self.sizings = data['sizings']
+        self.resumed_keys = set(self.evaluations) | set(self.sizings)
+
+    def evaluation(self, key: str) -> Optional[list]:
+        result = self.evaluations.get(key)
+        if key in self.resumed_keys:
+            self.resumed_keys.discard(key)
+            self.resumed_evaluations += 1
+        return result
+
+    def sizing(self, key: str) -> Optional[float]:
+        result = self.sizings.get(key)
+        if key in self.resumed_keys:
+            self.resumed_keys.discard(key)
+            self.resumed_evaluations += 1
+        return result
+
+    def record_evaluation(self, key: str, result: list, search) -> None:
+        self.evaluations[key] = _json_value(result)
+        self.save(search)
+
+    def record_sizing(self, key: str, height: float, search) -> None:
+        self.sizings[key] = float(height)
+        self.save(search)
+
+    def save(self, search) -> None:
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'inputs_key': self.inputs_key,
+            'state': {
+                'bracket': _json_value(search.bracket),
+                'calculated_temperatures': _json_value(search.calculated_temperatures),
+                'calculated_temperatures_nested': _json_value(getattr(search, 'calculated_temperatures_nested',
+                                                                      None)),
+                'advanced_tracking': _json_value(getattr(search, 'advanced_tracking', None)),
+            },
+            'evaluations': self.evaluations,
+            'sizings': self.sizings,
+        }
+        # write to a temporary file first, so a crash while writing leaves the last checkpoint intact
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(dumps(data))
+        replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Removes the checkpoint file, e.g. when the search has finished."""
+        self.path.unlink(missing_ok=True)
@@ -1,15 +1,37 @@
-from typing import List, Tuple, Union
+from typing import Union
 
+import numpy as np
 
-def transpose_coordinates(coordinates) -> List[Tuple[float, float]]:
-    coordinates_transposed = []
-    for x, y in coordinates:
-        coordinates_transposed.append((y, x))
-    return coordinates_transposed
+# Borehole coordinates are held as a compact (N, 2) float64 array of (x, y) pairs.
+# Subsets of a field should be taken by slicing, which returns a view rather than a copy.
+CoordinateArray = np.ndarray
+
+
+def as_coordinate_array(coordinates) -> CoordinateArray:
+    """
+    Converts a sequence of (x, y) pairs to an (N, 2) float64 coordinate array.
+
+    Arrays that are already float64 are returned without copying.
+
+    :param coordinates: sequence of (x, y) pairs, or an existing coordinate array
+    :return: (N, 2) float64 array of borehole coordinates
+    """
+    return np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+
+def transpose_coordinates(coordinates) -> CoordinateArray:
+    # swapping the columns returns a view, so no coordinate data is copied
+    return as_coordinate_array(coordinates)[:, ::-1]
+
+
+def _line(x, y) -> CoordinateArray:
+    # stack x and y values (either of which may be a scalar) into coordinate pairs
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    return np.column_stack((x, y))
 
 
 def rectangle(num_bh_x: int, num_bh_y: int, spacing_x: Union[int, float], spacing_y: Union[int, float],
-              origin=(0, 0), ) -> List[Tuple[float, float]]:
+              origin=(0, 0), ) -> CoordinateArray:
     """
     Creates a rectangular borehole field.
 
@@ -26,21 +48,20 @@ def rectangle(num_bh_x: int, num_bh_y: int, spacing_x: Union[int, float], spacin
         origin: coordinates for origin at lower-left corner
 
     Returns:
-        list of tuples (x, y) containing borehole coordinates
+        (N, 2) array containing borehole coordinates
     """
 
-    r = []
     x_0 = origin[0]
     y_0 = origin[1]
-    for i in range(num_bh_x):
-        for j in range(num_bh_y):
-            r.append((x_0 + i * spacing_x, y_0 + j * spacing_y))
+    x = x_0 + np.arange(num_bh_x) * spacing_x
+    y = y_0 + np.arange(num_bh_y) * spacing_y
 
-    return r
+    # boreholes are ordered column by column, i.e. y varies fastest
+    return _line(np.repeat(x, num_bh_y), np.tile(y, num_bh_x))
 
 
 def open_rectangle(num_bh_x: int, num_bh_y: int, spacing_x: Union[int, float],
-                   spacing_y: Union[int, float]) -> List[Tuple[float, float]]:
+                   spacing_y: Union[int, float]) -> CoordinateArray:
     """
     Creates a rectangular borehole field without center boreholes.
 
@@ -56,18 +77,17 @@ def open_rectangle(num_bh_x: int, num_bh_y: int, spacing_x: Union[int, float],
         spacing_y: spacing between borehole rows in y-direction
 
     Returns:
-        list of tuples (x, y) containing borehole coordinates
+        (N, 2) array containing borehole coordinates
     """
 
-    open_r = []
     if num_bh_x > 2 and num_bh_y > 2:
-        for i in range(num_bh_x):
-            open_r.append((i * spacing_x, 0.0))
-        for j in range(1, num_bh_y - 1):
-            open_r.append((0, j * spacing_y))
-            open_r.append(((num_bh_x - 1) * spacing_x, j * spacing_y))
-        for i in range(num_bh_x):
-            open_r.append((i * spacing_x, (num_bh_y - 1) * spacing_y))
+        x = np.arange(num_bh_x) * spacing_x
+        y = np.arange(1, num_bh_y - 1) * spacing_y
+        # left and right sides are interleaved to match the row-by-row ordering
+        sides = np.empty((2 * len(y), 2), dtype=np.float64)
+        sides[0::2] = _line(0.0, y)
+        sides[1::2] = _line((num_bh_x - 1) * spacing_x, y)
+        open_r = np.concatenate((_line(x, 0.0), sides, _line(x, (num_bh_y - 1) * spacing_y)))
         # nbh = num_bh_y * 2 + (num_bh_x - 2) * 2
     else:
         open_r = rectangle(num_bh_x, num_bh_y, spacing_x, spacing_y)
@@ -77,48 +97,37 @@ def open_rectangle(num_bh_x: int, num_bh_y: int, spacing_x: Union[int, float],
 
 
 def c_shape(n_x_1: int, n_y: int, b_x: Union[int, float],
-            b_y: Union[int, float], n_x_2: int) -> List[Tuple[float, float]]:
-    c = []
-    for i in range(n_x_1):
-        c.append((i * b_x, 0.0))
+            b_y: Union[int, float], n_x_2: int) -> CoordinateArray:
     x_loc = (n_x_1 - 1) * b_x
-    for j in range(1, n_y):
-        c.append((0.0, j * b_y))
-    for j in range(1, n_y):
-        c.append((x_loc, j * b_y))
     y_loc = (n_y - 1) * b_y
-    for i in range(1, n_x_2 + 1):
-        c.append((i * b_x, y_loc))
-
-    return c
+    y = np.arange(1, n_y) * b_y
+    return np.concatenate((
+        _line(np.arange(n_x_1) * b_x, 0.0),
+        _line(0.0, y),
+        _line(x_loc, y),
+        _line(np.arange(1, n_x_2 + 1) * b_x, y_loc),
+    ))
 
 
 def lop_u(n_x: int, n_y_1: int, b_x: Union[int, float],
-          b_y: Union[int, float], n_y_2: int) -> List[Tuple[float, float]]:
-    _lop_u = []
-    for i in range(n_x):
-        _lop_u.append((i * b_x, 0.0))
-    for j in range(1, n_y_1):
-        _lop_u.append((0.0, j * b_y))
+          b_y: Union[int, float], n_y_2: int) -> CoordinateArray:
     x_loc = (n_x - 1) * b_x
-    for j in range(1, n_y_2):
-        _lop_u.append((x_loc, j * b_y))
-
-    return _lop_u
+    return np.concatenate((
+        _line(np.arange(n_x) * b_x, 0.0),
+        _line(0.0, np.arange(1, n_y_1) * b_y),
+        _line(x_loc, np.arange(1, n_y_2) * b_y),
+    ))
 
 
-def l_shape(n_x: int, n_y: int, b_x: Union[int, float], b_y: Union[int, float]) -> List[Tuple[float, float]]:
-    l_shape_object = []
-    for i in range(n_x):
-        l_shape_object.append((i * b_x, 0.0))
-    for j in range(1, n_y):
-        l_shape_object.append((0.0, j * b_y))
-
-    return l_shape_object
+def l_shape(n_x: int, n_y: int, b_x: Union[int, float], b_y: Union[int, float]) -> CoordinateArray:
+    return np.concatenate((
+        _line(np.arange(n_x) * b_x, 0.0),
+        _line(0.0, np.arange(1, n_y) * b_y),
+    ))
 
 
 def zoned_rectangle(n_x: int, n_y: int, b_x: Union[int, float], b_y: Union[int, float],
-                    n_ix: int, n_iy: int) -> List[Tuple[float, float]]:
+                    n_ix: int, n_iy: int) -> CoordinateArray:
     """
     Create a zoned rectangle
 
@@ -136,16 +145,12 @@ def zoned_rectangle(n_x: int, n_y: int, b_x: Union[int, float], b_y: Union[int,
     if n_iy > (n_y - 2):
         raise ValueError("Too many interior y boreholes.")
 
-    # Create a list of (x, y) coordinates
-    zoned = []
-
-    # Boreholes on the perimeter
-    zoned.extend(open_rectangle(n_x, n_y, b_x, b_y))
-
     # Create the interior coordinates
     bix = (n_x - 1) * b_x / (n_ix + 1)
     biy = (n_y - 1) * b_y / (n_iy + 1)
 
-    zoned.extend(rectangle(n_ix, n_iy, bix, biy, origin=(bix, biy)))
-
-    return zoned
+    # Boreholes on the perimeter, followed by the interior boreholes
+    return np.concatenate((
+        open_rectangle(n_x, n_y, b_x, b_y),
+        rectangle(n_ix, n_iy, bix, biy, origin=(bix, biy)),
+    ))
@@ -1,22 +1,41 @@
 from abc import abstractmethod
 from math import floor
-from typing import Union
+from typing import Optional, Union
+
+import numpy as np
 
 from ghedesigner.borehole import GHEBorehole
+from ghedesigner.cache import DOMAIN_CACHE, cache_key
+from ghedesigner.checkpoint import SearchCheckpoint
 from ghedesigner.domains import polygonal_land_constraint, bi_rectangle_nested
 from ghedesigner.domains import square_and_near_square, rectangular, bi_rectangle_zoned_nested
-from ghedesigner.enums import BHPipeType, TimestepType, FlowConfigType
+from ghedesigner.enums import BHPipeType, FieldSearchType, TimestepType, FlowConfigType
 from ghedesigner.geometry import GeometricConstraints, GeometricConstraintsBiRectangle
 from ghedesigner.geometry import GeometricConstraintsBiZoned, GeometricConstraintsBiRectangleConstrained
 from ghedesigner.geometry import GeometricConstraintsNearSquare, GeometricConstraintsRectangle
 from ghedesigner.geometry import GeometricConstraintsRowWise
 from ghedesigner.media import Grout, Pipe, Soil, GHEFluid
+from ghedesigner.search_budget import SearchBudget
 from ghedesigner.search_routines import Bisection1D, Bisection2D, BisectionZD, RowWiseModifiedBisectionSearch
 from ghedesigner.simulation import SimulationParameters
 
 AnyBisectionType = Union[Bisection1D, Bisection2D, BisectionZD, RowWiseModifiedBisectionSearch]
 
 
+def cached_domain(domain_function, *args):
+    """
+    Builds the coordinates domain and field descriptors of a design, or reuses them from the domain cache.
+    The domains only depend on the geometric constraints, so designs that share them can share the domains.
+    """
+
+    domain_key = cache_key(domain_function.__name__, *args)
+    domain = DOMAIN_CACHE.get(domain_key)
+    if domain is None:
+        domain = domain_function(*args)
+        DOMAIN_CACHE.put(domain_key, domain)
+    return domain
+
+
 class DesignBase:
     def __init__(
             self,
@@ -29,7 +48,7 @@ class DesignBase:
             soil: Soil,
             sim_params: SimulationParameters,
             geometric_constraints: GeometricConstraints,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             method: TimestepType,
             flow_type: FlowConfigType = FlowConfigType.BOREHOLE,
             load_years=None
@@ -65,7 +84,19 @@ class DesignBase:
             print("\n")
 
     @abstractmethod
-    def find_design(self, disp=False) -> AnyBisectionType:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> AnyBisectionType:
+        """
+        Searches the domain for the design field.
+
+        :param disp: print the search progress.
+        :param budget: time or evaluation budget of the search. When it runs out, the smallest feasible field
+         evaluated so far is selected, and the search is flagged as budget_limited.
+        :param checkpoint: checkpoint the search saves its evaluations to, and resumes from.
+        :param field_search: how the searches over a field index narrow it down. The row-wise search, which
+         has no field index, ignores it.
+        """
         pass
 
     def to_input(self) -> dict:
@@ -75,7 +106,7 @@ class DesignBase:
 class DesignNearSquare(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
-                 geometric_constraints: GeometricConstraintsNearSquare, hourly_extraction_ground_loads: list,
+                 geometric_constraints: GeometricConstraintsNearSquare, hourly_extraction_ground_loads: np.ndarray,
                  method: TimestepType, flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
@@ -88,10 +119,12 @@ class DesignNearSquare(DesignBase):
         # calculated based on the spacing and length provided.
         n = floor(self.geometric_constraints.length / self.geometric_constraints.b) + 1
         number_of_boreholes = int(n)
-        self.coordinates_domain, self.fieldDescriptors = square_and_near_square(1, number_of_boreholes,
-                                                                                self.geometric_constraints.b)
+        self.coordinates_domain, self.fieldDescriptors = cached_domain(square_and_near_square, 1, number_of_boreholes,
+                                                                       self.geometric_constraints.b)
 
-    def find_design(self, disp=False) -> Bisection1D:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> Bisection1D:
         if disp:
             title = "Find near-square.."
             print(title + "\n" + len(title) * "=")
@@ -110,6 +143,9 @@ class DesignNearSquare(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
             field_type="near-square",
             load_years=self.load_years,
         )
@@ -118,16 +154,18 @@ class DesignNearSquare(DesignBase):
 class DesignRectangle(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
-                 geometric_constraints: GeometricConstraintsRectangle, hourly_extraction_ground_loads: list,
+                 geometric_constraints: GeometricConstraintsRectangle, hourly_extraction_ground_loads: np.ndarray,
                  method: TimestepType, flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
         self.geometric_constraints = geometric_constraints
-        self.coordinates_domain, self.fieldDescriptors = rectangular(
-            self.geometric_constraints.length, self.geometric_constraints.width,
+        self.coordinates_domain, self.fieldDescriptors = cached_domain(
+            rectangular, self.geometric_constraints.length, self.geometric_constraints.width,
             self.geometric_constraints.b_min, self.geometric_constraints.b_max_x)
 
-    def find_design(self, disp=False) -> Bisection1D:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> Bisection1D:
         if disp:
             title = "Find rectangle..."
             print(title + "\n" + len(title) * "=")
@@ -146,6 +184,9 @@ class DesignRectangle(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
             field_type="rectangle",
             load_years=self.load_years,
         )
@@ -154,17 +195,19 @@ class DesignRectangle(DesignBase):
 class DesignBiRectangle(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
-                 geometric_constraints: GeometricConstraintsBiRectangle, hourly_extraction_ground_loads: list,
+                 geometric_constraints: GeometricConstraintsBiRectangle, hourly_extraction_ground_loads: np.ndarray,
                  method: TimestepType, flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
         self.geometric_constraints = geometric_constraints
-        self.coordinates_domain_nested, self.fieldDescriptors = bi_rectangle_nested(
-            self.geometric_constraints.length, self.geometric_constraints.width, self.geometric_constraints.b_min,
-            self.geometric_constraints.b_max_x, self.geometric_constraints.b_max_y, disp=False
+        self.coordinates_domain_nested, self.fieldDescriptors = cached_domain(
+            bi_rectangle_nested, self.geometric_constraints.length, self.geometric_constraints.width,
+            self.geometric_constraints.b_min, self.geometric_constraints.b_max_x, self.geometric_constraints.b_max_y
         )
 
-    def find_design(self, disp=False) -> Bisection2D:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> Bisection2D:
         if disp:
             title = "Find bi-rectangle..."
             print(title + "\n" + len(title) * "=")
@@ -183,6 +226,9 @@ class DesignBiRectangle(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
             field_type="bi-rectangle",
             load_years=self.load_years,
         )
@@ -191,17 +237,19 @@ class DesignBiRectangle(DesignBase):
 class DesignBiZoned(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
-                 geometric_constraints: GeometricConstraintsBiZoned, hourly_extraction_ground_loads: list,
+                 geometric_constraints: GeometricConstraintsBiZoned, hourly_extraction_ground_loads: np.ndarray,
                  method: TimestepType, flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
         self.geometric_constraints = geometric_constraints
-        self.coordinates_domain_nested, self.fieldDescriptors = bi_rectangle_zoned_nested(
-            self.geometric_constraints.length, self.geometric_constraints.width, self.geometric_constraints.b_min,
-            self.geometric_constraints.b_max_x, self.geometric_constraints.b_max_y
+        self.coordinates_domain_nested, self.fieldDescriptors = cached_domain(
+            bi_rectangle_zoned_nested, self.geometric_constraints.length, self.geometric_constraints.width,
+            self.geometric_constraints.b_min, self.geometric_constraints.b_max_x, self.geometric_constraints.b_max_y
         )
 
-    def find_design(self, disp=False) -> BisectionZD:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> BisectionZD:
         if disp:
             title = "Find bi-zoned..."
             print(title + "\n" + len(title) * "=")
@@ -220,6 +268,9 @@ class DesignBiZoned(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
             field_type="bi-zoned",
         )
 
@@ -228,12 +279,13 @@ class DesignBiRectangleConstrained(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
                  geometric_constraints: GeometricConstraintsBiRectangleConstrained,
-                 hourly_extraction_ground_loads: list, method: TimestepType,
+                 hourly_extraction_ground_loads: np.ndarray, method: TimestepType,
                  flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
         self.geometric_constraints = geometric_constraints
-        self.coordinates_domain_nested, self.fieldDescriptors = polygonal_land_constraint(
+        self.coordinates_domain_nested, self.fieldDescriptors = cached_domain(
+            polygonal_land_constraint,
             self.geometric_constraints.b_min,
             self.geometric_constraints.b_max_x,
             self.geometric_constraints.b_max_y,
@@ -241,7 +293,9 @@ class DesignBiRectangleConstrained(DesignBase):
             self.geometric_constraints.no_go_boundaries,
         )
 
-    def find_design(self, disp=False) -> Bisection2D:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> Bisection2D:
         if disp:
             title = "Find bi-rectangle_constrained..."
             print(title + "\n" + len(title) * "=")
@@ -260,6 +314,9 @@ class DesignBiRectangleConstrained(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
             field_type="bi-rectangle_constrained",
             load_years=self.load_years,
         )
@@ -268,13 +325,15 @@ class DesignBiRectangleConstrained(DesignBase):
 class DesignRowWise(DesignBase):
     def __init__(self, v_flow: float, _borehole: GHEBorehole, bhe_type: BHPipeType,
                  fluid: GHEFluid, pipe: Pipe, grout: Grout, soil: Soil, sim_params: SimulationParameters,
-                 geometric_constraints: GeometricConstraintsRowWise, hourly_extraction_ground_loads: list,
+                 geometric_constraints: GeometricConstraintsRowWise, hourly_extraction_ground_loads: np.ndarray,
                  method: TimestepType, flow_type: FlowConfigType = FlowConfigType.BOREHOLE, load_years=None):
         super().__init__(v_flow, _borehole, bhe_type, fluid, pipe, grout, soil, sim_params, geometric_constraints,
                          hourly_extraction_ground_loads, method, flow_type, load_years)
         self.geometric_constraints = geometric_constraints
 
-    def find_design(self, disp=False) -> RowWiseModifiedBisectionSearch:
+    def find_design(self, disp=False, budget: Optional[SearchBudget] = None,
+                    checkpoint: Optional[SearchCheckpoint] = None,
+                    field_search: FieldSearchType = FieldSearchType.BISECTION) -> RowWiseModifiedBisectionSearch:
         if disp:
             title = "Find row-wise..."
             print(title + "\n" + len(title) * "=")
@@ -292,6 +351,8 @@ class DesignRowWise(DesignBase):
             method=self.method,
             flow_type=self.flow_type,
             disp=disp,
+            budget=budget,
+            checkpoint=checkpoint,
             field_type="row-wise",
             load_years=self.load_years,
         )
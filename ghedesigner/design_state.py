@@ -0,0 +1,172 @@
+from dataclasses import dataclass, replace
+from typing import Tuple
+
+from ghedesigner.borehole import GHEBorehole
+from ghedesigner.enums import BHPipeType, FlowConfigType
+from ghedesigner.media import GHEFluid, Grout, Pipe, Soil
+
+
+def _freeze(value):
+    """Converts lists, such as pipe positions and coaxial radii, to tuples, so states are hashable."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+
+def _thaw(value):
+    """Converts tuples of radii or conductivities back to lists, as the pipe classes expect."""
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+@dataclass(frozen=True)
+class BoreholeState:
+    """
+    Value of a borehole. States are immutable and hashable, so they can be shared between searches,
+    threads and processes, and used as cache keys. Updates, such as a new height, return a new state.
+    """
+
+    height: float
+    buried_depth: float
+    radius: float
+    x: float = 0.0
+    y: float = 0.0
+    tilt: float = 0.0
+    orientation: float = 0.0
+
+    @classmethod
+    def from_borehole(cls, borehole: GHEBorehole) -> 'BoreholeState':
+        return cls(float(borehole.H), float(borehole.D), float(borehole.r_b), float(borehole.x), float(borehole.y),
+                   float(borehole.tilt), float(borehole.orientation))
+
+    def with_height(self, height: float) -> 'BoreholeState':
+        return replace(self, height=float(height))
+
+    def to_borehole(self) -> GHEBorehole:
+        """
+        :returns: a new borehole, owned by the caller
+        """
+        return GHEBorehole(self.height, self.buried_depth, self.radius, self.x, self.y, self.tilt, self.orientation)
+
+
+@dataclass(frozen=True)
+class PipeState:
+    """
+    Value of a pipe. For coaxial pipes, the radii and conductivities hold the inner and outer pipe values.
+    """
+
+    positions: tuple
+    r_in: object
+    r_out: object
+    shank_spacing: float
+    roughness: float
+    conductivity: object
+    rho_cp: float
+
+    @classmethod
+    def from_pipe(cls, pipe: Pipe) -> 'PipeState':
+        return cls(_freeze(pipe.pos), _freeze(pipe.r_in), _freeze(pipe.r_out), pipe.s, pipe.roughness,
+                   _freeze(pipe.k), pipe.rhoCp)
+
+    def to_pipe(self) -> Pipe:
+        """
+        :returns: a new pipe, owned by the caller
+        """
+
+        # the u-tube classes take a list of (x, y) pipe positions, the coaxial class one (x, y) position
+        positions = self.positions
+        if len(positions) > 0 and isinstance(positions[0], tuple):
+            positions = list(positions)
+        return Pipe(positions, _thaw(self.r_in), _thaw(self.r_out), self.shank_spacing, self.roughness,
+                    _thaw(self.conductivity), self.rho_cp)
+
+
+@dataclass(frozen=True)
+class GroutState:
+    conductivity: float
+    rho_cp: float
+
+    @classmethod
+    def from_grout(cls, grout: Grout) -> 'GroutState':
+        return cls(grout.k, grout.rhoCp)
+
+    def to_grout(self) -> Grout:
+        return Grout(self.conductivity, self.rho_cp)
+
+
+@dataclass(frozen=True)
+class SoilState:
+    conductivity: float
+    rho_cp: float
+    undisturbed_temp: float
+
+    @classmethod
+    def from_soil(cls, soil: Soil) -> 'SoilState':
+        return cls(soil.k, soil.rhoCp, soil.ugt)
+
+    def to_soil(self) -> Soil:
+        return Soil(self.conductivity, self.rho_cp, self.undisturbed_temp)
+
+
+@dataclass(frozen=True)
+class FluidState:
+    fluid_name: str
+    concentration_percent: float
+    temperature: float
+
+    @classmethod
+    def from_fluid(cls, fluid: GHEFluid) -> 'FluidState':
+        return cls(fluid.fluid_type.name, fluid.concentration_percent, fluid.temperature)
+
+    def to_fluid(self) -> GHEFluid:
+        return GHEFluid(self.fluid_name, self.concentration_percent, self.temperature)
+
+
+@dataclass(frozen=True)
+class FlowState:
+    """
+    Design flow rate, in lps, per borehole or for the whole system depending on the flow type.
+    """
+
+    flow_rate: float
+    flow_type: FlowConfigType
+
+
+@dataclass(frozen=True)
+class DesignState:
+    """
+    Value of the borehole heat exchanger inputs of a design.
+
+    Candidate evaluations build their own borehole heat exchanger objects from the state, so they share
+    no mutable objects, and updates return a new state, e.g. ``state.replace(grout=GroutState(1.5, 3.9e6))``.
+    The state is hashable, and its hash only depends on the input values, so it is a stable cache key.
+    """
+
+    bhe_type: BHPipeType
+    borehole: BoreholeState
+    pipe: PipeState
+    grout: GroutState
+    soil: SoilState
+    fluid: FluidState
+    flow: FlowState
+
+    @classmethod
+    def from_media(cls, bhe_type: BHPipeType, borehole: GHEBorehole, pipe: Pipe, grout: Grout, soil: Soil,
+                   fluid: GHEFluid, flow_rate: float, flow_type: FlowConfigType) -> 'DesignState':
+        return cls(bhe_type, BoreholeState.from_borehole(borehole), PipeState.from_pipe(pipe),
+                   GroutState.from_grout(grout), SoilState.from_soil(soil), FluidState.from_fluid(fluid),
+                   FlowState(float(flow_rate), flow_type))
+
+    def replace(self, **changes) -> 'DesignState':
+        return replace(self, **changes)
+
+    def with_height(self, height: float) -> 'DesignState':
+        return replace(self, borehole=self.borehole.with_height(height))
+
+    def to_media(self) -> Tuple[GHEBorehole, Pipe, Grout, Soil, GHEFluid]:
+        """
+        :returns: a new borehole, pipe, grout, soil and fluid, owned by the caller
+        """
+        return (self.borehole.to_borehole(), self.pipe.to_pipe(), self.grout.to_grout(), self.soil.to_soil(),
+                self.fluid.to_fluid())
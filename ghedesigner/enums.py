@@ -27,6 +27,11 @@ class DesignGeomType(Enum):
     ROWWISE = auto()
 
 
+class FieldSearchType(Enum):
+    BISECTION = auto()
+    SECANT = auto()
+
+
 class FlowConfigType(Enum):
     BOREHOLE = auto()
     SYSTEM = auto()
@@ -1,55 +1,23 @@
-from ghedesigner.shape import point_polygon_check
+from ghedesigner.coordinates import as_coordinate_array
+from ghedesigner.shape import points_polygon_check
 
 
 def remove_cutout(coordinates, boundary, remove_inside=True, keep_contour=True):
-    inside_points_idx = []
-    outside_points_idx = []
-    boundary_points_idx = []
+    coordinates = as_coordinate_array(coordinates)
 
     inside = 1
     outside = -1
     on_edge = 0
 
-    for idx, coordinate in enumerate(coordinates):
-        coordinate = coordinates[idx]
-        ret = point_polygon_check(boundary, coordinate)
-        if ret == inside:
-            inside_points_idx.append(idx)
-        elif ret == outside:
-            outside_points_idx.append(idx)
-        elif ret == on_edge:
-            boundary_points_idx.append(idx)
-        else:
-            raise ValueError("Something bad happened")
+    ret = points_polygon_check(boundary, coordinates)
 
-    new_coordinates = []
-    for idx, _ in enumerate(coordinates):
-        # if we want to remove inside points and keep contour points
-        if remove_inside and keep_contour:
-            if idx in inside_points_idx:
-                continue
-            else:
-                new_coordinates.append(coordinates[idx])
-        # if we want to remove inside points and remove contour points
-        elif remove_inside and not keep_contour:
-            if idx in inside_points_idx or idx in boundary_points_idx:
-                continue
-            else:
-                new_coordinates.append(coordinates[idx])
-        # if we want to keep outside points and remove contour points
-        elif not remove_inside and not keep_contour:
-            if idx in outside_points_idx or idx in boundary_points_idx:
-                continue
-            else:
-                new_coordinates.append(coordinates[idx])
-        # if we want to keep outside points and keep contour points
-        else:
-            if idx in outside_points_idx:
-                continue
-            else:
-                new_coordinates.append(coordinates[idx])
+    # if we want to remove inside points, otherwise keep outside points
+    keep = ret != inside if remove_inside else ret != outside
+    # if we want to remove contour points
+    if not keep_contour:
+        keep &= ret != on_edge
 
-    return new_coordinates
+    return coordinates[keep]
 
 
 def determine_largest_rectangle(property_boundary):
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from typing import Optional
 
 from ghedesigner.constants import RAD_TO_DEG
 from ghedesigner.enums import DesignGeomType
@@ -129,7 +130,10 @@ class GeometricConstraintsRowWise(GeometricConstraints):
                  max_rotation: float,
                  rotate_step: float,
                  property_boundary,
-                 no_go_boundaries):
+                 no_go_boundaries,
+                 rotate_workers: Optional[int] = None,
+                 rotate_coarse_factor: Optional[int] = None,
+                 rotate_refine_count: int = 3):
         super().__init__()
         self.perimeter_spacing_ratio = perimeter_spacing_ratio
         self.min_spacing = min_spacing
@@ -140,16 +144,26 @@ class GeometricConstraintsRowWise(GeometricConstraints):
         self.rotate_step = rotate_step
         self.property_boundary = property_boundary
         self.no_go_boundaries = no_go_boundaries
+        # settings of the rotation sweep run for each field the search generates
+        self.rotate_workers = rotate_workers
+        self.rotate_coarse_factor = rotate_coarse_factor
+        self.rotate_refine_count = rotate_refine_count
         self.type = DesignGeomType.ROWWISE
 
     def to_input(self) -> dict:
-        return {'perimeter_spacing_ratio': self.perimeter_spacing_ratio,
-                'min_spacing': self.min_spacing,
-                'max_spacing': self.max_spacing,
-                'spacing_step': self.spacing_step,
-                'min_rotation': self.min_rotation * RAD_TO_DEG,
-                'max_rotation': self.max_rotation * RAD_TO_DEG,
-                'rotate_step': self.rotate_step,
-                'property_boundary': self.property_boundary,
-                'no_go_boundaries': self.no_go_boundaries,
-                'method': DesignGeomType.ROWWISE.name}
+        inputs = {'perimeter_spacing_ratio': self.perimeter_spacing_ratio,
+                  'min_spacing': self.min_spacing,
+                  'max_spacing': self.max_spacing,
+                  'spacing_step': self.spacing_step,
+                  'min_rotation': self.min_rotation * RAD_TO_DEG,
+                  'max_rotation': self.max_rotation * RAD_TO_DEG,
+                  'rotate_step': self.rotate_step,
+                  'property_boundary': self.property_boundary,
+                  'no_go_boundaries': self.no_go_boundaries,
+                  'method': DesignGeomType.ROWWISE.name}
+        if self.rotate_workers is not None:
+            inputs['rotate_workers'] = self.rotate_workers
+        if self.rotate_coarse_factor is not None:
+            inputs['rotate_coarse_factor'] = self.rotate_coarse_factor
+            inputs['rotate_refine_count'] = self.rotate_refine_count
+        return inputs
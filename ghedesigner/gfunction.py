@@ -1,5 +1,6 @@
 import warnings
 from math import log
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pygfunction as gt
@@ -7,9 +8,138 @@ from scipy.interpolate import interp1d, lagrange
 
 from ghedesigner.borehole import GHEBorehole
 from ghedesigner.borehole_heat_exchangers import get_bhe_object
-from ghedesigner.enums import BHPipeType
+from ghedesigner.cache import G_FUNCTION_CACHE, cache_key
+from ghedesigner.coordinates import CoordinateArray, as_coordinate_array
+from ghedesigner.design_state import BoreholeState, DesignState, FlowState, FluidState, GroutState, PipeState, SoilState
+from ghedesigner.enums import BHPipeType, FlowConfigType
+from ghedesigner.profiling import timed
+from ghedesigner.progress import report_progress
 
 
+# Peak memory model of a pygfunction solve, calibrated with tracemalloc. Setting up the solver
+# holds data for every pair of boreholes, e.g. the hierarchical clustering of the equivalent
+# solver, and the solve holds the response factors of every pair of heat sources at every time.
+SETUP_BYTES_PER_BOREHOLE_PAIR = {"equivalent": 300.0, "similarities": 100.0, "detailed": 100.0}
+SOLVE_BYTES_PER_SOURCE_PAIR_AND_TIME = 16.0
+MIN_BUDGET_SEGMENTS = 4
+
+# memory budget of each g-function calculation in MB, None for no budget
+G_FUNCTION_MEMORY_BUDGET: Optional[float] = None
+
+
+class GFunctionMemoryError(MemoryError):
+    """Raised when a g-function calculation cannot fit in the memory budget."""
+
+
+def set_g_function_memory_budget(memory_budget: Optional[float]) -> None:
+    """Sets the memory budget of each g-function calculation in MB, None removes the budget."""
+    global G_FUNCTION_MEMORY_BUDGET
+    G_FUNCTION_MEMORY_BUDGET = memory_budget
+
+
+def estimate_g_function_memory(num_boreholes: int, num_sources: int, num_times: int, solver: str) -> float:
+    """
+    Estimates the peak memory of a g-function calculation.
+
+    :param num_boreholes: number of boreholes of the field.
+    :param num_sources: number of heat sources, i.e. the number of (equivalent) boreholes times
+     the number of segments.
+    :param num_times: number of time values.
+    :param solver: pygfunction solver.
+    :returns: the estimated peak memory, in MB
+    """
+
+    setup = SETUP_BYTES_PER_BOREHOLE_PAIR[solver] * num_boreholes ** 2
+    solve = SOLVE_BYTES_PER_SOURCE_PAIR_AND_TIME * (num_times + 1) * num_sources ** 2
+    return (setup + solve) / 1.0e6
+
+
+def g_function_options(n_segments, segments, end_length_ratio, segment_ratios, disp) -> dict:
+    segments = segments.lower()
+    if segments == "equal":
+        options = {"nSegments": n_segments, "disp": disp}
+    elif segments == "unequal":
+        if segment_ratios is None:
+            segment_ratios = gt.utilities.segment_ratios(n_segments, end_length_ratio=end_length_ratio)
+        options = {
+            "nSegments": n_segments,
+            "segment_ratios": segment_ratios,
+            "disp": disp,
+        }
+    else:
+        raise ValueError("Equal or Unequal are acceptable options " "for segments.")
+    return options
+
+
+def budget_settings(solver: str, n_segments: int, fixed_segments: bool) -> List[Tuple[str, int, Optional[int]]]:
+    """
+    Lists the solver settings to try under a memory budget, most accurate first.
+
+    :returns: the solver, number of segments and kClusters option, None for the pygfunction default
+    """
+
+    settings = [(solver, n_segments, None)]
+    if solver != "equivalent":
+        settings.append(("equivalent", n_segments, None))
+    # coarser grouping into equivalent boreholes
+    settings.append(("equivalent", n_segments, 0))
+    if not fixed_segments:
+        segments = n_segments // 2
+        while segments >= MIN_BUDGET_SEGMENTS:
+            settings.append(("equivalent", segments, 0))
+            segments //= 2
+    return settings
+
+
+def solve_within_budget(g_function_input, num_boreholes: int, alpha, time_values, boundary: str, solver: str,
+                        n_segments: int, memory_budget: float, make_options, fixed_segments: bool = False):
+    """
+    Solves the g-function with the most accurate settings that fit in the memory budget.
+
+    The equivalent solver groups the boreholes while it is set up, so its number of heat sources is
+    only known, and its solve estimated, after the setup.
+
+    :raises GFunctionMemoryError: if no settings fit, with the smallest estimate
+    """
+
+    num_times = len(time_values)
+    smallest_estimate = None
+    for candidate_solver, candidate_segments, k_clusters in budget_settings(solver, n_segments, fixed_segments):
+        setup_estimate = estimate_g_function_memory(num_boreholes, 0, num_times, candidate_solver)
+        if setup_estimate > memory_budget:
+            estimate = setup_estimate
+        else:
+            options = make_options(candidate_segments)
+            if k_clusters is not None:
+                options["kClusters"] = k_clusters
+            gfunc = None
+            if candidate_solver == "equivalent":
+                gfunc = gt.gfunction.gFunction(g_function_input, alpha, time=None, boundary_condition=boundary,
+                                               options=options, method=candidate_solver)
+                num_sources = gfunc.solver.nSources
+            else:
+                num_sources = num_boreholes * candidate_segments
+            estimate = estimate_g_function_memory(num_boreholes, num_sources, num_times, candidate_solver)
+            if estimate <= memory_budget:
+                if (candidate_solver, candidate_segments, k_clusters) != (solver, n_segments, None):
+                    warnings.warn(f"G-function of {num_boreholes} boreholes solved with the {candidate_solver} "
+                                  f"solver and {candidate_segments} segments to fit the {memory_budget:g} MB "
+                                  f"memory budget.")
+                if gfunc is None:
+                    return gt.gfunction.gFunction(g_function_input, alpha, time=time_values,
+                                                  boundary_condition=boundary, options=options,
+                                                  method=candidate_solver)
+                gfunc.gFunc = gfunc.evaluate_g_function(time_values)
+                return gfunc
+        if smallest_estimate is None or estimate < smallest_estimate:
+            smallest_estimate = estimate
+
+    raise GFunctionMemoryError(
+        f"G-function of {num_boreholes} boreholes needs an estimated {smallest_estimate:.0f} MB with the "
+        f"leanest solver settings, over the {memory_budget:g} MB memory budget.")
+
+
+@timed('g_function_solve')
 def calculate_g_function(
         m_flow_borehole,
         bhe_type: BHPipeType,
@@ -27,7 +157,17 @@ def calculate_g_function(
         boundary="MIFT",
         segment_ratios=None,
         disp=False,
+        memory_budget=None,
 ):
+    """
+    Calculates the g-function of a field with pygfunction.
+
+    With a memory budget, in MB, the most accurate solver settings whose estimated peak memory fits
+    are used, falling back to the equivalent solver with coarser grouping and fewer segments. When no
+    settings fit, GFunctionMemoryError is raised before the solve. Without a budget, the
+    G_FUNCTION_MEMORY_BUDGET setting applies.
+    """
+
     bore_field = []
     bhe_objects = []
 
@@ -37,7 +177,7 @@ def calculate_g_function(
     tilt = borehole.tilt
     orientation = borehole.orientation
 
-    for x, y in coordinates:
+    for x, y in as_coordinate_array(coordinates).tolist():
         _borehole = GHEBorehole(h, d, r_b, x, y, tilt, orientation)
         bore_field.append(_borehole)
         # Initialize pipe model
@@ -47,46 +187,33 @@ def calculate_g_function(
 
     alpha = soil.k / soil.rhoCp
 
-    # setup options
-    segments = segments.lower()
-    if segments == "equal":
-        options = {"nSegments": n_segments, "disp": disp}
-    elif segments == "unequal":
-        if segment_ratios is None:
-            segment_ratios = gt.utilities.segment_ratios(n_segments, end_length_ratio=end_length_ratio)
-        else:
-            segment_ratios = segment_ratios
-        options = {
-            "nSegments": n_segments,
-            "segment_ratios": segment_ratios,
-            "disp": disp,
-        }
-    else:
-        raise ValueError("Equal or Unequal are acceptable options " "for segments.")
+    def make_options(num_segments):
+        return g_function_options(num_segments, segments, end_length_ratio, segment_ratios, disp)
+
+    options = make_options(n_segments)
 
     if boundary == "UHTR" or boundary == "UBWT":
-        gfunc = gt.gfunction.gFunction(
-            bore_field,
-            alpha,
-            time=time_values,
-            boundary_condition=boundary,
-            options=options,
-            method=solver,
-        )
+        g_function_input = bore_field
     elif boundary == "MIFT":
         m_flow_network = len(bore_field) * m_flow_borehole
-        network = gt.networks.Network(bore_field, bhe_objects, m_flow_network=m_flow_network, cp_f=fluid.cp)
-        gfunc = gt.gfunction.gFunction(
-            network,
-            alpha,
-            time=time_values,
-            boundary_condition=boundary,
-            options=options,
-            method=solver,
-        )
+        g_function_input = gt.networks.Network(bore_field, bhe_objects, m_flow_network=m_flow_network, cp_f=fluid.cp)
     else:
         raise ValueError("UHTR, UBWT or MIFT are accepted boundary conditions.")
 
+    if memory_budget is None:
+        memory_budget = G_FUNCTION_MEMORY_BUDGET
+    if memory_budget is not None:
+        return solve_within_budget(g_function_input, len(bore_field), alpha, time_values, boundary, solver, n_segments,
+                                   memory_budget, make_options, fixed_segments=segment_ratios is not None)
+
+    gfunc = gt.gfunction.gFunction(
+        g_function_input,
+        alpha,
+        time=time_values,
+        boundary_condition=boundary,
+        options=options,
+        method=solver,
+    )
     return gfunc
 
 
@@ -108,37 +235,86 @@ def calc_g_func_for_multiple_lengths(
         solver="equivalent",
         boundary="MIFT",
         segment_ratios=None,
+        memory_budget=None,
+):
+    # the media are only read, through their design state
+    design_state = DesignState(bhe_type, BoreholeState(h_values[0], depth, r_b), PipeState.from_pipe(pipe),
+                               GroutState.from_grout(grout), SoilState.from_soil(soil), FluidState.from_fluid(fluid),
+                               FlowState(m_flow_borehole / fluid.rho * 1000.0, FlowConfigType.BOREHOLE))
+    return calc_g_func_for_design_state(b, h_values, design_state, m_flow_borehole, log_time, coordinates,
+                                        n_segments=n_segments, segments=segments, solver=solver, boundary=boundary,
+                                        segment_ratios=segment_ratios, memory_budget=memory_budget)
+
+
+@timed('g_function')
+def calc_g_func_for_design_state(
+        b: float,
+        h_values: list,
+        design_state: DesignState,
+        m_flow_borehole,
+        log_time,
+        coordinates,
+        n_segments=8,
+        segments="unequal",
+        solver="equivalent",
+        boundary="MIFT",
+        segment_ratios=None,
+        memory_budget=None,
 ):
+    """
+    Calculates the g-functions of a field at several heights, for the borehole heat exchanger of a design state.
+
+    The g-functions are cached by the values of the state at each height, so designs with equal inputs share
+    cache entries, whichever objects their inputs came from.
+    """
+    coordinates = as_coordinate_array(coordinates)
+    if memory_budget is None:
+        memory_budget = G_FUNCTION_MEMORY_BUDGET
     d = {"g": {}, "bore_locations": coordinates, "logtime": log_time}
+    bhe_type = design_state.bhe_type
+    r_b = design_state.borehole.radius
+    depth = design_state.borehole.buried_depth
+    _, pipe, grout, soil, fluid = design_state.to_media()
 
     for h in h_values:
-        _borehole = GHEBorehole(h, depth, r_b, 0.0, 0.0)
+        # the boreholes of the field are vertical, at the field coordinates
+        borehole_state = BoreholeState(float(h), depth, r_b)
 
         alpha = soil.k / soil.rhoCp
 
         ts = h ** 2 / (9.0 * alpha)  # Bore field characteristic time
         time_values = np.exp(log_time) * ts
 
-        gfunc = calculate_g_function(
-            m_flow_borehole,
-            bhe_type,
-            time_values,
-            coordinates,
-            _borehole,
-            fluid,
-            pipe,
-            grout,
-            soil,
-            n_segments=n_segments,
-            segments=segments,
-            solver=solver,
-            boundary=boundary,
-            segment_ratios=segment_ratios,
-        )
+        g_key = cache_key(bhe_type, borehole_state, design_state.pipe, design_state.grout, design_state.soil,
+                          design_state.fluid, m_flow_borehole, time_values, coordinates, n_segments, segments, solver,
+                          boundary, segment_ratios, memory_budget)
+        g_values = G_FUNCTION_CACHE.get(g_key)
+        cached = g_values is not None
+        if not cached:
+            gfunc = calculate_g_function(
+                m_flow_borehole,
+                bhe_type,
+                time_values,
+                coordinates,
+                borehole_state.to_borehole(),
+                fluid,
+                pipe,
+                grout,
+                soil,
+                n_segments=n_segments,
+                segments=segments,
+                solver=solver,
+                boundary=boundary,
+                segment_ratios=segment_ratios,
+                memory_budget=memory_budget,
+            )
+            g_values = tuple(gfunc.gFunc.tolist())
+            G_FUNCTION_CACHE.put(g_key, g_values)
+        report_progress('g_function_solved', number_of_boreholes=len(coordinates), height=h, cached=cached)
 
         key = f"{b}_{h}_{r_b}_{d}"
 
-        d["g"][key] = gfunc.gFunc.tolist()
+        d["g"][key] = list(g_values)
 
     geothermal_g_input = GFunction.configure_database_file_for_usage(d)
     # Initialize the gFunction object
@@ -155,7 +331,7 @@ class GFunction:
             d_values: dict,
             g_lts: dict,
             log_time: list,
-            bore_locations: list,
+            bore_locations,
     ):
         self.B: float = b  # a B spacing in the borefield
         # r_b (borehole radius) value keyed by height
@@ -165,7 +341,7 @@ class GFunction:
         # ln(t/ts) values that apply to all the heights
         self.log_time: list = log_time
         # (x, y) coordinates of boreholes
-        self.bore_locations: list = bore_locations
+        self.bore_locations: CoordinateArray = as_coordinate_array(bore_locations)
         # self.time: dict = {}  # the time values in years
 
         # an interpolation table for B/H ratios, D, r_b (used in the method
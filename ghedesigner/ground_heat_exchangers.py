@@ -1,5 +1,6 @@
 import warnings
 from math import ceil, floor
+from typing import Optional
 
 import numpy as np
 from scipy.interpolate import interp1d
@@ -8,10 +9,13 @@ from ghedesigner import VERSION
 from ghedesigner.borehole import GHEBorehole
 from ghedesigner.borehole_heat_exchangers import get_bhe_object
 from ghedesigner.constants import TWO_PI
-from ghedesigner.enums import BHPipeType, TimestepType
-from ghedesigner.gfunction import GFunction, calc_g_func_for_multiple_lengths
+from ghedesigner.design_state import DesignState, FlowState
+from ghedesigner.enums import BHPipeType, FlowConfigType, TimestepType
+from ghedesigner.gfunction import GFunction, calc_g_func_for_design_state
 from ghedesigner.ground_loads import HybridLoad
 from ghedesigner.media import Grout, Pipe, Soil
+from ghedesigner.profiling import timed
+from ghedesigner.progress import report_progress
 from ghedesigner.radial_numerical_borehole import RadialNumericalBH
 from ghedesigner.simulation import SimulationParameters
 from ghedesigner.utilities import solve_root
@@ -30,9 +34,10 @@ class BaseGHE:
             soil: Soil,
             g_function: GFunction,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             field_type="N/A",
             field_specifier="N/A",
+            design_state: Optional[DesignState] = None,
     ):
 
         self.fieldType = field_type
@@ -48,6 +53,12 @@ class BaseGHE:
         self.bhe_type = bhe_type
         self.bhe = get_bhe_object(bhe_type, m_flow_borehole, fluid, borehole, pipe, grout, soil)
 
+        # Value of the borehole heat exchanger inputs, the borehole height of the GHE is only changed through it
+        if design_state is None:
+            design_state = DesignState.from_media(bhe_type, borehole, pipe, grout, soil, fluid, self.V_flow_borehole,
+                                                  FlowConfigType.BOREHOLE)
+        self.design_state = design_state
+
         # Equivalent borehole Heat Exchanger
         self.bhe_eq = self.bhe.to_single()
 
@@ -65,6 +76,16 @@ class BaseGHE:
         self.times = []
         self.loading = None
 
+    def set_height(self, height: float) -> None:
+        """
+        Moves the GHE to a new borehole height. The design state is replaced by one at the new height,
+        and the borehole heat exchanger is rebuilt from it, so no borehole is shared between heights.
+        """
+        self.design_state = self.design_state.with_height(height)
+        self.bhe = get_bhe_object(self.bhe_type, self.m_flow_borehole, self.bhe.fluid,
+                                  self.design_state.borehole.to_borehole(), self.bhe.pipe, self.bhe.grout,
+                                  self.bhe.soil)
+
     def as_dict(self) -> dict:
         output = dict()
         output['title'] = f"GHEDesigner GHE Output - Version {VERSION}"
@@ -185,19 +206,13 @@ class BaseGHE:
         coordinates = self.gFunction.bore_locations
         log_time = self.gFunction.log_time
 
-        g_function = calc_g_func_for_multiple_lengths(
+        g_function = calc_g_func_for_design_state(
             self.B_spacing,
             h_values,
-            self.bhe.b.r_b,
-            self.bhe.b.D,
+            self.design_state,
             self.bhe.m_flow_borehole,
-            self.bhe_type,
             log_time,
             coordinates,
-            self.bhe.fluid,
-            self.bhe.pipe,
-            self.bhe.grout,
-            self.bhe.soil,
         )
 
         self.gFunction = g_function
@@ -216,10 +231,11 @@ class GHE(BaseGHE):
             soil: Soil,
             g_function: GFunction,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             field_type="N/A",
             field_specifier="N/A",
             load_years=None,
+            design_state: Optional[DesignState] = None,
     ):
         BaseGHE.__init__(
             self,
@@ -236,6 +252,7 @@ class GHE(BaseGHE):
             hourly_extraction_ground_loads,
             field_type=field_type,
             field_specifier=field_specifier,
+            design_state=design_state,
         )
 
         # Split the extraction loads into heating and cooling for input to
@@ -258,6 +275,28 @@ class GHE(BaseGHE):
         # list of change in borehole wall temperatures
         self.dTb = []
 
+    @classmethod
+    def from_design_state(cls, design_state: DesignState, b_spacing: float, g_function: GFunction,
+                          sim_params: SimulationParameters, hourly_extraction_ground_loads: np.ndarray,
+                          field_type="N/A", field_specifier="N/A", load_years=None) -> 'GHE':
+        """
+        Builds a GHE for the field of a g-function, from the borehole heat exchanger inputs of a design state.
+
+        :returns: a new GHE, whose media are owned by it
+        """
+        borehole, pipe, grout, soil, fluid = design_state.to_media()
+        flow = design_state.flow
+        if flow.flow_type == FlowConfigType.BOREHOLE:
+            v_flow_system = flow.flow_rate * len(g_function.bore_locations)
+        else:
+            v_flow_system = flow.flow_rate
+        # the GHE keeps its state per borehole, as its flow rate is fixed to the field
+        design_state = design_state.replace(flow=FlowState(v_flow_system / len(g_function.bore_locations),
+                                                           FlowConfigType.BOREHOLE))
+        return cls(v_flow_system, b_spacing, design_state.bhe_type, fluid, borehole, pipe, grout, soil, g_function,
+                   sim_params, hourly_extraction_ground_loads, field_type=field_type,
+                   field_specifier=field_specifier, load_years=load_years, design_state=design_state)
+
     def as_dict(self) -> dict:
         output = dict()
         output['base'] = super().as_dict()
@@ -273,7 +312,7 @@ class GHE(BaseGHE):
         results['peak_load_analysis'] = self.hybrid_load.as_dict()
 
         g_function = dict()
-        g_function['coordinates (x[m], y[m])'] = [(x, y) for x, y in self.gFunction.bore_locations]  # TODO: Verify form
+        g_function['coordinates (x[m], y[m])'] = self.gFunction.bore_locations.tolist()
         b_over_h = self.B_spacing / self.bhe.b.H
         g, _ = self.grab_g_function(b_over_h)
         total_g_values = g.x.size
@@ -297,6 +336,7 @@ class GHE(BaseGHE):
 
         return output
 
+    @timed('simulation')
     def simulate(self, method: TimestepType):
         b = self.B_spacing
         b_over_h = b / self.bhe.b.H
@@ -319,14 +359,14 @@ class GHE(BaseGHE):
         elif method == TimestepType.HOURLY:
             n_months = self.sim_params.end_month - self.sim_params.start_month + 1
             n_hours = int(n_months / 12.0 * 8760.0)
-            q_dot = self.hourly_extraction_ground_loads
+            q_dot = np.asarray(self.hourly_extraction_ground_loads, dtype=np.float64)
             # How many times does q need to be repeated?
             n_years = ceil(n_hours / 8760)
             if len(q_dot) // 8760 < n_years:
-                q_dot = q_dot * n_years
+                q_dot = np.tile(q_dot, n_years)
             else:
                 n_hours = len(q_dot)
-            q_dot = -1.0 * np.array(q_dot)  # Convert loads to rejection
+            q_dot = -1.0 * q_dot  # Convert loads to rejection
             # print("Times:",self.times)
             if len(self.times) == 0:
                 self.times = np.arange(1, n_hours + 1, 1)
@@ -342,19 +382,21 @@ class GHE(BaseGHE):
 
         return max(hp_eft), min(hp_eft)
 
+    @timed('sizing')
     def size(self, method: TimestepType) -> None:
-        # Size the ground heat exchanger
+        # Size the ground heat exchanger. Each height gets its own borehole, built from the design state.
         def local_objective(h):
-            self.bhe.b.H = h
+            self.set_height(h)
             max_hp_eft, min_hp_eft = self.simulate(method=method)
             t_excess = self.cost(max_hp_eft, min_hp_eft)
+            report_progress('sizing_iteration', height=h, excess_temperature=t_excess)
             return t_excess
 
         # Make the initial guess variable the average of the heights given
-        self.bhe.b.H = (self.sim_params.max_height + self.sim_params.min_height) / 2.0
-        # bhe.b.H is updated during sizing
+        self.set_height((self.sim_params.max_height + self.sim_params.min_height) / 2.0)
+        # the design state is updated during sizing
         returned_height = solve_root(
-            self.bhe.b.H,
+            self.design_state.borehole.height,
             local_objective,
             lower=self.sim_params.min_height,
             upper=self.sim_params.max_height,
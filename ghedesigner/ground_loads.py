@@ -1,21 +1,32 @@
 import warnings
 from calendar import monthrange
+from copy import deepcopy
 from json import dumps
 from math import floor
+from typing import Union
 
 import numpy as np
 from scipy.interpolate import interp1d
 
 from ghedesigner.borehole_heat_exchangers import SingleUTube
+from ghedesigner.cache import LOAD_CACHE, cache_key
 from ghedesigner.constants import TWO_PI
+from ghedesigner.profiling import timed
 from ghedesigner.radial_numerical_borehole import RadialNumericalBH
 from ghedesigner.simulation import SimulationParameters
 
 
 class HybridLoad:
+    # attributes computed from the loads alone by split_loads_by_month and process_two_day_loads
+    preprocessed_attributes = [
+        'monthly_cl', 'monthly_hl', 'monthly_peak_cl', 'monthly_peak_hl', 'monthly_avg_cl', 'monthly_avg_hl',
+        'monthly_peak_cl_day', 'monthly_peak_hl_day', 'two_day_hourly_peak_cl_loads', 'two_day_hourly_peak_hl_loads',
+    ]
+
+    @timed('hybrid_load')
     def __init__(
             self,
-            raw_loads: list,
+            raw_loads: Union[list, np.ndarray],
             bhe: SingleUTube,
             radial_numerical: RadialNumericalBH,
             sim_params: SimulationParameters,
@@ -79,8 +90,6 @@ class HybridLoad:
         self.monthly_peak_cl_day = [0] * num_unique_months
         # day of the month on which peak htg load occurs (e.g. 1-31)
         self.monthly_peak_hl_day = [0] * num_unique_months
-        # Process the loads by month
-        self.split_loads_by_month()
 
         # 48 hour loads are going to be necessary for the hourly simulation for
         # finding the peak load duration
@@ -90,7 +99,19 @@ class HybridLoad:
         self.two_day_hourly_peak_cl_loads = [[0]]
         # list of two day (48 hour) heating loads (or heat extraction) in kWh
         self.two_day_hourly_peak_hl_loads = [[0]]
-        self.process_two_day_loads()
+
+        # The monthly and two day loads only depend on the loads themselves,
+        # so they can be reused from the cache
+        load_key = cache_key(np.asarray(raw_loads, dtype=np.float64), years)
+        cached_loads = LOAD_CACHE.get(load_key)
+        if cached_loads is None:
+            # Process the loads by month
+            self.split_loads_by_month()
+            self.process_two_day_loads()
+            LOAD_CACHE.put(load_key, deepcopy({name: getattr(self, name) for name in self.preprocessed_attributes}))
+        else:
+            for name, value in cached_loads.items():
+                setattr(self, name, deepcopy(value))
 
         # Now we need to perform 48-hour simulations to determine the
         # monthly peak load hours
@@ -132,10 +153,11 @@ class HybridLoad:
         Heating is positive, cooling is negative.
 
         :param raw_loads: raw loads entered by the user, in Watts
-        :return: Loads split into heating and cooling
+        :return: Loads split into heating and cooling, in kW
         """
-        hourly_extraction_loads = [x / 1000.0 if x >= 0.0 else 0.0 for x in raw_loads]
-        hourly_rejection_loads = [abs(x) / 1000.0 if x < 0.0 else 0.0 for x in raw_loads]
+        raw_loads = np.asarray(raw_loads, dtype=np.float64)
+        hourly_extraction_loads = np.where(raw_loads >= 0.0, raw_loads / 1000.0, 0.0)
+        hourly_rejection_loads = np.where(raw_loads < 0.0, -raw_loads / 1000.0, 0.0)
 
         return hourly_rejection_loads, hourly_extraction_loads
 
@@ -158,15 +180,15 @@ class HybridLoad:
 
             # Sum
             # monthly cooling loads (or heat rejection) in kWh
-            self.monthly_cl[i] = sum(month_rejection_loads)
+            self.monthly_cl[i] = float(month_rejection_loads.sum())
             # monthly heating loads (or heat extraction) in kWh
-            self.monthly_hl[i] = sum(month_extraction_loads)
+            self.monthly_hl[i] = float(month_extraction_loads.sum())
 
             # Peak
             # monthly peak cooling load (or heat rejection) in kW
-            self.monthly_peak_cl[i] = max(month_rejection_loads)
+            self.monthly_peak_cl[i] = float(month_rejection_loads.max())
             # monthly peak heating load (or heat extraction) in kW
-            self.monthly_peak_hl[i] = max(month_extraction_loads)
+            self.monthly_peak_hl[i] = float(month_extraction_loads.max())
 
             # Average
             # monthly average cooling load (or heat rejection) in kW
@@ -176,9 +198,9 @@ class HybridLoad:
 
             # Day of month the peak heating load occurs
             # day of the month on which peak clg load occurs (e.g. 1-31)
-            self.monthly_peak_cl_day[i] = floor(month_rejection_loads.index(self.monthly_peak_cl[i]) / hours_in_day)
+            self.monthly_peak_cl_day[i] = floor(int(month_rejection_loads.argmax()) / hours_in_day)
             # day of the month on which peak clg load occurs (e.g. 1-31)
-            self.monthly_peak_hl_day[i] = floor(month_extraction_loads.index(self.monthly_peak_hl[i]) / hours_in_day)
+            self.monthly_peak_hl_day[i] = floor(int(month_extraction_loads.argmax()) / hours_in_day)
             # print("Monthly Peak HL Hour",month_extraction_loads.index(
             # self.monthly_peak_hl[i]) / hours_in_day)
             # print("Monthly Peak HL Day: ",self.monthly_peak_hl_day[i])
@@ -198,10 +220,12 @@ class HybridLoad:
         # for the possibility that a peak load occurs on the first day of the
         # year
 
-        hourly_rejection_loads = (self.hourly_rejection_loads[
-                                  hours_in_year - hours_in_day: hours_in_year] + self.hourly_rejection_loads)
-        hourly_extraction_loads = (self.hourly_extraction_loads[
-                                   hours_in_year - hours_in_day: hours_in_year] + self.hourly_extraction_loads)
+        hourly_rejection_loads = np.concatenate((self.hourly_rejection_loads[
+                                                 hours_in_year - hours_in_day: hours_in_year],
+                                                 self.hourly_rejection_loads))
+        hourly_extraction_loads = np.concatenate((self.hourly_extraction_loads[
+                                                  hours_in_year - hours_in_day: hours_in_year],
+                                                  self.hourly_extraction_loads))
 
         # Keep track of how many hours are in
         # start at 24 since we added the last day of the year to the beginning
@@ -242,9 +266,9 @@ class HybridLoad:
             # assert monthly_peak_hl_hour_month == monthly_peak_hl_day - 1
 
             # monthly cooling loads (or heat rejection) in kWh
-            self.two_day_hourly_peak_cl_loads.append(two_day_hourly_peak_cl_load)
+            self.two_day_hourly_peak_cl_loads.append(two_day_hourly_peak_cl_load.tolist())
             # monthly heating loads (or heat extraction) in kWh
-            self.two_day_hourly_peak_hl_loads.append(two_day_hourly_peak_hl_load)
+            self.two_day_hourly_peak_hl_loads.append(two_day_hourly_peak_hl_load.tolist())
 
             hours_in_previous_months += hours_in_month
 
@@ -0,0 +1,101 @@
+from math import pi
+from typing import Optional
+
+import numpy as np
+import pygfunction as gt
+
+from ghedesigner.borehole import GHEBorehole
+from ghedesigner.simulation import SimulationParameters
+
+
+def single_borehole_mean_response(borehole: GHEBorehole, alpha: float, loads: np.ndarray,
+                                  num_bins: int) -> float:
+    """
+    Time average of the single borehole finite line source response to a load history, times 2 pi k L, in W.
+
+    Averaged over the duration T of the loads, the borehole wall temperature change is the integral of
+    q(t) g(T - t) over T, so each load is weighted by the g-function at its time to the end of the loads,
+    and late loads weigh less than early ones. For a constant load, this is the load times the time-averaged
+    g-function. The loads are averaged over bins, e.g. months, and g over each bin with the trapezoidal rule.
+
+    :param loads: heat rejection to the ground at evenly spaced times, in W.
+    :param num_bins: number of bins the loads are averaged over.
+    """
+    loads = np.asarray(loads, dtype=np.float64)
+    bin_edges = np.linspace(0, len(loads), num_bins + 1).round().astype(int)
+    bin_loads = np.add.reduceat(loads, bin_edges[:-1]) / np.diff(bin_edges)
+
+    # g at the time from each bin edge to the end of the loads, in s
+    lags = (len(loads) - bin_edges[:-1]) * 3600.0
+    g = np.atleast_1d(gt.heat_transfer.finite_line_source(lags, alpha, borehole, borehole))
+    g = np.concatenate((g, [0.0]))
+    bin_weights = 0.5 * (g[1:] + g[:-1]) * np.diff(bin_edges) / len(loads)
+    return float(np.dot(bin_loads, bin_weights))
+
+
+def infeasible_field_sizes(num_boreholes: np.ndarray, borehole: GHEBorehole, soil_conductivity: float,
+                           soil_rho_cp: float, undisturbed_temp: float, sim_params: SimulationParameters,
+                           hourly_rejection_loads: np.ndarray, m_flow_total: np.ndarray, fluid_cp: float,
+                           peak_rejection_loads: Optional[np.ndarray] = None,
+                           borehole_resistance: Optional[float] = None) -> np.ndarray:
+    """
+    Finds the field sizes whose total borehole length is below a cheap analytical lower bound, and so
+    cannot meet the entering fluid temperature limits. No g-function is solved.
+
+    Two bounds are used:
+
+    - net load: the time-averaged heat pump entering temperature, from the load history and a single
+      borehole finite line source, must lie within the temperature limits. This is an estimate rather than
+      a strict bound: the hybrid simulation samples its entering temperatures at peak and monthly times, and
+      with loads of both signs, the larger g-function of a field does not always raise the average. Callers
+      should check the largest field ruled out before trusting the result.
+    - peak load: when the simulated loads are all rejection or all extraction, the borehole wall temperature
+      only moves away from the undisturbed temperature, so the peak load times the effective borehole
+      resistance alone must keep the entering temperature within the limits.
+
+    :param num_boreholes: number of boreholes of each field.
+    :param borehole: borehole, with the height of the fields, in m.
+    :param hourly_rejection_loads: hourly heat rejection to the ground, in W.
+    :param m_flow_total: total fluid mass flow rate of each field, in kg/s.
+    :param peak_rejection_loads: heat rejection to the ground of the simulation steps, in W.
+    :param borehole_resistance: effective borehole thermal resistance of the fields, in m-K/W.
+     None skips the peak load bound, e.g. when the resistance depends on the field.
+    :returns: mask of the fields that are too small
+    """
+
+    num_boreholes = np.asarray(num_boreholes, dtype=np.float64)
+    m_flow_total = np.asarray(m_flow_total, dtype=np.float64)
+    total_length = num_boreholes * borehole.H
+    max_eft = sim_params.max_EFT_allowable
+    min_eft = sim_params.min_EFT_allowable
+
+    n_months = sim_params.end_month - sim_params.start_month + 1
+    n_hours = int(n_months / 12.0 * 8760.0)
+    loads = np.resize(np.asarray(hourly_rejection_loads, dtype=np.float64), n_hours)
+    q_net = float(np.mean(loads))
+
+    # fluid temperature drop between the borehole mean and the outlet, per W
+    outlet_factor = 1.0 / (2.0 * m_flow_total * fluid_cp)
+
+    alpha = soil_conductivity / soil_rho_cp
+    q_response = single_borehole_mean_response(borehole, alpha, loads, n_months)
+    mean_eft = undisturbed_temp + q_response / (2.0 * pi * soil_conductivity * total_length) - q_net * outlet_factor
+    if q_net > 0.0 and q_response > 0.0:
+        infeasible = mean_eft > max_eft
+    elif q_net < 0.0 and q_response < 0.0:
+        infeasible = mean_eft < min_eft
+    else:
+        infeasible = np.zeros(num_boreholes.shape, dtype=bool)
+
+    if peak_rejection_loads is not None and borehole_resistance is not None:
+        peak_loads = np.asarray(peak_rejection_loads, dtype=np.float64)
+        if np.all(peak_loads >= 0.0):
+            q_peak = float(np.max(peak_loads))
+            peak_eft = undisturbed_temp + q_peak * (borehole_resistance / total_length - outlet_factor)
+            infeasible |= peak_eft > max_eft
+        elif np.all(peak_loads <= 0.0):
+            q_peak = float(np.min(peak_loads))
+            peak_eft = undisturbed_temp + q_peak * (borehole_resistance / total_length - outlet_factor)
+            infeasible |= peak_eft < min_eft
+
+    return infeasible
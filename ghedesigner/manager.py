@@ -1,28 +1,36 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from glob import glob, has_magic
 from json import loads, dumps
 from pathlib import Path
 from sys import exit, stderr
+from threading import Thread
 from time import time
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
 import click
 
-from jsonschema import ValidationError
-
 from ghedesigner import VERSION
-from ghedesigner.borehole import GHEBorehole
 from ghedesigner.constants import DEG_TO_RAD
-from ghedesigner.design import AnyBisectionType, DesignBase, DesignNearSquare, DesignRectangle, DesignBiRectangle
-from ghedesigner.design import DesignBiZoned, DesignBiRectangleConstrained, DesignRowWise
-from ghedesigner.enums import BHPipeType, TimestepType, DesignGeomType, FlowConfigType
+from ghedesigner.enums import BHPipeType, TimestepType, DesignGeomType, FieldSearchType, FlowConfigType
 from ghedesigner.geometry import GeometricConstraints, GeometricConstraintsRectangle, GeometricConstraintsNearSquare
 from ghedesigner.geometry import GeometricConstraintsBiRectangle, GeometricConstraintsBiZoned
 from ghedesigner.geometry import GeometricConstraintsBiRectangleConstrained, GeometricConstraintsRowWise
-from ghedesigner.media import GHEFluid, Grout, Pipe, Soil
-from ghedesigner.output import OutputManager
 from ghedesigner.simulation import SimulationParameters
-from ghedesigner.utilities import write_idf
 from ghedesigner.validate import validate_input_file
 
+# The solver stack (numpy, scipy, pygfunction) is only imported where it is first needed, so the
+# CLI can validate inputs, convert outputs and report its version without loading it.
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ghedesigner.borehole import GHEBorehole
+    from ghedesigner.capacity import LoadCapacity
+    from ghedesigner.design import AnyBisectionType, DesignBase
+    from ghedesigner.media import GHEFluid, Grout, Pipe, Soil
+    from ghedesigner.output import OutputManager
+    from ghedesigner.progress import ProgressEvent
+
 
 class GHEManager:
 
@@ -34,7 +42,7 @@ class GHEManager:
         self.pipe_type: Optional[BHPipeType] = None
         self._borehole: Optional[GHEBorehole] = None
         self._simulation_parameters: Optional[SimulationParameters] = None
-        self._ground_loads: Optional[List[float]] = None
+        self._ground_loads: Optional[np.ndarray] = None
         # OK so geometric_constraints is tricky.  We have base classes, yay!
         # Unfortunately, the functionality between the child classes is not actually
         # collapsed into a base class function ... yet.  So there will be complaints
@@ -43,10 +51,12 @@ class GHEManager:
         self._geometric_constraints: Optional[GeometricConstraints] = None
         self._design: Optional[DesignBase] = None
         self._search: Optional[AnyBisectionType] = None
+        self._load_capacity: Optional[LoadCapacity] = None
         self.results: Optional[OutputManager] = None
 
         # some things for results
         self._search_time: int = 0
+        self._performance: Optional[dict] = None
         self.summary_results: dict = {}
 
     def set_design_geometry_type(self, design_geometry_str: str, throw: bool = True) -> int:
@@ -119,6 +129,8 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import GHEFluid
+
         try:
             self._fluid = GHEFluid(fluid_str=fluid_name,
                                    percent=concentration_percent,
@@ -140,6 +152,8 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Grout
+
         self._grout = Grout(conductivity, rho_cp)
         return 0
 
@@ -153,6 +167,8 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Soil
+
         self._soil = Soil(conductivity, rho_cp, undisturbed_temp)
         return 0
 
@@ -170,6 +186,7 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Pipe
 
         r_in = inner_diameter / 2.0
         r_out = outer_diameter / 2.0
@@ -193,6 +210,7 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Pipe
 
         r_in = inner_diameter / 2.0
         r_out = outer_diameter / 2.0
@@ -216,6 +234,7 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Pipe
 
         r_in = inner_diameter / 2.0
         r_out = outer_diameter / 2.0
@@ -243,6 +262,7 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.media import Pipe
 
         self.pipe_type = BHPipeType.COAXIAL
 
@@ -263,6 +283,8 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.borehole import GHEBorehole
+
         radius = diameter / 2.0
         self._borehole = GHEBorehole(height, buried_depth, radius, x=0.0, y=0.0)
         return 0
@@ -291,17 +313,50 @@ class GHEManager:
         )
         return 0
 
-    def set_ground_loads_from_hourly_list(self, hourly_ground_loads: List[float]) -> int:
+    def set_ground_loads_from_hourly_list(self, hourly_ground_loads: Union[List[float], 'np.ndarray']) -> int:
         """
-        Sets the ground loads based on a list input.
+        Sets the ground loads based on a list or array input.
 
         :param hourly_ground_loads: annual, hourly ground loads, in W.
          positive values indicate heat extraction, negative values indicate heat rejection.
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
-        # TODO: Add API methods for different load inputs
-        self._ground_loads = hourly_ground_loads
+        import numpy as np
+
+        self._ground_loads = np.asarray(hourly_ground_loads, dtype=np.float64)
+        return 0
+
+    def set_ground_loads_from_file(self, load_file_path: Path, throw: bool = True) -> int:
+        """
+        Sets the ground loads from a CSV or NumPy .npy file. .npy files are memory-mapped.
+
+        :param load_file_path: path to the load file, holding one year of hourly ground loads, i.e. 8760 values,
+         in W. positive values indicate heat extraction, negative values indicate heat rejection.
+        :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :returns: Zero if successful, nonzero if failure
+        :rtype: int
+        """
+        from ghedesigner.utilities import read_hourly_loads
+
+        try:
+            ground_loads = read_hourly_loads(Path(load_file_path))
+        except (OSError, ValueError) as e:
+            message = f"Ground loads could not be read from {load_file_path}: {e}"
+            print(message, file=stderr)
+            if throw:
+                raise ValueError(message)
+            return 1
+
+        # like the ground_loads list of the input file, the designs take one year of hourly loads
+        if len(ground_loads) != 8760:
+            message = f"Load file {load_file_path} holds {len(ground_loads)} hourly loads, 8760 are required."
+            print(message, file=stderr)
+            if throw:
+                raise ValueError(message)
+            return 1
+
+        self._ground_loads = ground_loads
         return 0
 
     def set_geometry_constraints_near_square(self, b: float, length: float) -> int:
@@ -386,7 +441,10 @@ class GHEManager:
     def set_geometry_constraints_rowwise(self, perimeter_spacing_ratio: Union[float, None],
                                          max_spacing: float, min_spacing: float, spacing_step: float,
                                          max_rotation: float, min_rotation: float, rotate_step: float,
-                                         property_boundary: list, no_go_boundaries: list) -> int:
+                                         property_boundary: list, no_go_boundaries: list,
+                                         rotate_workers: Optional[int] = None,
+                                         rotate_coarse_factor: Optional[int] = None,
+                                         rotate_refine_count: int = 3) -> int:
         """
         Sets the geometry constraints for the row-wise design method.
 
@@ -404,6 +462,11 @@ class GHEManager:
         :param rotate_step: step size for field rotation search.
         :param property_boundary: property boundary points.
         :param no_go_boundaries: boundary points for no-go zones.
+        :param rotate_workers: number of worker processes the rotation sweep of each field is run with, serially
+            if None or 1.
+        :param rotate_coarse_factor: if given, the rotation sweep first checks every rotate_coarse_factor-th
+            rotation, then refines around the best ones.
+        :param rotate_refine_count: number of best coarse rotations to refine around.
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
@@ -416,7 +479,10 @@ class GHEManager:
         self._geometric_constraints = GeometricConstraintsRowWise(perimeter_spacing_ratio,
                                                                   min_spacing, max_spacing, spacing_step,
                                                                   min_rotation, max_rotation, rotate_step,
-                                                                  property_boundary, no_go_boundaries)
+                                                                  property_boundary, no_go_boundaries,
+                                                                  rotate_workers=rotate_workers,
+                                                                  rotate_coarse_factor=rotate_coarse_factor,
+                                                                  rotate_refine_count=rotate_refine_count)
         return 0
 
     def set_design(self, flow_rate: float, flow_type_str: str, throw: bool = True) -> int:
@@ -429,6 +495,8 @@ class GHEManager:
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
+        from ghedesigner.design import DesignNearSquare, DesignRectangle, DesignBiRectangle
+        from ghedesigner.design import DesignBiZoned, DesignBiRectangleConstrained, DesignRowWise
 
         flow_type_str = flow_type_str.upper()
         if flow_type_str == FlowConfigType.SYSTEM.name:
@@ -559,11 +627,31 @@ class GHEManager:
             return 1
         return 0
 
-    def find_design(self, throw: bool = True) -> int:
+    def find_design(self, throw: bool = True, time_budget: Optional[float] = None,
+                    max_evaluations: Optional[int] = None,
+                    on_refined: Optional[Callable[['AnyBisectionType'], None]] = None,
+                    on_refine_error: Optional[Callable[[Exception], None]] = None,
+                    checkpoint_path: Optional[Path] = None, resume: bool = False,
+                    field_search: str = "bisection") -> int:
         """
         Calls design methods to execute sizing.
 
+        When a time or evaluation budget is given and runs out, the smallest feasible field evaluated so far is
+        sized, and the search is flagged as budget_limited in the results.
+
         :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :param time_budget: max wall-clock time of the field search, in s, None for no limit.
+        :param max_evaluations: max number of candidate fields evaluated by the search, None for no limit.
+        :param on_refined: called from a background thread with the sized search of an unbudgeted run, when the
+         budget ran out. The results of this manager are not changed. The refinement runs alongside later work of
+         the process, so the process-wide phase statistics of performance_snapshot include its phases.
+        :param on_refine_error: called from the background thread with the exception if the refinement fails,
+         instead of on_refined. If None, the error is printed to stderr.
+        :param checkpoint_path: file to save the search progress to after each evaluated candidate. The file is
+         removed when the design is found.
+        :param resume: continue the search from the checkpoint file, without repeating its completed evaluations.
+        :param field_search: how the search narrows down the field index, "bisection" or "secant". The secant
+         search jumps to the predicted zero crossing of the excess temperature, and usually evaluates fewer fields.
         :returns: Zero if successful, nonzero if failure
         :rtype: int
         """
@@ -585,17 +673,248 @@ class GHEManager:
                 raise ValueError(message)
             return 1
 
+        field_search_str = str(field_search).upper()
+        if field_search_str == FieldSearchType.BISECTION.name:
+            field_search_type = FieldSearchType.BISECTION
+        elif field_search_str == FieldSearchType.SECANT.name:
+            field_search_type = FieldSearchType.SECANT
+        else:
+            message = f"Field search \"{field_search}\" not supported."
+            print(message, file=stderr)
+            if throw:
+                raise ValueError(message)
+            return 1
+
+        from ghedesigner.gfunction import GFunctionMemoryError
+        from ghedesigner.profiling import collect_design_stats
+        from ghedesigner.progress import report_progress
+        from ghedesigner.search_budget import SearchBudget
+
+        checkpoint = None
+        if checkpoint_path is not None:
+            from ghedesigner.checkpoint import SearchCheckpoint
+            checkpoint = SearchCheckpoint(checkpoint_path, resume=resume)
+
+        budget = None
+        if time_budget is not None or max_evaluations is not None:
+            budget = SearchBudget(time_budget, max_evaluations)
+
         start_time = time()
-        self._search = self._design.find_design()
-        self._search.ghe.compute_g_functions()
-        self._search_time = time() - start_time
-        self._search.ghe.size(method=TimestepType.HYBRID)
+        with collect_design_stats() as design_stats:
+            try:
+                search = self._design.find_design(budget=budget, checkpoint=checkpoint,
+                                                  field_search=field_search_type)
+                if budget is not None:
+                    budget.stop()
+                search.ghe.compute_g_functions()
+            except GFunctionMemoryError as e:
+                print(e, file=stderr)
+                if throw:
+                    raise
+                return 1
+            search_time = time() - start_time
+            search.ghe.size(method=TimestepType.HYBRID)
+
+        report_progress('design_finished', number_of_boreholes=search.ghe.nbh, height=search.ghe.bhe.b.H)
+
+        # the results are only replaced by a fully sized design, not by one cancelled or failed on the way
+        self._search = search
+        self._search_time = search_time
+        self._performance = design_stats.report()
+        self._load_capacity = None
+        if checkpoint is not None:
+            checkpoint.remove()
+
+        if search.budget_limited and on_refined is not None:
+            # the searches build their own media from the design inputs, so they can run alongside this one
+            Thread(target=self._refine_design, args=(on_refined, field_search_type, on_refine_error),
+                   daemon=True).start()
         return 0
 
+    def _refine_design(self, on_refined: Callable[['AnyBisectionType'], None], field_search: FieldSearchType,
+                       on_refine_error: Optional[Callable[[Exception], None]] = None) -> None:
+        # exceptions would end the background thread silently, so they are reported to the caller
+        try:
+            search = self._design.find_design(field_search=field_search)
+            search.ghe.compute_g_functions()
+            search.ghe.size(method=TimestepType.HYBRID)
+        except Exception as e:
+            if on_refine_error is not None:
+                on_refine_error(e)
+            else:
+                print(f"Refinement of the budget-limited design failed: {type(e).__name__}: {e}", file=stderr)
+            return
+        on_refined(search)
+
+    async def find_design_async(self, on_progress: Optional[Callable[['ProgressEvent'], None]] = None,
+                                executor: Optional[ThreadPoolExecutor] = None, **kwargs) -> int:
+        """
+        Runs find_design in a thread executor, without blocking the event loop.
+
+        Cancelling the awaiting task stops the design at its next progress event, e.g. the next candidate
+        evaluation or sizing iteration, so no CPU is spent on abandoned designs, and leaves the results of the
+        manager unchanged. Only one design may run on a manager at a time.
+
+        :param on_progress: called on the event loop with each progress event of the design.
+        :param executor: thread executor to run the design in, the default executor of the event loop if None.
+         Process executors are not supported, the design has to run in this process to update the manager.
+        :param kwargs: arguments of find_design.
+        :returns: Zero if successful, nonzero if failure
+        """
+        import asyncio
+        from threading import Event
+
+        from ghedesigner.progress import progress_reporting
+
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(f"find_design_async runs in a ThreadPoolExecutor, not a {type(executor).__name__}.")
+
+        loop = asyncio.get_running_loop()
+        cancel_event = Event()
+
+        def notify(event):
+            if on_progress is not None:
+                loop.call_soon_threadsafe(on_progress, event)
+
+        def run():
+            with progress_reporting(notify, cancel_event):
+                return self.find_design(**kwargs)
+
+        future = loop.run_in_executor(executor, run)
+        # the design of a cancelled task ends with DesignCancelled, which nobody awaits
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+
+    async def iter_design_events(self, executor: Optional[ThreadPoolExecutor] = None,
+                                 **kwargs) -> AsyncIterator['ProgressEvent']:
+        """
+        Runs find_design in an executor, and yields its progress events as they happen.
+
+        The last event of a successful design is design_finished. Errors of the design are raised after the
+        events before them, and leaving the iteration early cancels the design.
+
+        :param executor: thread executor to run the design in, the default executor of the event loop if None.
+        :param kwargs: arguments of find_design.
+        """
+        import asyncio
+
+        queue = asyncio.Queue()
+        task = asyncio.ensure_future(self.find_design_async(queue.put_nowait, executor, **kwargs))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def run_uncertainty_analysis(self, num_samples: int = 1000, soil_conductivity_cov: float = 0.1,
+                                 soil_heat_capacity_cov: float = 0.1, grout_conductivity_cov: float = 0.0,
+                                 grout_heat_capacity_cov: float = 0.0, load_scale_cov: float = 0.0,
+                                 percentiles: Tuple[float, ...] = (10.0, 50.0, 90.0), p_level: float = 90.0,
+                                 seed: Optional[int] = None, workers: Optional[int] = None,
+                                 throw: bool = True) -> Optional[dict]:
+        """
+        Evaluates the found design for uncertain soil and grout properties and loads.
+
+        The inputs are sampled log-normally around their design values. The g-functions of the design
+        are reused for every sample, so no g-function is recomputed.
+
+        :param num_samples: number of samples.
+        :param soil_conductivity_cov: coefficient of variation of the soil conductivity.
+        :param soil_heat_capacity_cov: coefficient of variation of the soil volumetric heat capacity.
+        :param grout_conductivity_cov: coefficient of variation of the grout conductivity.
+        :param grout_heat_capacity_cov: coefficient of variation of the grout volumetric heat capacity.
+        :param load_scale_cov: coefficient of variation of a factor scaling all ground loads.
+        :param percentiles: percentiles of the fluid temperatures and required borehole heights to report.
+        :param p_level: percentile of the required borehole height to size for, e.g. 90 for a P90 design.
+        :param seed: seed of the random samples.
+        :param workers: number of worker processes to evaluate the samples with, runs serially if None or 1.
+        :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :returns: the percentiles of the max and min heat pump entering temperatures at the design height and
+         of the required borehole height, and the P-level borehole height and total drilling, or None on error
+        """
+
+        if self._search is None:
+            message = "GHEManager.find_design must be called before GHEManager.run_uncertainty_analysis."
+            print(message, file=stderr)
+            if throw:
+                raise ValueError(message)
+            return None
+
+        from ghedesigner.uncertainty import run_uncertainty_analysis, sample_inputs
+
+        ghe = self._search.ghe
+        samples = sample_inputs(num_samples, ghe.bhe.soil, ghe.bhe.grout, soil_conductivity_cov,
+                                soil_heat_capacity_cov, grout_conductivity_cov, grout_heat_capacity_cov,
+                                load_scale_cov, seed)
+        return run_uncertainty_analysis(ghe, samples, list(percentiles), p_level, workers)
+
+    def get_load_capacity(self, throw: bool = True) -> Optional['LoadCapacity']:
+        """
+        Gets the load capacity of the found design, i.e. how far its heating and cooling loads can grow.
+
+        The unit responses of the design are computed on the first call, after which queries such as
+        max_multiplier and entering_temperature_range take well under a millisecond.
+
+        :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :returns: the load capacity of the design, or None on error
+        """
+
+        if self._search is None:
+            message = "GHEManager.find_design must be called before GHEManager.get_load_capacity."
+            print(message, file=stderr)
+            if throw:
+                raise ValueError(message)
+            return None
+
+        if self._load_capacity is None:
+            from ghedesigner.capacity import LoadCapacity
+            self._load_capacity = LoadCapacity(self._search.ghe)
+        return self._load_capacity
+
+    def run_sweep(self, grid: Dict[str, list], jobs: int = 1, throw: bool = True) -> Optional[List[dict]]:
+        """
+        Finds the design of each combination of the parameter values of a grid, around the current configuration.
+
+        Each point only recomputes the stages of the design its parameters invalidate. Changing the EFT
+        limits, for example, reuses the field domains, g-functions, STS g-functions and hybrid loads.
+
+        :param grid: values of each parameter, by the path of the parameter in the input data, e.g. "design.max_eft".
+         A path of an input section, e.g. "pipe", takes dicts updating several keys of the section together.
+        :param jobs: number of groups of points to run in parallel.
+        :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :returns: the results row of each point, or None on error
+        """
+
+        inputs = self.to_input(throw=throw)
+        if inputs is None:
+            return None
+
+        from ghedesigner.sweep import run_sweep
+
+        try:
+            return run_sweep(inputs, grid, jobs=jobs)
+        except ValueError as e:
+            print(e, file=stderr)
+            if throw:
+                raise
+            return None
+
     def prepare_results(self, project_name: str, note: str, author: str, iteration_name: str):
         """
         Prepares the output results.
         """
+        from ghedesigner.output import OutputManager
+
         self.results = OutputManager(
             self._search,
             self._search_time,
@@ -604,6 +923,7 @@ class GHEManager:
             author,
             iteration_name,
             load_method=TimestepType.HYBRID,
+            performance=self._performance,
         )
 
     def write_output_files(self, output_directory: Path, output_file_suffix: str = ""):
@@ -615,14 +935,12 @@ class GHEManager:
         """
         self.results.write_all_output_files(output_directory=output_directory, file_suffix=output_file_suffix)
 
-    def write_input_file(self, output_file_path: Path, throw: bool = True) -> int:
+    def to_input(self, throw: bool = True) -> Optional[dict]:
         """
-        Writes an input file based on current simulation configuration.
+        Builds the input data of the current simulation configuration, as written to an input file.
 
-        :param output_file_path: output directory to write input file.
         :param throw: By default, function will raise an exception on error, override to false to not raise exception
-        :returns: Zero if successful, nonzero if failure
-        :rtype: int
+        :returns: the input data, or None on error
         """
 
         # TODO: geometric constraints are currently held in two places
@@ -657,7 +975,7 @@ class GHEManager:
             print(message, file=stderr)
             if throw:
                 raise ValueError(message)
-            return 1
+            return None
 
         if self.pipe_type == BHPipeType.SINGLEUTUBE:
             d_pipe['arrangement'] = BHPipeType.SINGLEUTUBE.name
@@ -672,7 +990,7 @@ class GHEManager:
             print(message, file=stderr)
             if throw:
                 raise ValueError(message)
-            return 1
+            return None
 
         d = {
             'version': VERSION,
@@ -684,20 +1002,39 @@ class GHEManager:
             'simulation': self._simulation_parameters.to_input(),
             'geometric_constraints': d_geo,
             'design': d_des,
-            'loads': {'ground_loads': self._ground_loads}
+            'loads': {'ground_loads': self._ground_loads.tolist()}
         }
+        return d
+
+    def write_input_file(self, output_file_path: Path, throw: bool = True) -> int:
+        """
+        Writes an input file based on current simulation configuration.
+
+        :param output_file_path: output directory to write input file.
+        :param throw: By default, function will raise an exception on error, override to false to not raise exception
+        :returns: Zero if successful, nonzero if failure
+        :rtype: int
+        """
+
+        d = self.to_input(throw=throw)
+        if d is None:
+            return 1
 
         with open(output_file_path, 'w') as f:
             f.write(dumps(d, sort_keys=True, indent=2, separators=(',', ': ')))
         return 0
 
 
-def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -> int:
+def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path, resume: bool = False,
+                                checkpoint: bool = False) -> int:
     """
     Worker function to run simulation.
 
     :param input_file_path: path to input file.
     :param output_directory: path to write output files.
+    :param resume: continue the search from the checkpoint in the output directory, if any. Implies checkpoint.
+    :param checkpoint: save the search progress to 'SearchCheckpoint.json' in the output directory after each
+     evaluated candidate, until the design is found.
     """
 
     if not input_file_path.exists():
@@ -714,6 +1051,55 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
 
     inputs = loads(input_file_path.read_text())
 
+    ghe = setup_manager_from_inputs(inputs, input_file_path.parent)
+    if ghe is None:
+        return 1
+
+    checkpoint_path = output_directory / "SearchCheckpoint.json" if checkpoint or resume else None
+    if ghe.find_design(throw=False, checkpoint_path=checkpoint_path, resume=resume) != 0:
+        return 1
+    ghe.prepare_results("GHEDesigner Run from CLI", "Notes", "Author", "Iteration Name")
+    ghe.write_output_files(output_directory)
+
+    return 0
+
+
+def run_manager_from_cli_profiled(input_file_path: Path, output_directory: Path, resume: bool = False,
+                                  checkpoint: bool = False) -> int:
+    """
+    Runs the simulation under cProfile, and writes the stats to 'Profile.prof' and,
+    sorted by cumulative time, to 'Profile.txt' in the output directory.
+
+    :param input_file_path: path to input file.
+    :param output_directory: path to write output files.
+    :param resume: continue the search from the checkpoint in the output directory, if any.
+    :param checkpoint: save the search progress to the output directory after each evaluated candidate.
+    """
+    from cProfile import Profile
+    from io import StringIO
+    from pstats import Stats
+
+    profiler = Profile()
+    return_code = profiler.runcall(run_manager_from_cli_worker, input_file_path, output_directory, resume,
+                                   checkpoint)
+
+    output_directory.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(str(output_directory / "Profile.prof"))
+    stats_text = StringIO()
+    Stats(profiler, stream=stats_text).sort_stats("cumulative").print_stats()
+    (output_directory / "Profile.txt").write_text(stats_text.getvalue())
+    return return_code
+
+
+def setup_manager_from_inputs(inputs: dict, input_directory: Optional[Path] = None) -> Optional[GHEManager]:
+    """
+    Sets up a GHEManager from validated input data, as read from an input file.
+
+    :param inputs: input data.
+    :param input_directory: directory relative load file paths are resolved against, defaults to the working directory.
+    :returns: the GHEManager ready to find a design, or None if the inputs are not supported
+    """
+
     ghe = GHEManager()
 
     version = inputs['version']
@@ -729,7 +1115,7 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
     sim_props = inputs['simulation']  # type: dict
     constraint_props = inputs['geometric_constraints']  # type: dict
     design_props = inputs['design']  # type: dict
-    ground_load_props = inputs['loads']['ground_loads']  # type: list
+    load_props = inputs['loads']  # type: dict
 
     ghe.set_fluid(**fluid_props, throw=False)
     ghe.set_grout(**grout_props)
@@ -781,7 +1167,14 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
         diameter=borehole_props["diameter"]
     )
 
-    ghe.set_ground_loads_from_hourly_list(ground_load_props)
+    if 'ground_loads_file' in load_props:
+        load_file_path = Path(load_props['ground_loads_file'])
+        if input_directory is not None and not load_file_path.is_absolute():
+            load_file_path = input_directory / load_file_path
+        if ghe.set_ground_loads_from_file(load_file_path, throw=False) != 0:
+            return None
+    else:
+        ghe.set_ground_loads_from_hourly_list(load_props['ground_loads'])
     ghe.set_simulation_parameters(
         num_months=sim_props["num_months"],
         max_eft=design_props["max_eft"],
@@ -791,7 +1184,7 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
     )
 
     if ghe.set_design_geometry_type(constraint_props["method"], throw=False) != 0:
-        return 1
+        return None
 
     if ghe.geom_type == DesignGeomType.RECTANGLE:
         ghe.set_geometry_constraints_rectangle(
@@ -845,11 +1238,14 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
             min_rotation=constraint_props["min_rotation"],
             rotate_step=constraint_props["rotate_step"],
             property_boundary=constraint_props["property_boundary"],
-            no_go_boundaries=constraint_props["no_go_boundaries"]
+            no_go_boundaries=constraint_props["no_go_boundaries"],
+            rotate_workers=constraint_props.get("rotate_workers"),
+            rotate_coarse_factor=constraint_props.get("rotate_coarse_factor"),
+            rotate_refine_count=constraint_props.get("rotate_refine_count", 3)
         )
     else:
         print("Geometry constraint method not supported.", file=stderr)
-        return 1
+        return None
 
     ghe.set_design(
         flow_rate=design_props["flow_rate"],
@@ -857,15 +1253,110 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
         throw=False
     )
 
-    ghe.find_design(throw=False)
-    ghe.prepare_results("GHEDesigner Run from CLI", "Notes", "Author", "Iteration Name")
-    ghe.write_output_files(output_directory)
+    return ghe
+
+
+def run_manager_from_cli_batch_job(input_file_path: Path, output_directory: Path, resume: bool = False,
+                                   checkpoint: bool = False) -> Tuple[int, float, str]:
+    """
+    Runs a single input file of a batch, isolating any failure to this job.
+
+    :param input_file_path: path to input file.
+    :param output_directory: path to write output files.
+    :param resume: continue the search from the checkpoint in the output directory, if any.
+    :param checkpoint: save the search progress to the output directory after each evaluated candidate.
+    :returns: return code, run time in seconds, and error message for the job
+    """
+
+    start_time = time()
+    try:
+        output_directory.mkdir(parents=True, exist_ok=True)
+        return_code = run_manager_from_cli_worker(input_file_path, output_directory, resume, checkpoint)
+        message = "" if return_code == 0 else "Worker returned nonzero exit code"
+    except Exception as e:
+        return_code = 1
+        message = f"{type(e).__name__}: {e}".replace("\n", " ")
+    return return_code, time() - start_time, message
 
-    return 0
+
+def run_manager_from_cli_batch(input_file_paths: List[Path], output_directory: Path, jobs: int = 1,
+                               memory_budget: Optional[float] = None, resume: bool = False,
+                               checkpoint: bool = False) -> int:
+    """
+    Runs many input files, each written to its own output subdirectory named after the input file.
+
+    A summary of each job is written to BatchStatus.csv in the output directory.
+
+    :param input_file_paths: paths to input files.
+    :param output_directory: path to write output subdirectories.
+    :param jobs: number of input files to run in parallel.
+    :param memory_budget: memory budget of each g-function calculation in MB, None for no budget.
+    :param resume: continue the searches from the checkpoints in the job output directories, if any.
+    :param checkpoint: save the search progress of each job to its output directory after each evaluated candidate.
+    :returns: Zero if all jobs were successful, nonzero if any failed
+    :rtype: int
+    """
+
+    if not input_file_paths:
+        print("No input files found, aborting", file=stderr)
+        return 1
+
+    stems = [p.stem for p in input_file_paths]
+    job_directories = [
+        output_directory / (p.stem if stems.count(p.stem) == 1 else f"{p.stem}_{idx}")
+        for idx, p in enumerate(input_file_paths)
+    ]
+
+    if memory_budget is not None:
+        from ghedesigner.gfunction import set_g_function_memory_budget
+        set_g_function_memory_budget(memory_budget)
+        pool_options = {'initializer': set_g_function_memory_budget, 'initargs': (memory_budget,)}
+    else:
+        pool_options = {}
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, **pool_options) as executor:
+            futures = [executor.submit(run_manager_from_cli_batch_job, p, d, resume, checkpoint)
+                       for p, d in zip(input_file_paths, job_directories)]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # the worker process itself died
+                    results.append((1, 0.0, f"{type(e).__name__}: {e}"))
+    else:
+        results = [run_manager_from_cli_batch_job(p, d, resume, checkpoint)
+                   for p, d in zip(input_file_paths, job_directories)]
+
+    output_directory.mkdir(parents=True, exist_ok=True)
+    with open(output_directory / "BatchStatus.csv", "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Input File", "Output Directory", "Status", "Return Code", "Run Time (s)", "Message"])
+        for p, d, (return_code, run_time, message) in zip(input_file_paths, job_directories, results):
+            status = "Success" if return_code == 0 else "Failed"
+            writer.writerow([str(p), str(d), status, return_code, f"{run_time:0.3f}", message])
+
+    num_failed = sum(1 for return_code, _, _ in results if return_code != 0)
+    print(f"Batch complete: {len(results) - num_failed} succeeded, {num_failed} failed.")
+    return 0 if num_failed == 0 else 1
+
+
+def find_batch_input_files(input_path: str) -> List[Path]:
+    """
+    Finds the input files for a batch run.
+
+    :param input_path: directory of JSON input files, or glob pattern matching input files.
+    :returns: sorted list of input file paths
+    """
+
+    if has_magic(input_path):
+        return sorted(Path(p).resolve() for p in glob(input_path) if Path(p).is_file())
+    return sorted(p.resolve() for p in Path(input_path).glob("*.json") if p.is_file())
 
 
 @click.command(name="GHEDesignerCommandLine")
-@click.argument("input-path", type=click.Path(exists=True), required=True)
+@click.argument("input-path", type=click.Path(exists=False), required=True)
 @click.argument("output-directory", type=click.Path(exists=False), required=False)
 @click.version_option(VERSION)
 @click.option(
@@ -880,20 +1371,87 @@ def run_manager_from_cli_worker(input_file_path: Path, output_directory: Path) -
     "--convert",
     help="Convert output to specified format. Options supported: 'IDF'."
 )
-def run_manager_from_cli(input_path, output_directory, validate, convert):
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Number of input files to run in parallel when INPUT_PATH is a directory or glob pattern."
+)
+@click.option(
+    "--profile",
+    default=False,
+    is_flag=True,
+    show_default=False,
+    help="Profile the run and write cProfile stats to the output directory."
+)
+@click.option(
+    "--memory-budget",
+    type=click.FloatRange(min=0.0, min_open=True),
+    help="Memory budget of each g-function calculation, in MB. Leaner solver settings are used for "
+         "large fields, and the run fails fast if the budget cannot be met."
+)
+@click.option(
+    "--resume",
+    default=False,
+    is_flag=True,
+    show_default=False,
+    help="Continue an interrupted search from the checkpoint in the output directory, and keep checkpointing."
+)
+@click.option(
+    "--checkpoint",
+    default=False,
+    is_flag=True,
+    show_default=False,
+    help="Save the search progress to the output directory after each evaluated candidate, so an interrupted "
+         "search can be continued with --resume."
+)
+@click.pass_context
+def run_manager_from_cli(ctx, input_path, output_directory, validate, convert, jobs, profile, memory_budget, resume,
+                         checkpoint):
+    ctx.exit(run_manager_from_cli_args(input_path, output_directory, validate, convert, jobs, profile, memory_budget,
+                                       resume, checkpoint))
+
+
+def run_manager_from_cli_args(input_path: str, output_directory: Optional[str], validate: bool, convert: Optional[str],
+                              jobs: int, profile: bool, memory_budget: Optional[float], resume: bool,
+                              checkpoint: bool = False) -> int:
+    """
+    Runs the command line options, see 'run_manager_from_cli'.
+
+    :returns: the process exit code, zero if successful, nonzero otherwise
+    :rtype: int
+    """
+
+    batch = has_magic(input_path) or Path(input_path).is_dir()
+
+    if batch:
+        if validate or convert or profile:
+            print("--validate, --convert and --profile are not supported for batch runs, aborting", file=stderr)
+            return 1
+        if output_directory is None:
+            print('Output directory path must be passed as an argument, aborting', file=stderr)
+            return 1
+        return run_manager_from_cli_batch(find_batch_input_files(input_path), Path(output_directory).resolve(), jobs,
+                                          memory_budget, resume, checkpoint)
+
     input_path = Path(input_path).resolve()
 
+    if not input_path.exists():
+        print(f"No input file found at {input_path}, aborting", file=stderr)
+        return 1
+
     if validate:
-        try:
-            validate_input_file(input_path)
-            print("Valid input file.")
-            return 0
-        except ValidationError:
-            print("Schema validation error. See previous error message for details.", file=stderr)
+        if validate_input_file(input_path) != 0:
+            print("Schema validation error. See previous error messages for details.", file=stderr)
             return 1
+        print("Valid input file.")
+        return 0
 
     if convert:
         if convert == "IDF":
+            from ghedesigner.utilities import write_idf
             try:
                 write_idf(input_path)
                 print("Ouput converted to IDF objects.")
@@ -912,7 +1470,14 @@ def run_manager_from_cli(input_path, output_directory, validate, convert):
 
     output_path = Path(output_directory).resolve()
 
-    return run_manager_from_cli_worker(input_path, output_path)
+    if memory_budget is not None:
+        from ghedesigner.gfunction import set_g_function_memory_budget
+        set_g_function_memory_budget(memory_budget)
+
+    if profile:
+        return run_manager_from_cli_profiled(input_path, output_path, resume, checkpoint)
+
+    return run_manager_from_cli_worker(input_path, output_path, resume, checkpoint)
 
 
 if __name__ == "__main__":
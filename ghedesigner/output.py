@@ -6,6 +6,7 @@ from datetime import datetime
 from json import dumps
 from math import floor
 from pathlib import Path
+from typing import Optional
 
 from ghedesigner.borehole_heat_exchangers import CoaxialPipe, GHEDesignerBoreholeBase
 from ghedesigner.design import AnyBisectionType
@@ -23,6 +24,7 @@ class OutputManager:
                  model_name: str,
                  load_method: TimestepType,
                  allocated_width=100,
+                 performance: Optional[dict] = None,
                  ):
 
         # this constructor should take all the args to build out a full output manager
@@ -37,7 +39,8 @@ class OutputManager:
         self.borehole_location_data_rows = self.get_borehole_location_data(design)
         self.hourly_loading_data_rows = self.get_hourly_loading_data(design)
         self.g_function_data_rows = self.get_g_function_data(design)
-        self.output_dict = self.get_summary_object(design, time, project_name, notes, author, model_name, load_method)
+        self.output_dict = self.get_summary_object(design, time, project_name, notes, author, model_name, load_method,
+                                                   performance)
 
     def write_all_output_files(self, output_directory: Path, file_suffix: str = ""):
         output_directory.mkdir(exist_ok=True)
@@ -119,12 +122,11 @@ class OutputManager:
     def get_borehole_location_data(design):
         csv_array = list()
         csv_array.append(["x", "y"])
-        for bL in design.ghe.gFunction.bore_locations:
-            csv_array.append([bL[0], bL[1]])
+        csv_array.extend(design.ghe.gFunction.bore_locations.tolist())
         return csv_array
 
     def get_hourly_loading_data(self, design):
-        hourly_loadings = design.ghe.hourly_extraction_ground_loads
+        hourly_loadings = design.ghe.hourly_extraction_ground_loads.tolist()
         csv_array = list()
         csv_array.append(
             ["Month", "Day", "Hour", "Time (Hours)", "Loading (W) (Extraction)"]
@@ -165,7 +167,8 @@ class OutputManager:
                            notes: str,
                            author: str,
                            model_name: str,
-                           load_method: TimestepType) -> dict:
+                           load_method: TimestepType,
+                           performance: Optional[dict] = None) -> dict:
         # gFunction LTS Table
         g_function_col_titles = ["ln(t/ts)"]
         for g_function_name in list(design.ghe.gFunction.g_lts):
@@ -266,6 +269,32 @@ class OutputManager:
 
         }
 
+        # per-phase call counts and run times, and hits/misses of the enabled caches, of the design
+        if performance is not None:
+            output_dict['performance'] = {
+                'phases': {name: {'calls': stats['calls'], 'time': add_with_units(stats['time'], 's')}
+                           for name, stats in performance['phases'].items()},
+            }
+            if performance['caches']:
+                output_dict['performance']['caches'] = performance['caches']
+
+        # budget of the field search, and whether it ran out before the search finished
+        if getattr(design, 'budget', None) is not None:
+            output_dict['search_budget'] = {
+                'max_time': add_with_units(design.budget.max_time, 's'),
+                'max_evaluations': design.budget.max_evaluations,
+                'evaluations': design.budget.evaluations,
+                'elapsed_time': add_with_units(design.budget.elapsed, 's'),
+                'budget_limited': design.budget_limited,
+            }
+
+        # how the field search narrowed down the domain, and how many candidate fields it simulated
+        field_search = getattr(design, 'field_search', None)
+        output_dict['field_search'] = {
+            'method': 'row-wise' if field_search is None else field_search.name.lower(),
+            'field_evaluations': design.field_evaluations,
+        }
+
         # potentially add convection coefficient -- not sure why we wouldn't do it
         if hasattr(design.ghe.bhe, "h_f"):
             # TODO: Should be W/m2-K?
@@ -0,0 +1,143 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Optional
+
+
+class PhaseStats:
+    """
+    Process-wide call counters and accumulated run times of the expensive phases of a design.
+
+    Phases nest, e.g. g-function solves run inside the field search, so their times overlap.
+    Work done in worker processes, such as parallel rotation sweeps, is not counted.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.times = {}
+        self._lock = Lock()
+
+    def add(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.times[name] = self.times.get(name, 0.0) + elapsed
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: {'calls': self.calls[name], 'time': self.times[name]} for name in self.calls}
+
+    def clear(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.times.clear()
+
+
+PHASE_STATS = PhaseStats()
+
+
+class DesignStats:
+    """
+    Phase statistics and cache hits/misses of a single design.
+
+    Unlike the process-wide counters, these only hold the work of the thread, or context, that collects them,
+    so designs running side by side, e.g. in the server or in a background refinement, each get their own report.
+    """
+
+    def __init__(self):
+        self.phases = PhaseStats()
+        self.cache_hits = {}
+        self.cache_misses = {}
+        self._lock = Lock()
+
+    def add_cache_access(self, name: str, hit: bool) -> None:
+        counts = self.cache_hits if hit else self.cache_misses
+        with self._lock:
+            counts[name] = counts.get(name, 0) + 1
+
+    def report(self) -> dict:
+        """
+        Returns the statistics in the layout of performance_difference.
+
+        Only the enabled caches are reported, disabled caches are not looked up, so they have no hits or misses.
+        """
+        from ghedesigner.cache import ALL_CACHES
+
+        with self._lock:
+            caches = {c.name: {'hits': self.cache_hits.get(c.name, 0), 'misses': self.cache_misses.get(c.name, 0)}
+                      for c in ALL_CACHES if c.maxsize > 0}
+        return {'phases': self.phases.snapshot(), 'caches': caches}
+
+
+_DESIGN_STATS: ContextVar[Optional[DesignStats]] = ContextVar('design_stats', default=None)
+
+
+@contextmanager
+def collect_design_stats():
+    """
+    Collects the phase statistics and cache accesses of the code run in the block, in the current context only.
+    """
+
+    stats = DesignStats()
+    token = _DESIGN_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _DESIGN_STATS.reset(token)
+
+
+def record_cache_access(name: str, hit: bool) -> None:
+    stats = _DESIGN_STATS.get()
+    if stats is not None:
+        stats.add_cache_access(name, hit)
+
+
+def timed(name: str):
+    """
+    Decorator counting the calls of a function and accumulating its run time under a phase name.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start_time
+                PHASE_STATS.add(name, elapsed)
+                design_stats = _DESIGN_STATS.get()
+                if design_stats is not None:
+                    design_stats.phases.add(name, elapsed)
+
+        return wrapper
+
+    return decorator
+
+
+def performance_snapshot() -> dict:
+    """Returns the current process-wide phase statistics and the hit/miss counters of the enabled caches."""
+    from ghedesigner.cache import cache_stats
+
+    return {'phases': PHASE_STATS.snapshot(),
+            'caches': {c['name']: {'hits': c['hits'], 'misses': c['misses']} for c in cache_stats() if c['maxsize'] > 0}}
+
+
+def performance_difference(before: dict, after: dict) -> dict:
+    """
+    Returns the statistics accumulated between two snapshots, e.g. during one design.
+    """
+
+    phases = {}
+    for name, stats in after['phases'].items():
+        prev = before['phases'].get(name, {'calls': 0, 'time': 0.0})
+        if stats['calls'] > prev['calls']:
+            phases[name] = {'calls': stats['calls'] - prev['calls'], 'time': stats['time'] - prev['time']}
+
+    caches = {}
+    for name, stats in after['caches'].items():
+        prev = before['caches'].get(name, {'hits': 0, 'misses': 0})
+        caches[name] = {'hits': stats['hits'] - prev['hits'], 'misses': stats['misses'] - prev['misses']}
+
+    return {'phases': phases, 'caches': caches}
@@ -0,0 +1,64 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Event, local
+from time import time
+from typing import Callable, Optional
+
+
+class DesignCancelled(Exception):
+    """Raised in a design run when it has been cancelled, at the next progress event."""
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    Progress of a design run.
+
+    Kinds of events, and their data:
+
+    - candidate_evaluated: field_specifier, number_of_boreholes, height, excess_temperature
+    - g_function_solved: number_of_boreholes, height, cached
+    - search_iteration: iteration
+    - sizing_iteration: height, excess_temperature
+    - design_finished: number_of_boreholes, height
+    """
+
+    kind: str
+    data: dict = field(default_factory=dict)
+    time: float = field(default_factory=time)
+
+    def as_dict(self) -> dict:
+        return {'kind': self.kind, 'data': self.data, 'time': self.time}
+
+
+# progress callback and cancel event of the design running in each thread
+_THREAD_STATE = local()
+
+
+def report_progress(kind: str, **data) -> None:
+    """
+    Reports a progress event to the callback of the design running in this thread, if any.
+
+    :raises DesignCancelled: if the design running in this thread has been cancelled
+    """
+    cancel_event = getattr(_THREAD_STATE, 'cancel_event', None)
+    if cancel_event is not None and cancel_event.is_set():
+        raise DesignCancelled("The design was cancelled.")
+    callback = getattr(_THREAD_STATE, 'callback', None)
+    if callback is not None:
+        callback(ProgressEvent(kind, data))
+
+
+@contextmanager
+def progress_reporting(callback: Optional[Callable[[ProgressEvent], None]], cancel_event: Optional[Event] = None):
+    """
+    Sends the progress events of the design run in this thread, within the context, to a callback.
+    Setting the cancel event stops the design at its next progress event.
+    """
+    previous = getattr(_THREAD_STATE, 'callback', None), getattr(_THREAD_STATE, 'cancel_event', None)
+    _THREAD_STATE.callback = callback
+    _THREAD_STATE.cancel_event = cancel_event
+    try:
+        yield
+    finally:
+        _THREAD_STATE.callback, _THREAD_STATE.cancel_event = previous
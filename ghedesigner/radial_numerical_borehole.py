@@ -6,7 +6,9 @@ from scipy.interpolate import interp1d
 from scipy.linalg.lapack import dgtsv
 
 from ghedesigner.borehole_heat_exchangers import SingleUTube
+from ghedesigner.cache import STS_CACHE, cache_key
 from ghedesigner.constants import TWO_PI
+from ghedesigner.profiling import timed
 
 
 class CellProps(IntEnum):
@@ -251,6 +253,7 @@ class RadialNumericalBH(object):
             )
         cell_summation += num_soil_cells
 
+    @timed('sts_g_function')
     def calc_sts_g_functions(self, single_u_tube, final_time=None) -> tuple:
 
         self.partial_init(single_u_tube)
@@ -261,14 +264,28 @@ class RadialNumericalBH(object):
         resist_p_eq = self.single_u_tube.R_p / 2.0
         resist_tg_eq = resist_bh_effective - resist_f_eq
 
+        if final_time is None:
+            final_time = self.calc_time_in_sec
+
+        sts_key = cache_key(self.r_far_field, self.r_borehole, self.r_out_tube, self.thickness_pipe, self.r_in_tube,
+                            self.r_in_convection, self.r_fluid, self.c_0, self.t_s, self.single_u_tube.pipe.r_in,
+                            self.single_u_tube.pipe.rhoCp, self.single_u_tube.fluid.rhoCp,
+                            self.single_u_tube.fluid.cp, self.single_u_tube.grout.rhoCp, self.single_u_tube.soil.k,
+                            self.single_u_tube.soil.rhoCp, resist_p_eq, resist_f_eq, resist_bh_effective, final_time)
+        cached = STS_CACHE.get(sts_key)
+        if cached is not None:
+            lntts, g, g_bhw = cached
+            self.lntts = np.array(lntts)
+            self.g = np.array(g)
+            self.g_bhw = np.array(g_bhw)
+            self.g_sts = interp1d(self.lntts, self.g)
+            return self.lntts, self.g
+
         # Pass radial cell by reference and fill here so that it can be
         # destroyed when this method returns
         radial_cell = np.zeros(shape=(len(CellProps), self.num_cells), dtype=np.double)
         self.fill_radial_cell(radial_cell, resist_p_eq, resist_f_eq, resist_tg_eq)
 
-        if final_time is None:
-            final_time = self.calc_time_in_sec
-
         g = []
         g_bhw = []
         lntts = []
@@ -376,5 +393,6 @@ class RadialNumericalBH(object):
         self.g = np.array(uniform_g_vals)
         self.g_bhw = np.array(uniform_g_bhw_vals)
         self.g_sts = interp1d(self.lntts, self.g)
+        STS_CACHE.put(sts_key, (self.lntts.copy(), self.g.copy(), self.g_bhw.copy()))
 
         return self.lntts, self.g
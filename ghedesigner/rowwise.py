@@ -1,8 +1,12 @@
-from math import atan, cos, pi, sin, sqrt
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import atan, cos, floor, pi, sin, sqrt
 
 import numpy as np
 
 from ghedesigner.constants import DEG_TO_RAD, RAD_TO_DEG, PI_OVER_2
+from ghedesigner.coordinates import as_coordinate_array
+from ghedesigner.profiling import timed
 from ghedesigner.shape import Shapes, sort_intersections
 
 
@@ -19,6 +23,7 @@ def gen_shape(prop_bound, ng_zones=None):
     return r_a
 
 
+@timed('rowwise_layout')
 def field_optimization_wp_space_fr(
         p_space,
         space_start,
@@ -27,6 +32,10 @@ def field_optimization_wp_space_fr(
         ng_zones=None,
         rotate_start=None,
         rotate_stop=None,
+        workers=None,
+        coarse_factor=None,
+        refine_count=3,
+        executor=None,
 ):
     """Optimizes a Field by iterating over input values w/o perimeter spacing
 
@@ -36,7 +45,7 @@ def field_optimization_wp_space_fr(
     boundary (counter clockwise) ng_zones([[[float,float]]]): 3d array representing the different zones on the
     property where no boreholes can be placed rotate_start(float): the rotation that the field will start at (-pi/2 <
     rotateStart < pi/2) rotate_stop(float): the rotation that the field will stop at (exclusive) (-pi/2 < rotateStop
-    < pi/2)
+    < pi/2) workers, coarse_factor, refine_count, executor: see sweep_rotations
 
     Outputs: CSVs containing the coordinates for the max field for each target spacing, their respective graphs,
     and their respective data
@@ -55,37 +64,33 @@ def field_optimization_wp_space_fr(
     y_s = space
     x_s = y_s
 
-    max_l = 0
-    max_hole = None
-    max_rt = None
-
-    while rt < rotate_stop:
-        hole = two_space_gen_bhc(
-            prop_bound,
-            y_s,
-            x_s,
-            rotate=rt,
-            no_go=ng_zones,
-            p_space=p_space * x_s,
-            intersection_tolerance=1e-5,
-        )
-
-        # Assuming that the rotation with the maximum number of boreholes is most efficiently using space
-        if len(hole) > max_l:
-            max_l = len(hole)
-            max_rt = rt * RAD_TO_DEG
-            max_hole = hole
-
-        rt += rotate_step * DEG_TO_RAD
+    gen_bhc = partial(
+        two_space_gen_bhc,
+        prop_bound,
+        y_s,
+        x_s,
+        no_go=ng_zones,
+        p_space=p_space * x_s,
+        intersection_tolerance=1e-5,
+    )
+    max_hole, max_rt = sweep_rotations(
+        gen_bhc,
+        rotation_angles(rt, rotate_stop, rotate_step),
+        workers=workers,
+        coarse_factor=coarse_factor,
+        refine_count=refine_count,
+        executor=executor,
+    )
 
     # Ensures that there are no repeated boreholes
-    max_hole = np.array(remove_duplicates(max_hole, p_space * x_s))
+    max_hole = as_coordinate_array(remove_duplicates(max_hole, p_space * x_s))
 
     field = max_hole
     field_name = "P" + str(p_space) + "_S" + str(space) + "_rt" + str(max_rt)
     return [field, field_name]
 
 
+@timed('rowwise_layout')
 def field_optimization_fr(
         space_start,
         rotate_step,
@@ -94,6 +99,10 @@ def field_optimization_fr(
         rotate_start=None,
         rotate_stop=None,
         intersection_tolerance=1e-5,
+        workers=None,
+        coarse_factor=None,
+        refine_count=3,
+        executor=None,
 ):
     """Optimizes a Field by iterating over input values w/o perimeter spacing
 
@@ -103,6 +112,7 @@ def field_optimization_fr(
     float]]]): 3d array representing the different zones on the property where no boreholes can be placed
     rotate_start(float): the rotation that the field will start at (-pi/2 < rotateStart < pi/2) rotate_stop(float):
     the rotation that the field will stop at (exclusive) (-pi/2 < rotateStop < pi/2) intersection_tolerance:
+    workers, coarse_factor, refine_count, executor: see sweep_rotations
 
     Outputs: CSVs containing the coordinates for the max field for each target spacing, their respective graphs,
     and their respective data
@@ -128,48 +138,121 @@ def field_optimization_fr(
     y_s = space
     x_s = y_s
 
+    gen_bhc = partial(
+        gen_borehole_config,
+        prop_bound,
+        y_s,
+        x_s,
+        no_go=ng_zones,
+        intersection_tolerance=intersection_tolerance,
+    )
+    max_hole, max_rt = sweep_rotations(
+        gen_bhc,
+        rotation_angles(rt, rotate_stop, rotate_step),
+        workers=workers,
+        coarse_factor=coarse_factor,
+        refine_count=refine_count,
+        executor=executor,
+    )
+
+    # Ensures that there are no repeated boreholes
+    max_hole = as_coordinate_array(remove_duplicates(max_hole, x_s * 1.2))
+
+    field = max_hole
+    field_name = "S" + str(space) + "_rt" + str(max_rt)
+    return [field, field_name]
+
+
+def rotation_angles(rotate_start, rotate_stop, rotate_step):
+    """Returns the rotations (rad) stepped by rotate_step (degrees) from rotate_start up to rotate_stop (exclusive)"""
+    angles = []
+    rt = rotate_start
+    while rt < rotate_stop:
+        angles.append(rt)
+        rt += rotate_step * DEG_TO_RAD
+    return angles
+
+
+def _gen_at_rotation(gen_bhc, rotate):
+    return gen_bhc(rotate=rotate)
+
+
+def sweep_rotations(gen_bhc, angles, workers=None, coarse_factor=None, refine_count=3, executor=None):
+    """Finds the rotation generating the most boreholes
+
+    Parameters:
+        gen_bhc: callable generating the borefield for a given rotate keyword (rad)
+        angles([float]): the rotations (rad) to sweep
+        workers(int): number of worker processes to generate the fields with, runs serially if None or 1
+        coarse_factor(int): if given, only every coarse_factor-th angle is generated first and the sweep is then
+            refined to every angle around the refine_count best coarse angles
+        refine_count(int): number of best coarse angles to refine around
+        executor(Executor): executor to generate the fields with, e.g. one shared by the sweeps of a search.
+            When given, workers is ignored and the executor is left running
+
+    Outputs: the field with the most boreholes (the first one found on ties) and its rotation (degrees),
+    or [None, None] if no angle generates any boreholes
+
+    """
+    owned_executor = None
+    if executor is None and workers is not None and workers > 1:
+        executor = owned_executor = ProcessPoolExecutor(max_workers=workers)
+    if executor is not None:
+        generate = partial(executor.map, partial(_gen_at_rotation, gen_bhc))
+    else:
+        generate = partial(map, partial(_gen_at_rotation, gen_bhc))
+
+    try:
+        if coarse_factor is None or coarse_factor <= 1:
+            checked = dict(zip(range(len(angles)), generate(angles)))
+        else:
+            coarse_idx = list(range(0, len(angles), coarse_factor))
+            checked = dict(zip(coarse_idx, generate([angles[idx] for idx in coarse_idx])))
+
+            # refines between the coarse neighbors of the best coarse angles
+            best_idx = sorted(coarse_idx, key=lambda idx: -len(checked[idx]))[:refine_count]
+            refine_idx = sorted(
+                {
+                    idx
+                    for best in best_idx
+                    for idx in range(max(best - coarse_factor + 1, 0), min(best + coarse_factor, len(angles)))
+                }
+                - set(coarse_idx)
+            )
+            checked.update(zip(refine_idx, generate([angles[idx] for idx in refine_idx])))
+    finally:
+        if owned_executor is not None:
+            owned_executor.shutdown()
+
     max_l = 0
     max_hole = None
     max_rt = None
 
-    while rt < rotate_stop:
-        hole = gen_borehole_config(
-            prop_bound,
-            y_s,
-            x_s,
-            rotate=rt,
-            no_go=ng_zones,
-            intersection_tolerance=intersection_tolerance,
-        )
+    for idx in sorted(checked):
+        hole = checked[idx]
 
         # Assuming that the rotation with the maximum number of boreholes is most efficiently using space
         if len(hole) > max_l:
             max_l = len(hole)
-            max_rt = rt * RAD_TO_DEG
+            max_rt = angles[idx] * RAD_TO_DEG
             max_hole = hole
 
-        rt += rotate_step * DEG_TO_RAD
-
-    # Ensures that there are no repeated boreholes
-    max_hole = np.array(remove_duplicates(max_hole, x_s * 1.2))
-
-    field = max_hole
-    field_name = "S" + str(space) + "_rt" + str(max_rt)
-    return [field, field_name]
+    return max_hole, max_rt
 
 
 def find_duplicates(borefield, space, disp=False):
     """
-    The distance method :func:`Borehole.distance` is utilized to find all
-    duplicate boreholes in a boreField.
+    Finds all duplicate boreholes in a boreField.
     This function considers a duplicate to be any pair of points that fall
     within each other's radius. The lower index (i) is always stored in the
     0 position of the tuple, while the higher index (j) is stored in the 1
     position.
+    The points are hashed into square buckets the size of the search radius,
+    so only the neighboring buckets of each point need to be checked.
     Parameters
     ----------
     borefield : list
-        A list of :class:`Borehole` objects
+        A list of (x, y) coordinates
     space:
     disp : bool, optional
         Set to true to print progression messages.
@@ -180,16 +263,23 @@ def find_duplicates(borefield, space, disp=False):
         A list of tuples where the tuples are pairs of duplicates
     """
 
+    radius = space * 10 ** -1
+    points = as_coordinate_array(borefield).tolist()
+
     duplicate_pairs = []  # define an empty list to be appended to
-    for i, borehole_1 in enumerate(borefield):
-        for j in range(i, len(borefield)):  # only loop unique interactions
-            borehole_2 = borefield[j]
-            if i == j:  # skip the borehole itself
-                continue
-            else:
-                dist = sq_dist(borehole_1, borehole_2)
-            if abs(dist) < (space * 10 ** -1):
-                duplicate_pairs.append((i, j))
+    if radius > 0:
+        buckets = bucket_points(points, radius)
+        for i, borehole_1 in enumerate(points):
+            cx, cy = bucket_key(borehole_1, radius)
+            neighbors = []
+            for key_x in range(cx - 1, cx + 2):
+                for key_y in range(cy - 1, cy + 2):
+                    # only loop unique interactions
+                    neighbors.extend(j for j in buckets.get((key_x, key_y), []) if j > i)
+            for j in sorted(neighbors):
+                dist = sq_dist(borehole_1, points[j])
+                if abs(dist) < radius:
+                    duplicate_pairs.append((i, j))
     if disp:
         # pad with '-' align in center
         output = f"{'*gt.boreholes.find_duplicates()*' :-^50}"
@@ -199,6 +289,25 @@ def find_duplicates(borefield, space, disp=False):
     return duplicate_pairs
 
 
+def bucket_key(point, size):
+    """Returns the key of the square bucket of the given size containing the point"""
+    return floor(point[0] / size), floor(point[1] / size)
+
+
+def bucket_points(points, size):
+    """Hashes the indices of the points into square buckets of the given size
+
+    Parameters:
+        points: 2d array containing the points
+        size(float): side length of the buckets
+
+    """
+    buckets = {}
+    for idx, point in enumerate(points):
+        buckets.setdefault(bucket_key(point, size), []).append(idx)
+    return buckets
+
+
 def sq_dist(p1, p2):
     """Returns the cartesian distance between two points"""
     return sqrt((p1[0] - p2[0]) * (p1[0] - p2[0]) + (p1[1] - p2[1]) * (p1[1] - p2[1]))
@@ -213,7 +322,7 @@ def remove_duplicates(borefield, space, disp=False):
     Parameters
     ----------
     borefield : list
-        A list of :class:`Borehole` objects
+        A list of (x, y) coordinates
     space:
     disp : bool, optional
         Set to true to print progression messages.
@@ -229,9 +338,7 @@ def remove_duplicates(borefield, space, disp=False):
     new_borefield = []
 
     # values not to be included
-    duplicate_bores = []
-    for i in range(len(duplicate_pairs)):
-        duplicate_bores.append(duplicate_pairs[i][1])
+    duplicate_bores = {pair[1] for pair in duplicate_pairs}
 
     for i in range(len(borefield)):
         if i in duplicate_bores:
@@ -288,8 +395,7 @@ def two_space_gen_bhc(
         intersection_tolerance=intersection_tolerance,
     )
 
-    holes = holes.tolist()
-    remove_points_too_close(field, holes, i_space, no_go_zones=no_go)
+    holes = holes[~points_too_close(field, holes, i_space, no_go_zones=no_go)].tolist()
 
     # places the boreholes along the perimeter of the property boundary and no_go zone(s)
     perimeter_distribute(field, p_space, holes)
@@ -297,64 +403,31 @@ def two_space_gen_bhc(
         for ng in no_go:
             perimeter_distribute(ng, p_space, holes)
 
-    # returns the Holes as a numpy array for easier manipulation
-    return_array = np.array(holes)
-    return return_array
+    # returns the Holes as a coordinate array for easier manipulation
+    return as_coordinate_array(holes)
 
 
-def remove_points_too_close(field, holes, i_space, no_go_zones=None):
+def points_too_close(field, holes, i_space, no_go_zones=None, max_chunk_size=1000000):
     """
-    Will remove all points too close to the field and no-go zones
+    Returns a mask of all points too close to the field and no-go zones
 
     Parameters:
         field: The outer boundary of the property represented as an array of points
-        no_go_zones: a 3d array representing all the areas where boreholes cannot be placed
         holes: 2d array containing all the current boreholes
         i_space: Min spacing required from all edges
+        no_go_zones: a 3d array representing all the areas where boreholes cannot be placed
+        max_chunk_size: max number of hole-edge distances computed at once
     """
-    field = field.c
-    len_field = len(field)
-    for i in range(len_field):
-        p1 = field[i]
-        if i == len_field - 1:
-            p2 = field[0]
-        else:
-            p2 = field[i + 1]
-        remove_points_close_too_line(p1, p2, holes, i_space)
-    if no_go_zones is not None:
-        len_no_go_zones = len(no_go_zones)
-        for i in range(len_no_go_zones):
-            ng = no_go_zones[i].c
-            len_ng = len(ng)
-            for j in range(len_ng):
-                p1 = ng[j]
-                if j == len_ng - 1:
-                    p2 = ng[0]
-                else:
-                    p2 = ng[j + 1]
-                remove_points_close_too_line(p1, p2, holes, i_space)
+    contours = [field] if no_go_zones is None else [field] + list(no_go_zones)
+    p1 = np.concatenate([contour.edge_start for contour in contours])
+    p2 = np.concatenate([contour.edge_end for contour in contours])
+    holes = as_coordinate_array(holes)
 
-
-def remove_points_close_too_line(p1, p2, holes, i_space):
-    """Removes points that are close to the given line
-
-    Parameters:
-        p1([float,float]): first point in line
-        p2([float,float]): second point in line
-        holes: 2d array containing a bunch of points
-        i_space(float): distance cutoff for how close points can be
-
-    """
-    len_holes = len(holes)
-    i = 0
-    while i < len_holes:
-        hole = holes[i]
-        dp = dist_from_line(p1, p2, hole)
-        if dp < i_space:
-            del holes[i]
-            len_holes -= 1
-        else:
-            i += 1
+    too_close = np.zeros(len(holes), dtype=bool)
+    chunk = max(max_chunk_size // len(p1), 1)
+    for i in range(0, len(holes), chunk):
+        too_close[i:i + chunk] = np.any(dist_from_lines(p1, p2, holes[i:i + chunk]) < i_space, axis=1)
+    return too_close
 
 
 def dist_from_line(p1, p2, other_point):
@@ -387,6 +460,47 @@ def dist_from_line(p1, p2, other_point):
         return min(d01, d02)
 
 
+def dist_from_lines(p1, p2, other_points):
+    """Calculates the distances from each point to each line, see dist_from_line
+
+    Parameter:
+        p1: (E, 2) array of the first points on the lines
+        p2: (E, 2) array of the second points on the lines
+        other_points: (N, 2) array of the points which are being measured to
+
+    Returns: (N, E) array of distances
+
+    """
+    p1x = p1[:, 0]
+    p1y = p1[:, 1]
+    p2x = p2[:, 0]
+    p2y = p2[:, 1]
+    ox = other_points[:, 0:1]
+    oy = other_points[:, 1:2]
+
+    dxl = p2x - p1x
+    dyl = p2y - p1y
+    dx = p1x - ox
+    dy = p1y - oy
+    num = np.abs(dxl * dy - dx * dyl)
+    den = np.sqrt(dxl * dxl + dyl * dyl)
+    dp = num / den
+    dist_l = den
+    d01 = np.sqrt(dx * dx + dy * dy)
+    d02 = np.sqrt((p2x - ox) * (p2x - ox) + (p2y - oy) * (p2y - oy))
+
+    d_ends = np.minimum(d01, d02)
+    between = ((np.minimum(p1x, p2x) < ox) & (ox < np.maximum(p1x, p2x))) | (
+        (np.minimum(p1y, p2y) < oy) & (oy < np.maximum(p1y, p2y))
+    )
+    with np.errstate(invalid="ignore"):
+        off_line = d01 * d01 - dp * dp
+        beyond = np.sqrt(off_line) / dist_l > 1
+    return np.where(
+        off_line < 0, d01, np.where(beyond | ~between, d_ends, np.minimum(d_ends, dp))
+    )
+
+
 def perimeter_distribute(field, space, r):
     """
     Distributes boreholes along the perimeter of a given shape
@@ -497,6 +611,7 @@ def gen_borehole_config(
     # be any value)
     point_shift = 1000.0
 
+    rows = []
     for _ in range(num_rows + 1):
 
         # Row Defined by two points
@@ -514,9 +629,14 @@ def gen_borehole_config(
                 row_point[0] + point_shift,
                 row_point[1] + (-row_space[0] / row_space[1]) * point_shift,
             ]
+        rows.append(row)
+        row_point[0] += row_space[0]
+        row_point[1] += row_space[1]
+
+    # Gets Intersections between all rows and property boundary
+    rows_f_inters = field.lines_intersect(rows, rotate, intersection_tolerance)
 
-        # Gets Intersection between current row and property boundary
-        f_inters = field.line_intersect(row, rotate, intersection_tolerance)
+    for row, f_inters in zip(rows, rows_f_inters):
 
         # Stores the number of intersections with the row
         len_f_inters = len(f_inters)
@@ -657,10 +777,8 @@ def gen_borehole_config(
                         rotate=rotate,
                     )
                 i += 1
-        row_point[0] += row_space[0]
-        row_point[1] += row_space[1]
     r_a = [boreholes[element] for element in boreholes]
-    r_a = np.array(remove_duplicates(r_a, x_space))
+    r_a = as_coordinate_array(remove_duplicates(r_a, x_space))
     return r_a
 
 
@@ -0,0 +1,65 @@
+from time import perf_counter
+from typing import Optional
+
+
+class SearchBudgetExpired(Exception):
+    """Raised by a search when its budget runs out before the next candidate evaluation."""
+
+
+class SearchBudget:
+    """
+    Wall-clock time and candidate evaluation budget of a field search.
+
+    The budget is checked before each candidate evaluation. When it has run out, the search stops,
+    and selects the best feasible field evaluated so far, flagged as budget-limited.
+    """
+
+    def __init__(self, max_time: Optional[float] = None, max_evaluations: Optional[int] = None):
+        """
+        :param max_time: max wall-clock time of the search, in s, None for no limit.
+        :param max_evaluations: max number of candidate evaluations, None for no limit.
+        """
+        self.max_time = max_time
+        self.max_evaluations = max_evaluations
+        self.evaluations = 0
+        self.start_time = None
+        self.stop_time = None
+        self.expired = False
+
+    def start(self) -> None:
+        """Starts the clock, if not started already."""
+        if self.start_time is None:
+            self.start_time = perf_counter()
+
+    def stop(self) -> None:
+        """Stops the clock, e.g. when the search has finished."""
+        if self.start_time is not None and self.stop_time is None:
+            self.stop_time = perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        if self.stop_time is not None:
+            return self.stop_time - self.start_time
+        return perf_counter() - self.start_time
+
+    def check(self) -> None:
+        """
+        Counts a candidate evaluation against the budget.
+
+        :raises SearchBudgetExpired: if the budget has run out
+        """
+        self.start()
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.expired = True
+        if self.max_time is not None and self.elapsed >= self.max_time:
+            self.expired = True
+        if self.expired:
+            raise SearchBudgetExpired(f"Search budget expired after {self.evaluations} evaluations "
+                                      f"and {self.elapsed:0.2f} s.")
+        self.evaluations += 1
+
+    def as_dict(self) -> dict:
+        return {'max_time': self.max_time, 'max_evaluations': self.max_evaluations,
+                'evaluations': self.evaluations, 'elapsed_time': self.elapsed, 'budget_limited': self.expired}
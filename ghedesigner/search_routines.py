@@ -1,17 +1,130 @@
-from math import ceil, sqrt
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
 from typing import Optional
 
-from ghedesigner.borehole_heat_exchangers import GHEBorehole
-from ghedesigner.enums import BHPipeType, TimestepType, FlowConfigType
-from ghedesigner.gfunction import calc_g_func_for_multiple_lengths
+import numpy as np
+
+from ghedesigner.borehole_heat_exchangers import GHEBorehole, get_bhe_object
+from ghedesigner.checkpoint import SearchCheckpoint, evaluation_key
+from ghedesigner.coordinates import as_coordinate_array
+from ghedesigner.design_state import DesignState
+from ghedesigner.enums import BHPipeType, FieldSearchType, TimestepType, FlowConfigType
+from ghedesigner.gfunction import calc_g_func_for_design_state
 from ghedesigner.ground_heat_exchangers import GHE
+from ghedesigner.length_bound import infeasible_field_sizes
 from ghedesigner.media import Grout, Pipe, Soil, GHEFluid
+from ghedesigner.profiling import timed
+from ghedesigner.progress import report_progress
 from ghedesigner.rowwise import field_optimization_fr, field_optimization_wp_space_fr, gen_shape
+from ghedesigner.search_budget import SearchBudget, SearchBudgetExpired
 from ghedesigner.simulation import SimulationParameters
 from ghedesigner.utilities import eskilson_log_times, borehole_spacing, check_bracket, sign
 
 
-class Bisection1D:
+class SearchBase:
+    """
+    Candidate evaluation and bookkeeping shared by the searches.
+
+    Each candidate evaluation is checked against the budget, and the smallest feasible field evaluated
+    so far is kept, so a search whose budget runs out can still return a design. With a checkpoint,
+    the results of the evaluations are saved as they complete, and reused when the search is resumed.
+    """
+
+    # number of candidate fields simulated, i.e. not reused from a checkpoint
+    field_evaluations = 0
+
+    def init_budget(self, budget: Optional[SearchBudget]) -> None:
+        self.budget = budget
+        self.budget_limited = False
+        # bracket of the search when the budget ran out, e.g. the field indices or target spacings
+        self.bracket = None
+        self.best_feasible = None
+        if self.budget is not None:
+            self.budget.start()
+
+    def init_checkpoint(self, checkpoint: Optional[SearchCheckpoint]) -> None:
+        self.checkpoint = checkpoint
+        if self.checkpoint is not None:
+            self.checkpoint.bind(self)
+
+    def check_budget(self) -> None:
+        if self.budget is not None:
+            self.budget.check()
+
+    @timed('field_evaluation')
+    def calculate_excess(self, coordinates, h, field_specifier="N/A"):
+        key = None
+        result = None
+        if self.checkpoint is not None:
+            key = evaluation_key('excess', coordinates, h, field_specifier)
+            result = self.checkpoint.evaluation(key)
+
+        if result is None:
+            self.check_budget()
+            self.field_evaluations += 1
+            self.initialize_ghe(coordinates, h, field_specifier=field_specifier)
+            # Simulate after computing just one g-function
+            max_hp_eft, min_hp_eft = self.ghe.simulate(method=self.method)
+            t_excess = self.ghe.cost(max_hp_eft, min_hp_eft)
+        else:
+            t_excess, max_hp_eft, min_hp_eft = result
+        self.searchTracker.append([field_specifier, t_excess, max_hp_eft, min_hp_eft])
+        if h == self.sim_params.max_height:
+            self.track_feasible(coordinates, field_specifier, t_excess, max_hp_eft, min_hp_eft)
+        if result is None and self.checkpoint is not None:
+            self.checkpoint.record_evaluation(key, [t_excess, max_hp_eft, min_hp_eft], self)
+        report_progress('candidate_evaluated', field_specifier=field_specifier, number_of_boreholes=len(coordinates),
+                        height=h, excess_temperature=t_excess)
+
+        return t_excess
+
+    def size_candidate(self, coordinates, field_specifier="N/A", initialize=True) -> float:
+        """
+        Sizes a candidate field.
+
+        :param initialize: set up the GHE of the field first, False if the current GHE is already for the field.
+        :returns: the borehole height of the sized field, in m
+        """
+        key = None
+        if self.checkpoint is not None:
+            key = evaluation_key('size', coordinates, self.sim_params.max_height, field_specifier)
+            height = self.checkpoint.sizing(key)
+            if height is not None:
+                return height
+
+        if initialize:
+            self.initialize_ghe(coordinates, self.sim_params.max_height, field_specifier=field_specifier)
+        self.ghe.compute_g_functions()
+        self.ghe.size(method=TimestepType.HYBRID)
+        height = self.ghe.bhe.b.H
+        if self.checkpoint is not None:
+            self.checkpoint.record_sizing(key, height, self)
+        return height
+
+    def track_feasible(self, coordinates, field_specifier, t_excess, max_hp_eft, min_hp_eft) -> None:
+        if t_excess > 0.0:
+            return
+        candidate = (len(coordinates), -t_excess, coordinates, field_specifier, t_excess, max_hp_eft, min_hp_eft)
+        if self.best_feasible is None or candidate[:2] < self.best_feasible[:2]:
+            self.best_feasible = candidate
+
+    def select_best_feasible(self):
+        """
+        Selects the smallest feasible field evaluated before the budget ran out.
+
+        :returns: the selected coordinates and field specifier
+        """
+        if self.best_feasible is None:
+            raise ValueError("The search budget expired before a feasible field was found. "
+                             "Increase the search budget.")
+        self.budget_limited = True
+        _, _, coordinates, field_specifier, t_excess, max_hp_eft, min_hp_eft = self.best_feasible
+        self.searchTracker.append([f"Budget expired, bracket: {self.bracket}", t_excess, max_hp_eft, min_hp_eft])
+        self.initialize_ghe(coordinates, self.sim_params.max_height, field_specifier=field_specifier)
+        return coordinates, field_specifier
+
+
+class Bisection1D(SearchBase):
     def __init__(
             self,
             coordinates_domain: list,
@@ -24,7 +137,7 @@ class Bisection1D:
             grout: Grout,
             soil: Soil,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             method: TimestepType,
             flow_type: FlowConfigType.BOREHOLE,
             max_iter=15,
@@ -32,6 +145,9 @@ class Bisection1D:
             search=True,
             field_type="N/A",
             load_years=None,
+            budget: Optional[SearchBudget] = None,
+            checkpoint: Optional[SearchCheckpoint] = None,
+            field_search: FieldSearchType = FieldSearchType.BISECTION,
     ):
 
         # Take the lowest part of the coordinates domain to be used for the
@@ -40,13 +156,13 @@ class Bisection1D:
             load_years = [2019]
         self.load_years = load_years
         self.searchTracker = []
+        self.init_budget(budget)
         coordinates = coordinates_domain[0]
         current_field = field_descriptors[0]
         self.field_type = field_type
         # Flow rate tracking
         self.V_flow = v_flow
         self.flow_type = flow_type
-        v_flow_system, m_flow_borehole = self.retrieve_flow(coordinates, fluid.rho)
         self.method = method
 
         self.log_time = eskilson_log_times()
@@ -56,49 +172,22 @@ class Bisection1D:
         self.coordinates_domain = coordinates_domain
         self.fieldDescriptors = field_descriptors
         self.max_iter = max_iter
+        self.field_search = field_search
         self.disp = disp
-
-        b = borehole_spacing(borehole, coordinates)
-
-        # Calculate a g-function for uniform inlet fluid temperature with
-        # 8 unequal segments using the equivalent solver
-        g_function = calc_g_func_for_multiple_lengths(
-            b,
-            [borehole.H],
-            borehole.r_b,
-            borehole.D,
-            m_flow_borehole,
-            self.bhe_type,
-            self.log_time,
-            coordinates,
-            fluid,
-            pipe,
-            grout,
-            soil,
-        )
-
-        # Initialize the GHE object
-        self.ghe = GHE(
-            v_flow_system,
-            b,
-            bhe_type,
-            fluid,
-            borehole,
-            pipe,
-            grout,
-            soil,
-            g_function,
-            sim_params,
-            hourly_extraction_ground_loads,
-            field_specifier=current_field,
-            field_type=field_type,
-            load_years=load_years,
-        )
+        # Candidate evaluations build their GHEs from this state, so the search never mutates
+        # the borehole, pipe, grout, soil or fluid it was given
+        self.design_state = DesignState.from_media(bhe_type, borehole, pipe, grout, soil, fluid, v_flow, flow_type)
+        self.initialize_ghe(coordinates, borehole.H, field_specifier=current_field)
 
         self.calculated_temperatures = {}
+        self.init_checkpoint(checkpoint)
 
         if search:
-            self.selection_key, self.selected_coordinates = self.search()
+            try:
+                self.selection_key, self.selected_coordinates = self.search()
+            except SearchBudgetExpired:
+                self.selection_key = None
+                self.selected_coordinates, _ = self.select_best_feasible()
 
     def retrieve_flow(self, coordinates, rho):
         if self.flow_type == FlowConfigType.BOREHOLE:
@@ -114,44 +203,26 @@ class Bisection1D:
         return v_flow_system, m_flow_borehole
 
     def initialize_ghe(self, coordinates, h, field_specifier="N/A"):
-        v_flow_system, m_flow_borehole = self.retrieve_flow(coordinates, self.ghe.bhe.fluid.rho)
-
-        self.ghe.bhe.b.H = h
-        borehole = self.ghe.bhe.b
-        fluid = self.ghe.bhe.fluid
-        pipe = self.ghe.bhe.pipe
-        grout = self.ghe.bhe.grout
-        soil = self.ghe.bhe.soil
+        design_state = self.design_state.with_height(h)
+        _, m_flow_borehole = self.retrieve_flow(coordinates, design_state.fluid.to_fluid().rho)
 
-        b = borehole_spacing(borehole, coordinates)
+        b = borehole_spacing(design_state.borehole.to_borehole(), coordinates)
 
         # Calculate a g-function for uniform inlet fluid temperature with
         # 8 unequal segments using the equivalent solver
-        g_function = calc_g_func_for_multiple_lengths(
+        g_function = calc_g_func_for_design_state(
             b,
-            [borehole.H],
-            borehole.r_b,
-            borehole.D,
+            [h],
+            design_state,
             m_flow_borehole,
-            self.bhe_type,
             self.log_time,
             coordinates,
-            fluid,
-            pipe,
-            grout,
-            soil,
         )
 
         # Initialize the GHE object
-        self.ghe = GHE(
-            v_flow_system,
+        self.ghe = GHE.from_design_state(
+            design_state,
             b,
-            self.bhe_type,
-            fluid,
-            borehole,
-            pipe,
-            grout,
-            soil,
             g_function,
             self.sim_params,
             self.hourly_extraction_ground_loads,
@@ -160,54 +231,176 @@ class Bisection1D:
             load_years=self.load_years,
         )
 
-    def calculate_excess(self, coordinates, h, field_specifier="N/A"):
-        self.initialize_ghe(coordinates, h, field_specifier=field_specifier)
-        # Simulate after computing just one g-function
-        max_hp_eft, min_hp_eft = self.ghe.simulate(method=self.method)
-        t_excess = self.ghe.cost(max_hp_eft, min_hp_eft)
-        self.searchTracker.append([field_specifier, t_excess, max_hp_eft, min_hp_eft])
+    def first_candidate_index(self) -> int:
+        """
+        Finds the smallest field of the domain that the analytical length bounds do not rule out at the
+        maximum height. The last field is always kept, so the search still reports an undersized domain.
+        Domains not ordered by number of boreholes, such as the zoned ones, are not trimmed, since the
+        bisection would take a different path through them.
 
-        return t_excess
+        :returns: the index of the field in the coordinates domain
+        """
+        num_boreholes = np.array([len(c) for c in self.coordinates_domain])
+        if np.any(np.diff(num_boreholes) < 0):
+            return 0
 
+        borehole, pipe, grout, soil, fluid = self.design_state.with_height(self.sim_params.max_height).to_media()
+        m_flow_total = np.array([self.retrieve_flow(c, fluid.rho)[1] * len(c) for c in self.coordinates_domain])
+
+        # with a fixed flow rate per borehole, all fields share the borehole resistance
+        borehole_resistance = None
+        if self.flow_type == FlowConfigType.BOREHOLE:
+            bhe = get_bhe_object(self.bhe_type, m_flow_total[0] / num_boreholes[0], fluid, borehole, pipe, grout,
+                                 soil)
+            borehole_resistance = bhe.calc_effective_borehole_resistance()
+
+        infeasible = infeasible_field_sizes(
+            num_boreholes,
+            borehole,
+            soil.k,
+            soil.rhoCp,
+            soil.ugt,
+            self.sim_params,
+            -1.0 * np.asarray(self.hourly_extraction_ground_loads, dtype=np.float64),
+            m_flow_total,
+            fluid.cp,
+            peak_rejection_loads=self.ghe.hybrid_load.load[2:] * 1000.0,
+            borehole_resistance=borehole_resistance,
+        )
+
+        idx = 0
+        while idx < len(infeasible) - 1 and infeasible[idx]:
+            idx += 1
+        return idx
+
+    def secant_search(self, x_l_idx, x_r_idx, t_l, t_r) -> int:
+        """
+        Narrows a bracket of field indices down to adjacent fields, like the integer bisection, with regula
+        falsi steps to the zero crossing of the line through the excess temperatures at the ends of the
+        bracket, against the number of boreholes.
+
+        The Illinois modification halves the excess temperature of an end kept for two steps in a row, and
+        a step that does not halve the bracket is followed by a bisection step, so the bracket narrows at
+        least as fast as with every other step of the bisection.
+
+        :param t_l: excess temperature of the lower end, None if it is only known to be positive.
+        :param t_r: excess temperature of the upper end.
+        :returns: the number of iterations
+        """
+        num_boreholes = np.array([len(c) for c in self.coordinates_domain], dtype=np.float64)
+        # fit against the number of boreholes when the domain is ordered by it, else against the index
+        if np.all(np.diff(num_boreholes) >= 0):
+            x = num_boreholes
+        else:
+            x = np.arange(len(num_boreholes), dtype=np.float64)
+
+        x_l_sign = 1 if t_l is None else sign(t_l)
+        bisect = t_l is None
+        kept_end = None
+        i = 0
+
+        while x_r_idx - x_l_idx > 1 and i < 2 * self.max_iter:
+            width = x_r_idx - x_l_idx
+            if bisect or x[x_l_idx] == x[x_r_idx]:
+                c_idx = ceil((x_l_idx + x_r_idx) / 2)
+            else:
+                x_root = x[x_l_idx] + t_l * (x[x_r_idx] - x[x_l_idx]) / (t_l - t_r)
+                c_idx = x_l_idx + 1 + int(np.searchsorted(x[x_l_idx + 1:x_r_idx], x_root))
+                c_idx = min(c_idx, x_r_idx - 1)
+
+            c_t_excess = self.calculate_excess(
+                self.coordinates_domain[c_idx],
+                self.sim_params.max_height,
+                field_specifier=self.fieldDescriptors[c_idx],
+            )
+            self.calculated_temperatures[c_idx] = c_t_excess
+
+            if sign(c_t_excess) == x_l_sign:
+                x_l_idx, t_l = c_idx, c_t_excess
+                if kept_end == 'upper':
+                    t_r *= 0.5
+                kept_end = 'upper'
+            else:
+                x_r_idx, t_r = c_idx, c_t_excess
+                if kept_end == 'lower' and t_l is not None:
+                    t_l *= 0.5
+                kept_end = 'lower'
+            self.bracket = [x_l_idx, x_r_idx]
+
+            # follow a step that did not halve the bracket with a bisection step
+            bisect = t_l is None or (not bisect and x_r_idx - x_l_idx > width / 2)
+            i += 1
+
+        return i
+
+    @timed('field_search')
     def search(self):
 
         x_l_idx = 0
         x_r_idx = len(self.coordinates_domain) - 1
         if self.disp:
             print("Do some initial checks before searching.")
-        # Get the lowest possible excess temperature from minimum height at the
-        # smallest location in the domain
-        t_0_lower = self.calculate_excess(
-            self.coordinates_domain[x_l_idx],
-            self.sim_params.min_height,
-            field_specifier=self.fieldDescriptors[x_l_idx],
-        )
-        t_0_upper = self.calculate_excess(
-            self.coordinates_domain[x_l_idx],
-            self.sim_params.max_height,
-            field_specifier=self.fieldDescriptors[x_l_idx],
-        )
+
+        # Fields below the analytical lower bound on the total borehole length are too small, so the
+        # search starts from the largest of them. The bound is an estimate, so it is only trusted if
+        # the largest of them does fail at the maximum height.
+        first_idx = self.first_candidate_index()
+        if first_idx > 0:
+            t_pruned = self.calculate_excess(
+                self.coordinates_domain[first_idx - 1],
+                self.sim_params.max_height,
+                field_specifier=self.fieldDescriptors[first_idx - 1],
+            )
+            if t_pruned > 0.0:
+                if self.disp:
+                    print(f"The {first_idx} smallest fields are below the borehole length lower bound.")
+                self.calculated_temperatures[first_idx - 1] = t_pruned
+                x_l_idx = first_idx - 1
+            else:
+                if self.disp:
+                    print("The borehole length lower bound ruled out a feasible field, searching all fields.")
+                first_idx = 0
+        self.pruned_fields = first_idx
+        self.bracket = [x_l_idx, x_r_idx]
+
+        if first_idx > 0:
+            # the largest pruned field is too small at the maximum height, so at any height
+            sign_0_lower = sign_0_upper = 1
+        else:
+            # Get the lowest possible excess temperature from minimum height at the
+            # smallest location in the domain
+            t_0_lower = self.calculate_excess(
+                self.coordinates_domain[x_l_idx],
+                self.sim_params.min_height,
+                field_specifier=self.fieldDescriptors[x_l_idx],
+            )
+            t_0_upper = self.calculate_excess(
+                self.coordinates_domain[x_l_idx],
+                self.sim_params.max_height,
+                field_specifier=self.fieldDescriptors[x_l_idx],
+            )
+            self.calculated_temperatures[x_l_idx] = t_0_upper
+            sign_0_lower, sign_0_upper = sign(t_0_lower), sign(t_0_upper)
         t_m1 = self.calculate_excess(
             self.coordinates_domain[x_r_idx],
             self.sim_params.max_height,
             field_specifier=self.fieldDescriptors[x_r_idx],
         )
 
-        self.calculated_temperatures[x_l_idx] = t_0_upper
         self.calculated_temperatures[x_r_idx] = t_m1
 
-        if check_bracket(sign(t_0_lower), sign(t_0_upper)):
+        if check_bracket(sign_0_lower, sign_0_upper):
             if self.disp:
                 print("Size between min and max of lower bound in domain.")
             self.initialize_ghe(self.coordinates_domain[0], self.sim_params.max_height)
             return 0, self.coordinates_domain[0]
-        elif check_bracket(sign(t_0_upper), sign(t_m1)):
+        elif check_bracket(sign_0_upper, sign(t_m1)):
             if self.disp:
                 print("Perform the integer bisection search routine.")
             pass
         else:
             # This domain does not bracket the solution
-            if t_0_upper < 0.0 and t_m1 < 0.0:
+            if sign_0_upper < 0 and t_m1 < 0.0:
                 msg = (
                     "Based on the loads provided, the excess temperatures \n"
                     "for the minimum and maximum number of boreholes falls \n"
@@ -216,7 +409,7 @@ class Bisection1D:
                     "fewer boreholes."
                 )
                 raise ValueError(msg)
-            if t_0_upper > 0.0 and t_m1 > 0.0:
+            if sign_0_upper > 0 and t_m1 > 0.0:
                 msg = (
                     "Based on the loads provided, the excess temperatures \n"
                     "for the minimum and maximum number of boreholes falls \n"
@@ -232,11 +425,14 @@ class Bisection1D:
         if self.disp:
             print("Beginning bisection search...")
 
-        x_l_sign = sign(t_0_upper)
+        x_l_sign = sign_0_upper
 
         i = 0
 
-        while i < self.max_iter:
+        if self.field_search == FieldSearchType.SECANT:
+            i = self.secant_search(x_l_idx, x_r_idx, self.calculated_temperatures.get(x_l_idx), t_m1)
+
+        while self.field_search == FieldSearchType.BISECTION and i < self.max_iter:
             c_idx = ceil((x_l_idx + x_r_idx) / 2)
             # if the solution is no longer making progress break the while
             if c_idx == x_l_idx or c_idx == x_r_idx:
@@ -255,6 +451,7 @@ class Bisection1D:
                 x_l_idx = c_idx
             else:
                 x_r_idx = c_idx
+            self.bracket = [x_l_idx, x_r_idx]
 
             i += 1
 
@@ -297,7 +494,7 @@ class Bisection1D:
 
 
 # This is the search algorithm used for finding row-wise fields
-class RowWiseModifiedBisectionSearch:
+class RowWiseModifiedBisectionSearch(SearchBase):
     def __init__(
             self,
             v_flow: float,
@@ -308,7 +505,7 @@ class RowWiseModifiedBisectionSearch:
             grout: Grout,
             soil: Soil,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             geometric_constraints,
             method: TimestepType,
             flow_type: FlowConfigType.BOREHOLE,
@@ -318,6 +515,8 @@ class RowWiseModifiedBisectionSearch:
             advanced_tracking: bool = True,
             field_type: str = "rowwise",
             load_years=None,
+            budget: Optional[SearchBudget] = None,
+            checkpoint: Optional[SearchCheckpoint] = None,
     ):
 
         # Take the lowest part of the coordinates domain to be used for the
@@ -325,11 +524,7 @@ class RowWiseModifiedBisectionSearch:
         if load_years is None:
             load_years = [2019]
         self.load_years = load_years
-        self.fluid = fluid
-        self.pipe = pipe
-        self.grout = grout
-        self.soil = soil
-        self.borehole = borehole
+        self.design_state = DesignState.from_media(bhe_type, borehole, pipe, grout, soil, fluid, v_flow, flow_type)
         self.geometricConstraints = geometric_constraints
         self.searchTracker = []
         self.fieldType = field_type
@@ -345,11 +540,16 @@ class RowWiseModifiedBisectionSearch:
         self.disp = disp
         self.ghe: Optional[GHE] = None
         self.calculated_temperatures = {}
+        self.init_budget(budget)
+        self.init_checkpoint(checkpoint)
         if advanced_tracking:
             self.advanced_tracking = [["TargetSpacing", "Field Specifier", "nbh", "ExcessTemperature"]]
             self.checkedFields = []
         if search:
-            self.selected_coordinates, self.selected_specifier = self.search()
+            try:
+                self.selected_coordinates, self.selected_specifier = self.search()
+            except SearchBudgetExpired:
+                self.selected_coordinates, self.selected_specifier = self.select_best_feasible()
             self.initialize_ghe(self.selected_coordinates, self.sim_params.max_height,
                                 field_specifier=self.selected_specifier)
 
@@ -367,44 +567,26 @@ class RowWiseModifiedBisectionSearch:
         return v_flow_system, m_flow_borehole
 
     def initialize_ghe(self, coordinates, h, field_specifier="N/A"):
-        v_flow_system, m_flow_borehole = self.retrieve_flow(coordinates, self.fluid.rho)
-
-        self.borehole.H = h
-        borehole = self.borehole
-        fluid = self.fluid
-        pipe = self.pipe
-        grout = self.grout
-        soil = self.soil
+        design_state = self.design_state.with_height(h)
+        _, m_flow_borehole = self.retrieve_flow(coordinates, design_state.fluid.to_fluid().rho)
 
-        b = borehole_spacing(borehole, coordinates)
+        b = borehole_spacing(design_state.borehole.to_borehole(), coordinates)
 
         # Calculate a g-function for uniform inlet fluid temperature with
         # 8 unequal segments using the equivalent solver
-        g_function = calc_g_func_for_multiple_lengths(
+        g_function = calc_g_func_for_design_state(
             b,
-            [borehole.H],
-            borehole.r_b,
-            borehole.D,
+            [h],
+            design_state,
             m_flow_borehole,
-            self.bhe_type,
             self.log_time,
             coordinates,
-            fluid,
-            pipe,
-            grout,
-            soil,
         )
 
         # Initialize the GHE object
-        self.ghe = GHE(
-            v_flow_system,
+        self.ghe = GHE.from_design_state(
+            design_state,
             b,
-            self.bhe_type,
-            fluid,
-            borehole,
-            pipe,
-            grout,
-            soil,
             g_function,
             self.sim_params,
             self.hourly_extraction_ground_loads,
@@ -413,16 +595,29 @@ class RowWiseModifiedBisectionSearch:
             load_years=self.load_years,
         )
 
-    def calculate_excess(self, coordinates, h, field_specifier="N/A"):
-        self.initialize_ghe(coordinates, h, field_specifier=field_specifier)
-        # Simulate after computing just one g-function
-        max_hp_eft, min_hp_eft = self.ghe.simulate(method=self.method)
-        t_excess = self.ghe.cost(max_hp_eft, min_hp_eft)
-        self.searchTracker.append([field_specifier, t_excess, max_hp_eft, min_hp_eft])
-
-        return t_excess
-
+    @timed('field_search')
     def search(self):
+        # the rotation sweeps of all the fields the search generates share one pool of workers
+        workers = self.geometricConstraints.rotate_workers
+        executor = ProcessPoolExecutor(max_workers=workers) if workers is not None and workers > 1 else None
+        sweep_options = {
+            'coarse_factor': self.geometricConstraints.rotate_coarse_factor,
+            'refine_count': self.geometricConstraints.rotate_refine_count,
+            'executor': executor,
+        }
+        try:
+            return self.search_fields(sweep_options)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def search_fields(self, sweep_options: dict):
+        """
+        Searches the target spacings for the smallest satisfactory field.
+
+        :param sweep_options: settings of the rotation sweeps of the generated fields.
+        :returns: the selected coordinates and field specifier
+        """
 
         spacing_start = self.geometricConstraints.min_spacing
         spacing_stop = self.geometricConstraints.max_spacing
@@ -456,6 +651,7 @@ class RowWiseModifiedBisectionSearch:
                 ng_zones=ng_zones,
                 rotate_start=rotate_start,
                 rotate_stop=rotate_stop,
+                **sweep_options,
             )
             lower_field, lower_field_specifier = field_optimization_wp_space_fr(
                 perimeter_spacing_ratio,
@@ -465,6 +661,7 @@ class RowWiseModifiedBisectionSearch:
                 ng_zones=ng_zones,
                 rotate_start=rotate_start,
                 rotate_stop=rotate_stop,
+                **sweep_options,
             )
         else:
             upper_field, upper_field_specifier = field_optimization_fr(
@@ -474,6 +671,7 @@ class RowWiseModifiedBisectionSearch:
                 ng_zones=ng_zones,
                 rotate_start=rotate_start,
                 rotate_stop=rotate_stop,
+                **sweep_options,
             )
             lower_field, lower_field_specifier = field_optimization_fr(
                 spacing_stop,
@@ -482,6 +680,7 @@ class RowWiseModifiedBisectionSearch:
                 ng_zones=ng_zones,
                 rotate_start=rotate_start,
                 rotate_stop=rotate_stop,
+                **sweep_options,
             )
 
         # Get Excess Temperatures
@@ -513,11 +712,13 @@ class RowWiseModifiedBisectionSearch:
             i = 0
             spacing_high = spacing_start
             spacing_low = spacing_stop
+            self.bracket = [spacing_low, spacing_high]
             low_e = t_upper
             high_e = t_lower
             spacing_m = (spacing_stop + spacing_start) * 0.5
             while i < self.max_iter:
                 print("Bisection Search Iteration: ", i)
+                report_progress('search_iteration', iteration=i)
                 # Getting Three Middle Field
                 if use_perimeter:
                     f1, f1_specifier = field_optimization_wp_space_fr(
@@ -528,6 +729,7 @@ class RowWiseModifiedBisectionSearch:
                         ng_zones=ng_zones,
                         rotate_start=rotate_start,
                         rotate_stop=rotate_stop,
+                        **sweep_options,
                     )
                 else:
                     f1, f1_specifier = field_optimization_fr(
@@ -537,6 +739,7 @@ class RowWiseModifiedBisectionSearch:
                         ng_zones=ng_zones,
                         rotate_start=rotate_start,
                         rotate_stop=rotate_stop,
+                        **sweep_options,
                     )
 
                 # Getting the three field's excess temperature
@@ -554,6 +757,7 @@ class RowWiseModifiedBisectionSearch:
                 else:
                     spacing_low = spacing_m
                     low_e = t_e1
+                self.bracket = [spacing_low, spacing_high]
 
                 spacing_m = (spacing_low + spacing_high) * 0.5
                 if abs(low_e - high_e) < 1E-10:  # Error tolerance
@@ -586,6 +790,7 @@ class RowWiseModifiedBisectionSearch:
                         ng_zones=ng_zones,
                         rotate_start=rotate_start,
                         rotate_stop=rotate_stop,
+                        **sweep_options,
                     )
                 else:
                     field, f_s = field_optimization_fr(
@@ -595,6 +800,7 @@ class RowWiseModifiedBisectionSearch:
                         ng_zones=ng_zones,
                         rotate_start=rotate_start,
                         rotate_stop=rotate_stop,
+                        **sweep_options,
                     )
 
                 t_e = self.calculate_excess(field, self.sim_params.max_height, field_specifier=f_s)
@@ -603,10 +809,7 @@ class RowWiseModifiedBisectionSearch:
                     self.advanced_tracking.append([ts, f_s, len(field), t_e])
                     self.checkedFields.append(field)
 
-                self.initialize_ghe(field, self.sim_params.max_height, field_specifier=f_s)
-                self.ghe.compute_g_functions()
-                self.ghe.size(method=TimestepType.HYBRID)
-                total_drilling = self.ghe.bhe.b.H * len(field)
+                total_drilling = self.size_candidate(field, field_specifier=f_s) * len(field)
 
                 if best_field is None:
                     best_field = field
@@ -632,16 +835,14 @@ class RowWiseModifiedBisectionSearch:
 
             # Function For Sorting Boreholes Based on Proximity to a Point
             def point_sort(target_point, other_points, method="ascending"):
-                def dist(o_p):
-                    return sqrt(
-                        (target_point[0] - o_p[0]) * (target_point[0] - o_p[0])
-                        + (target_point[1] - o_p[1]) * (target_point[1] - o_p[1]))
-
-                distances = map(dist, other_points)
+                other_points = as_coordinate_array(other_points)
+                dx = target_point[0] - other_points[:, 0]
+                dy = target_point[1] - other_points[:, 1]
+                distances = np.sqrt(dx * dx + dy * dy)
                 if method == "ascending":
-                    return [x for _, x in sorted(zip(distances, other_points))]
+                    return other_points[np.argsort(distances, kind="stable")]
                 elif method == "descending":
-                    return [x for _, x in sorted(zip(distances, other_points), reverse=True)]
+                    return other_points[np.argsort(-distances, kind="stable")]
 
             # TODO: b_r_removal_method was an argument but it was never used
             # if b_r_removal_method == "CloseToCorner":
@@ -658,11 +859,12 @@ class RowWiseModifiedBisectionSearch:
             #     raise ValueError(msg)
 
             # Check if a 1X1 field is satisfactory
-            t_e_single = self.calculate_excess([[0, 0]], self.sim_params.max_height, field_specifier="1X1")
+            single_field = as_coordinate_array([[0, 0]])
+            t_e_single = self.calculate_excess(single_field, self.sim_params.max_height, field_specifier="1X1")
 
             if self.advanced_tracking:
                 self.advanced_tracking.append(["N/A", "1X1", 1, t_e_single])
-                self.checkedFields.append([[0, 0]])
+                self.checkedFields.append(single_field)
             if t_e_single <= 0:
                 selected_temp_excess = t_e_single
                 selected_specifier = "1X1"
@@ -698,6 +900,7 @@ class RowWiseModifiedBisectionSearch:
                         selected_spacing = spacing_stop
                     else:
                         nbh_min = nbh
+                    self.bracket = [nbh_min, nbh_max]
                     if (nbh_max - nbh_min) <= 1:
                         break
                     i += 1
@@ -736,13 +939,16 @@ class Bisection2D(Bisection1D):
             grout: Grout,
             soil: Soil,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             method: TimestepType,
             flow_type: FlowConfigType.BOREHOLE,
             max_iter=15,
             disp=False,
             field_type="N/A",
             load_years=None,
+            budget: Optional[SearchBudget] = None,
+            checkpoint: Optional[SearchCheckpoint] = None,
+            field_search: FieldSearchType = FieldSearchType.BISECTION,
     ):
         if load_years is None:
             load_years = [2019]
@@ -770,6 +976,9 @@ class Bisection2D(Bisection1D):
             search=False,
             field_type=field_type,
             load_years=load_years,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
         )
 
         self.coordinates_domain_nested = []
@@ -781,20 +990,24 @@ class Bisection2D(Bisection1D):
 
         self.coordinates_domain = outer_domain
 
-        selection_key, _ = self.search()
+        try:
+            selection_key, _ = self.search()
 
-        self.calculated_temperatures_nested.append(self.calculated_temperatures)
+            self.calculated_temperatures_nested.append(self.calculated_temperatures)
 
-        # We tacked on one borehole to the beginning, so we need to subtract 1
-        # on the index
-        inner_domain = coordinates_domain_nested[selection_key - 1]
-        self.coordinates_domain = inner_domain
-        self.fieldDescriptors = field_descriptors[selection_key - 1]
+            # We tacked on one borehole to the beginning, so we need to subtract 1
+            # on the index
+            inner_domain = coordinates_domain_nested[selection_key - 1]
+            self.coordinates_domain = inner_domain
+            self.fieldDescriptors = field_descriptors[selection_key - 1]
 
-        # Reset calculated temperatures
-        self.calculated_temperatures = {}
+            # Reset calculated temperatures
+            self.calculated_temperatures = {}
 
-        self.selection_key, self.selected_coordinates = self.search()
+            self.selection_key, self.selected_coordinates = self.search()
+        except SearchBudgetExpired:
+            self.selection_key = None
+            self.selected_coordinates, _ = self.select_best_feasible()
 
 
 class BisectionZD(Bisection1D):
@@ -810,13 +1023,16 @@ class BisectionZD(Bisection1D):
             grout: Grout,
             soil: Soil,
             sim_params: SimulationParameters,
-            hourly_extraction_ground_loads: list,
+            hourly_extraction_ground_loads: np.ndarray,
             method: TimestepType,
             flow_type: FlowConfigType.BOREHOLE,
             max_iter=15,
             disp=False,
             field_type="N/A",
             load_years=None,
+            budget: Optional[SearchBudget] = None,
+            checkpoint: Optional[SearchCheckpoint] = None,
+            field_search: FieldSearchType = FieldSearchType.BISECTION,
     ):
         if load_years is None:
             load_years = [2019]
@@ -844,6 +1060,9 @@ class BisectionZD(Bisection1D):
             search=False,
             field_type=field_type,
             load_years=load_years,
+            budget=budget,
+            checkpoint=checkpoint,
+            field_search=field_search,
         )
 
         self.coordinates_domain_nested = coordinates_domain_nested
@@ -860,12 +1079,16 @@ class BisectionZD(Bisection1D):
         self.coordinates_domain = outer_domain
         self.fieldDescriptors = outer_descriptors
 
-        self.selection_key_outer, _ = self.search()
-        if self.selection_key_outer > 0:
-            self.selection_key_outer -= 1
         self.calculated_heights = {}
+        try:
+            self.selection_key_outer, _ = self.search()
+            if self.selection_key_outer > 0:
+                self.selection_key_outer -= 1
 
-        self.selection_key, self.selected_coordinates = self.search_successive()
+            self.selection_key, self.selected_coordinates = self.search_successive()
+        except SearchBudgetExpired:
+            self.selection_key = None
+            self.selected_coordinates, _ = self.select_best_feasible()
 
     def search_successive(self, max_iter=None):
         if max_iter is None:
@@ -886,11 +1109,11 @@ class BisectionZD(Bisection1D):
                 break
             self.calculated_temperatures_nested[i] = self.calculated_temperatures
 
-            self.ghe.compute_g_functions()
-            self.ghe.size(method=TimestepType.HYBRID)
-
             nbh = len(selected_coordinates)
-            total_drilling = nbh * self.ghe.bhe.b.H
+            # the search leaves the GHE set up for the selected field
+            total_drilling = nbh * self.size_candidate(selected_coordinates,
+                                                       field_specifier=self.fieldDescriptors[selection_key],
+                                                       initialize=False)
             self.calculated_heights[i] = total_drilling
 
             if old_height < total_drilling:
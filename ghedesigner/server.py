@@ -0,0 +1,191 @@
+from copy import deepcopy
+from hashlib import sha256
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps, loads
+from sys import stderr
+from threading import BoundedSemaphore, Lock
+from time import time
+from typing import Optional, Tuple
+
+import click
+
+from ghedesigner import VERSION
+from ghedesigner.cache import LRUCache, cache_stats, set_cache_size
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.validate import validate_input_dict
+
+
+class DesignService:
+    """
+    Runs designs from input data in a long-running process.
+
+    The g-function, STS g-function and load preprocessing caches are enabled for the
+    lifetime of the service, and finished designs are kept in a result cache keyed by
+    the input data, so repeated and similar requests skip the expensive steps.
+    """
+
+    def __init__(self, max_workers: int = 1, cache_size: int = 256, result_cache_size: int = 64,
+                 memory_budget: Optional[float] = None, time_budget: Optional[float] = None):
+        """
+        :param max_workers: max number of designs run concurrently, other requests wait for a free worker.
+        :param cache_size: max number of entries in each intermediate result cache.
+        :param result_cache_size: max number of finished designs to keep.
+        :param memory_budget: memory budget of each g-function calculation in MB, None for no budget.
+        :param time_budget: time budget of each field search in s, None for no budget. Designs of searches
+         that ran out of time are returned, but not kept.
+        """
+        set_cache_size(cache_size)
+        if memory_budget is not None:
+            from ghedesigner.gfunction import set_g_function_memory_budget
+            set_g_function_memory_budget(memory_budget)
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.results = LRUCache('design_result', result_cache_size)
+        self._workers = BoundedSemaphore(max_workers)
+        self._lock = Lock()
+        self.start_time = time()
+        self.counters = {'requests': 0, 'designs': 0, 'failures': 0, 'active': 0, 'design_time': 0.0}
+
+    def _count(self, name: str, value=1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def design(self, inputs: dict) -> Tuple[int, dict]:
+        """
+        Finds the design for the input data.
+
+        :param inputs: input data, with the same structure as an input file.
+        :returns: the HTTP status code, and the summary output or an error message
+        """
+        self._count('requests')
+
+        # validation upper-cases some values in place, so keep the request as sent
+        inputs = deepcopy(inputs)
+        try:
+            if validate_input_dict(inputs) != 0:
+                self._count('failures')
+                return 400, {'error': 'Input validation failed.'}
+        except (KeyError, TypeError) as e:
+            self._count('failures')
+            return 400, {'error': f'Input validation failed: {e}'}
+
+        key = sha256(dumps(inputs, sort_keys=True).encode()).hexdigest()
+        cached = self.results.get(key)
+        if cached is not None:
+            return 200, cached
+
+        with self._workers:
+            self._count('active')
+            start_time = time()
+            try:
+                ghe = setup_manager_from_inputs(inputs)
+                if ghe is None:
+                    self._count('failures')
+                    return 400, {'error': 'Inputs not supported.'}
+                ghe.find_design(time_budget=self.time_budget)
+                ghe.prepare_results("GHEDesigner Run from Server", "Notes", "Author", "Iteration Name")
+                output = ghe.results.output_dict
+            except Exception as e:
+                self._count('failures')
+                return 500, {'error': f'{type(e).__name__}: {e}'}
+            finally:
+                self._count('active', -1)
+                self._count('design_time', time() - start_time)
+
+        self._count('designs')
+        if not output.get('search_budget', {}).get('budget_limited', False):
+            self.results.put(key, output)
+        return 200, output
+
+    def health(self) -> dict:
+        return {'status': 'ok', 'version': VERSION}
+
+    def metrics(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        counters['uptime'] = time() - self.start_time
+        counters['max_workers'] = self.max_workers
+        counters['caches'] = cache_stats() + [self.results.as_dict()]
+        return counters
+
+
+class DesignRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON over HTTP interface to the DesignService:
+
+    - POST /design with an input file as body returns the summary output
+    - GET /health returns the service status
+    - GET /metrics returns request counters, timings and cache statistics
+    """
+
+    def _send_json(self, status: int, body: dict) -> None:
+        data = dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.service.health())
+        elif self.path == '/metrics':
+            self._send_json(200, self.server.service.metrics())
+        else:
+            self._send_json(404, {'error': f'Unknown path: {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/design':
+            self._send_json(404, {'error': f'Unknown path: {self.path}'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            inputs = loads(self.rfile.read(length))
+        except ValueError:
+            self._send_json(400, {'error': 'Request body is not valid JSON.'})
+            return
+        if not isinstance(inputs, dict):
+            self._send_json(400, {'error': 'Request body must be a JSON object.'})
+            return
+        self._send_json(*self.server.service.design(inputs))
+
+    def log_message(self, format, *args):
+        print(f"{self.address_string()} - {format % args}", file=stderr)
+
+
+class DesignServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, service: DesignService):
+        super().__init__(server_address, DesignRequestHandler)
+        self.service = service
+
+
+@click.command(name="GHEDesignerServer")
+@click.version_option(VERSION)
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host address to listen on.")
+@click.option("--port", default=8765, show_default=True, type=int, help="Port to listen on.")
+@click.option("-j", "--workers", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Max number of designs run concurrently.")
+@click.option("--cache-size", default=256, show_default=True, type=click.IntRange(min=0),
+              help="Max number of entries in each g-function, STS, load and domain cache.")
+@click.option("--memory-budget", type=click.FloatRange(min=0.0, min_open=True),
+              help="Memory budget of each g-function calculation, in MB.")
+@click.option("--time-budget", type=click.FloatRange(min=0.0, min_open=True),
+              help="Time budget of each field search, in s. When it runs out, the best feasible field "
+                   "found so far is returned.")
+def run_server_from_cli(host, port, workers, cache_size, memory_budget, time_budget):
+    server = DesignServer((host, port), DesignService(max_workers=workers, cache_size=cache_size,
+                                                      memory_budget=memory_budget, time_budget=time_budget))
+    print(f"GHEDesigner server listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    run_server_from_cli()
@@ -23,6 +23,22 @@ class Shapes:
         self.max_y = max(ys)
         self.min_y = min(ys)
 
+        # edge arrays, edge i runs from vertex i to vertex i + 1 and the last edge closes the shape
+        edge_start = np.asarray(self.c, dtype=np.float64).reshape(-1, 2)
+        edge_end = np.roll(edge_start, -1, axis=0)
+        self.edge_start = edge_start
+        self.edge_end = edge_end
+        self.edge_vertical = edge_end[:, 0] - edge_start[:, 0] == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.edge_slope = np.where(
+                self.edge_vertical, np.inf, (edge_end[:, 1] - edge_start[:, 1]) / (edge_end[:, 0] - edge_start[:, 0])
+            )
+            self.edge_intercept = np.where(
+                self.edge_vertical, np.nan, edge_start[:, 1] - edge_start[:, 0] * self.edge_slope
+            )
+        self.edge_min = np.minimum(edge_start, edge_end)
+        self.edge_max = np.maximum(edge_start, edge_end)
+
     def line_intersect(self, xy, rotate=0, intersection_tolerance=1e-6):
         """
         returns the intersections between a line segment and the shape
@@ -37,52 +53,66 @@ class Shapes:
         :return: [[float]]
             the x,y values of the intersections
         """
-        x1, y1, x2, y2 = xy
-        r_a = []
-        for i in range(len(self.c)):
-            if i == len(self.c) - 1:
-                c1 = self.c[len(self.c) - 1]
-                c2 = self.c[0]
-                r = vector_intersect(
-                    [c1[0], c1[1], c2[0], c2[1]],
-                    [x1, y1, x2, y2],
-                    intersection_tolerance,
-                )
-                # print(r)
-                if len(r) == 1:
-                    r = r[0]
-                    if (
-                            (r[0] - max(c2[0], c1[0])) > intersection_tolerance
-                            or (r[0] - min(c2[0], c1[0])) < -1 * intersection_tolerance
-                            or (r[1] - max(c2[1], c1[1])) > intersection_tolerance
-                            or (r[1] - min(c2[1], c1[1])) < -1 * intersection_tolerance
-                    ):
-                        continue
-                    r_a.append(r)
-            else:
-                c1 = self.c[i]
-                c2 = self.c[i + 1]
-                r = vector_intersect(
-                    [c1[0], c1[1], c2[0], c2[1]],
-                    [x1, y1, x2, y2],
-                    intersection_tolerance,
-                )
-                if len(r) == 1:
-                    r = r[0]
-                    if (
-                            (r[0] - max(c2[0], c1[0])) > intersection_tolerance
-                            or (r[0] - min(c2[0], c1[0])) < -1 * intersection_tolerance
-                            or (r[1] - max(c2[1], c1[1])) > intersection_tolerance
-                            or (r[1] - min(c2[1], c1[1])) < -1 * intersection_tolerance
-                    ):
-                        continue
-                    r_a.append(r)
-        # print("x value: %f, r values:"%x1)
-        # print(r_a)
-
-        r_a = sort_intersections(r_a, rotate)
-        # print(r_a)
-        return r_a
+        return self.lines_intersect([xy], rotate, intersection_tolerance)[0]
+
+    def lines_intersect(self, xys, rotate=0, intersection_tolerance=1e-6):
+        """
+        returns the intersections between each of the line segments and the shape
+
+        The intersections of every line with every edge are computed at once with the same rules as
+        vector_intersect, so the results match calling line_intersect for each line.
+
+        Parameters
+        -----------
+        :param xys: [[float,float,float,float]]
+            the x,y values of both endpoints of each line segment
+        :param rotate:
+        :param intersection_tolerance:
+
+        :return: [[[float]]]
+            the x,y values of the intersections for each line segment
+        """
+        xys = np.asarray(xys, dtype=np.float64).reshape(-1, 4)
+        x21 = xys[:, 0:1]
+        y21 = xys[:, 1:2]
+        x22 = xys[:, 2:3]
+        y22 = xys[:, 3:4]
+
+        a1 = self.edge_slope
+        c1 = self.edge_intercept
+        x11 = self.edge_start[:, 0]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            line_vertical = x22 - x21 == 0
+            a2 = np.where(line_vertical, np.inf, (y22 - y21) / (x22 - x21))
+            c2 = y21 - x21 * a2
+
+            # vertical edge, vertical line, parallel lines and the general case, see vector_intersect
+            rx = np.where(self.edge_vertical, x11, np.where(line_vertical, x21, (c2 - c1) / (a1 - a2)))
+            ry = np.where(
+                self.edge_vertical,
+                a2 * x11 + c2,
+                np.where(line_vertical, a1 * x21 + c1, a1 * (c2 - c1) / (a1 - a2) + c1),
+            )
+            found = np.where(
+                self.edge_vertical | line_vertical,
+                self.edge_vertical != line_vertical,
+                np.abs(a1 - a2) > intersection_tolerance,
+            )
+
+        # only keep the intersections that fall on the edge
+        found &= ~(
+            ((rx - self.edge_max[:, 0]) > intersection_tolerance)
+            | ((rx - self.edge_min[:, 0]) < -1 * intersection_tolerance)
+            | ((ry - self.edge_max[:, 1]) > intersection_tolerance)
+            | ((ry - self.edge_min[:, 1]) < -1 * intersection_tolerance)
+        )
+
+        r_a = [[] for _ in range(len(xys))]
+        for i, j in zip(*np.nonzero(found)):
+            r_a[i].append([float(rx[i, j]), float(ry[i, j])])
+
+        return [sort_intersections(r, rotate) for r in r_a]
 
     def point_intersect(self, xy):
         """
@@ -282,3 +312,52 @@ def point_polygon_check(contour, point):
                 inside = not inside
 
     return -1 if inside else 1
+
+
+def points_polygon_check(contour, points):
+    """
+    Vectorized form of point_polygon_check for an array of points
+
+    Classifies every point against the contour using the same on-edge tolerance
+    and crossing rules as point_polygon_check, looping over the contour edges
+    rather than over the points.
+
+    :param contour: list of tuples containing (x, y) contour boundary points
+    :param points: (N, 2) array-like of the (x, y) points to test
+
+    :returns: array of -1 if outside, 0 if on edge, 1 if inside
+    :rtype: numpy.ndarray
+    """
+
+    contour = np.asarray(contour, dtype=np.float64).reshape(-1, 2)
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    px = points[:, 0]
+    py = points[:, 1]
+
+    on_edge_tolerance = 0.001
+
+    on_edge = np.zeros(len(points), dtype=bool)
+    crossings = np.zeros(len(points), dtype=np.int64)
+
+    for idx in range(len(contour)):
+        v1x, v1y = contour[idx - 1]
+        v2x, v2y = contour[idx]
+
+        # on edge check, see point_polygon_check
+        test_dist = np.sqrt((v1x - px) ** 2 + (v1y - py) ** 2) + np.sqrt((v2x - px) ** 2 + (v2y - py) ** 2)
+        v12_dist = sqrt((v1x - v2x) ** 2 + (v1y - v2y) ** 2)
+        on_edge |= np.abs(test_dist - v12_dist) < on_edge_tolerance
+
+        # points inside vertical range, skipping the lower vertex of each edge
+        between = ((py >= v1y) & (py <= v2y)) | ((py <= v1y) & (py >= v2y))
+        if v2y >= v1y:
+            between &= py != v1y
+        if v1y >= v2y:
+            between &= py != v2y
+
+        # calc cross product `PA X PB`, P lays on left side of AB if c > 0
+        c = (v1x - px) * (v2y - py) - (v2x - px) * (v1y - py)
+        on_edge |= between & (c == 0)
+        crossings += between & ((v1y < v2y) == (c > 0))
+
+    return np.where(on_edge, 0, np.where(crossings % 2 == 1, 1, -1))
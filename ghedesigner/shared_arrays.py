@@ -0,0 +1,117 @@
+import weakref
+from copy import copy
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Tuple
+
+import numpy as np
+
+# blocks attached by this process, kept open for as long as the process uses their views
+_ATTACHED_BLOCKS = {}  # type: Dict[str, SharedMemory]
+
+
+class SharedArray:
+    """
+    Handle of a read-only array published to shared memory.
+
+    Handles pickle to a few bytes, so they can be sent to worker processes in place of the array.
+    Workers attach the array with ``attach``, which maps the shared block without copying it.
+    """
+
+    def __init__(self, name: str, shape: Tuple[int, ...], dtype: str):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+    def attach(self) -> np.ndarray:
+        """
+        :returns: a read-only view of the shared array
+        """
+
+        block = _ATTACHED_BLOCKS.get(self.name)
+        if block is None:
+            block = SharedMemory(name=self.name)
+            _ATTACHED_BLOCKS[self.name] = block
+        array = np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=block.buf)
+        array.flags.writeable = False
+        return array
+
+
+def _release_blocks(blocks: Dict[str, SharedMemory]) -> None:
+    for name, block in list(blocks.items()):
+        _ATTACHED_BLOCKS.pop(name, None)
+        try:
+            block.close()
+        except BufferError:
+            # views of the block are still alive in this process, the mapping goes away with them
+            pass
+        try:
+            block.unlink()
+        except FileNotFoundError:
+            pass
+        del blocks[name]
+
+
+class SharedArrayStore:
+    """
+    Publishes read-only arrays, such as ground loads, coordinates and g-function tables, to shared memory
+    once, so worker processes can attach them without each receiving a pickled copy.
+
+    The store owns the shared blocks, and unlinks them when it is closed, when it is garbage collected,
+    or at interpreter exit. Worker processes share the resource tracker of the process that started them,
+    which unlinks any block left behind if that process is killed.
+    """
+
+    def __init__(self):
+        self._blocks = {}  # type: Dict[str, SharedMemory]
+        self._finalizer = weakref.finalize(self, _release_blocks, self._blocks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def publish(self, array) -> SharedArray:
+        """
+        Copies an array to a new shared block.
+
+        :param array: array, or anything convertible to one.
+        :returns: the handle of the shared array
+        """
+
+        array = np.ascontiguousarray(array)
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._blocks[block.name] = block
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        shared[...] = array
+        del shared
+        return SharedArray(block.name, array.shape, array.dtype.str)
+
+    def share_attributes(self, obj, names):
+        """
+        :param obj: object holding arrays.
+        :param names: names of the array attributes to publish.
+        :returns: a shallow copy of the object with the array attributes replaced by their handles
+        """
+
+        shared = copy(obj)
+        for name in names:
+            setattr(shared, name, self.publish(getattr(obj, name)))
+        return shared
+
+    def close(self) -> None:
+        """Unlinks the shared blocks. Handles of the store can no longer be attached after this."""
+        self._finalizer()
+
+
+def attach_attributes(obj):
+    """
+    Attaches, in place, every attribute of an object that is the handle of a shared array.
+
+    :returns: the object
+    """
+
+    for name, value in vars(obj).items():
+        if isinstance(value, SharedArray):
+            setattr(obj, name, value.attach())
+    return obj
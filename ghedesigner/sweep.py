@@ -0,0 +1,319 @@
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from itertools import product
+from json import dumps, loads
+from pathlib import Path
+from sys import stderr
+from time import time
+from typing import Dict, List, Optional
+
+import click
+import numpy as np
+
+from ghedesigner import VERSION
+from ghedesigner.cache import ALL_CACHES, set_cache_size
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.shared_arrays import SharedArray, SharedArrayStore
+from ghedesigner.validate import validate_input_file
+
+SWEEP_STAGES = ['domain', 'g_function', 'sts', 'hybrid_load', 'search']
+
+# Stages of a design invalidated by each input, by input section or by section and key.
+# The g-functions use the mean inlet fluid temperature boundary condition, so they depend on
+# the borehole heat exchanger, and change with the flow rate, fluid, pipe and grout.
+INVALIDATED_STAGES = {
+    'fluid': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'grout': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'soil': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'pipe': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'borehole': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'simulation': ['hybrid_load', 'search'],
+    'loads': ['hybrid_load', 'search'],
+    'geometric_constraints': SWEEP_STAGES,
+    'geometric_constraints.max_height': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'geometric_constraints.min_height': ['search'],
+    'design': ['g_function', 'sts', 'hybrid_load', 'search'],
+    'design.max_eft': ['search'],
+    'design.min_eft': ['search'],
+}
+
+# Stages too expensive to recompute for every point. Points that share the inputs of these stages
+# are run one after the other in the same process, so they reuse the cached results.
+SHARED_STAGES = ['domain', 'g_function']
+
+
+def invalidated_stages(parameter: str) -> List[str]:
+    """
+    :param parameter: path of an input, as "section.key", or "section" to sweep several keys of a section together.
+    :returns: the stages of a design that are recomputed when the input changes
+    """
+
+    if parameter in INVALIDATED_STAGES:
+        return INVALIDATED_STAGES[parameter]
+    section = parameter.split('.')[0]
+    if section not in INVALIDATED_STAGES:
+        raise ValueError(f"Sweep parameter \"{parameter}\" is not supported.")
+    return INVALIDATED_STAGES[section]
+
+
+def check_grid(inputs: dict, grid: Dict[str, list]) -> None:
+    """
+    Checks that each swept parameter is an input of the base input data, and has at least one value.
+    """
+
+    if not grid:
+        raise ValueError("The sweep grid has no parameters.")
+    for parameter, values in grid.items():
+        invalidated_stages(parameter)
+        section, _, key = parameter.partition('.')
+        if section not in inputs or (key and key not in inputs[section]):
+            raise ValueError(f"Sweep parameter \"{parameter}\" is not in the base input data.")
+        if not isinstance(values, list) or len(values) == 0:
+            raise ValueError(f"Sweep parameter \"{parameter}\" must have a list of values.")
+        if not key and not all(isinstance(value, dict) for value in values):
+            raise ValueError(f"Values of sweep parameter \"{parameter}\" must update the input section.")
+
+
+def expand_grid(grid: Dict[str, list]) -> List[dict]:
+    """
+    :returns: every combination of the parameter values, with the last parameter varying fastest
+    """
+    parameters = list(grid)
+    return [dict(zip(parameters, values)) for values in product(*(grid[p] for p in parameters))]
+
+
+def apply_point(inputs: dict, point: dict) -> dict:
+    """
+    :returns: a copy of the input data with the parameter values of the sweep point
+    """
+
+    inputs = deepcopy(inputs)
+    for parameter, value in point.items():
+        section, _, key = parameter.partition('.')
+        if key:
+            inputs[section][key] = value
+        else:
+            inputs[section].update(value)
+    return inputs
+
+
+def flatten_point(point: dict) -> dict:
+    """
+    :returns: the parameter values of the sweep point, with section updates split into one value per key
+    """
+
+    values = {}
+    for parameter, value in point.items():
+        if isinstance(value, dict):
+            for key, key_value in value.items():
+                values[f"{parameter}.{key}"] = key_value
+        else:
+            values[parameter] = value
+    return values
+
+
+def group_points(points: List[dict]) -> List[List[int]]:
+    """
+    Groups the sweep points that share the inputs of the shared stages, and orders each group so that
+    consecutive points differ in as few stages as possible.
+
+    :returns: the indices of the points in each group
+    """
+
+    if not points:
+        return []
+
+    parameters = list(points[0])
+    shared = [p for p in parameters if any(s in SHARED_STAGES for s in invalidated_stages(p))]
+
+    # parameters invalidating more stages vary slowest within a group, and values keep their grid order
+    ordered = sorted(parameters, key=lambda p: -len(invalidated_stages(p)))
+    value_order = {p: {} for p in parameters}
+    for point in points:
+        for p in parameters:
+            value_order[p].setdefault(dumps(point[p], sort_keys=True), len(value_order[p]))
+
+    def point_order(idx: int) -> list:
+        return [value_order[p][dumps(points[idx][p], sort_keys=True)] for p in ordered]
+
+    groups = {}
+    for idx, point in enumerate(points):
+        groups.setdefault(dumps([point[p] for p in shared], sort_keys=True), []).append(idx)
+    return [sorted(indices, key=point_order) for indices in groups.values()]
+
+
+def share_inputs(inputs: dict, store: SharedArrayStore) -> dict:
+    """
+    :returns: a copy of the input data with the hourly ground loads published to shared memory
+    """
+
+    if not isinstance(inputs['loads'].get('ground_loads'), list):
+        return inputs
+    inputs = dict(inputs, loads=dict(inputs['loads']))
+    inputs['loads']['ground_loads'] = store.publish(np.asarray(inputs['loads']['ground_loads'], dtype=np.float64))
+    return inputs
+
+
+def attach_inputs(inputs: dict) -> dict:
+    """
+    Attaches, in place, the hourly ground loads of input data published to shared memory.
+
+    :returns: the input data
+    """
+
+    if isinstance(inputs['loads'].get('ground_loads'), SharedArray):
+        inputs['loads']['ground_loads'] = inputs['loads']['ground_loads'].attach()
+    return inputs
+
+
+def run_sweep_point(inputs: dict, input_directory: Optional[Path] = None) -> dict:
+    """
+    Finds the design of one sweep point.
+
+    :returns: the design results, or the failure message
+    """
+
+    results = {'status': 'Failed', 'number_of_boreholes': None, 'borehole_height': None, 'total_drilling': None,
+               'max_hp_entering_temp': None, 'min_hp_entering_temp': None, 'message': ''}
+    try:
+        manager = setup_manager_from_inputs(attach_inputs(inputs), input_directory)
+        if manager is None:
+            results['message'] = "Input data is not supported"
+        elif manager.find_design(throw=False) != 0:
+            results['message'] = "Design failed"
+        else:
+            ghe = manager._search.ghe
+            results.update({
+                'status': 'Success',
+                'number_of_boreholes': ghe.nbh,
+                'borehole_height': float(ghe.bhe.b.H),
+                'total_drilling': float(ghe.bhe.b.H * ghe.nbh),
+                'max_hp_entering_temp': float(max(ghe.hp_eft)),
+                'min_hp_entering_temp': float(min(ghe.hp_eft)),
+            })
+    except Exception as e:
+        results['message'] = f"{type(e).__name__}: {e}".replace("\n", " ")
+    return results
+
+
+def run_sweep_group(inputs: dict, points: List[dict], input_directory: Optional[Path] = None) -> List[dict]:
+    """
+    Runs a group of sweep points in order in this process, reusing the results of the stages
+    that the parameter changes between consecutive points do not invalidate.
+
+    :returns: the results row of each point
+    """
+
+    rows = []
+    previous = None
+    for point in points:
+        if previous is None:
+            stages = SWEEP_STAGES
+        else:
+            changed = [p for p in point if point[p] != previous[p]]
+            stages = [s for s in SWEEP_STAGES if any(s in invalidated_stages(p) for p in changed)]
+        start_time = time()
+        results = run_sweep_point(apply_point(inputs, point), input_directory)
+        rows.append({**flatten_point(point), **results, 'recomputed_stages': ';'.join(stages),
+                     'run_time': time() - start_time})
+        previous = point
+    return rows
+
+
+def run_sweep(inputs: dict, grid: Dict[str, list], input_directory: Optional[Path] = None, jobs: int = 1,
+              cache_size: int = 256) -> List[dict]:
+    """
+    Finds the design of each combination of the parameter values of a grid, around base input data.
+
+    Points that share the field domains and g-functions run in the same process, with the g-function,
+    STS g-function, load and domain caches enabled, so each point only recomputes the stages its
+    parameters invalidate. Changing the EFT limits, for example, only reruns the search, from the
+    g-functions, STS g-functions and hybrid loads cached by the previous point.
+
+    :param inputs: base input data, with the same structure as an input file.
+    :param grid: values of each parameter, by the path of the parameter in the input data, e.g. "design.max_eft".
+     A path of an input section, e.g. "pipe", takes dicts updating several keys of the section together.
+    :param input_directory: directory relative load file paths are resolved against.
+    :param jobs: number of groups of points to run in parallel.
+    :param cache_size: max number of entries in each cache of each process.
+    :returns: the results row of each point, in the order of the grid
+    """
+
+    check_grid(inputs, grid)
+    points = expand_grid(grid)
+    groups = group_points(points)
+    group_points_list = [[points[i] for i in indices] for indices in groups]
+
+    if jobs > 1 and len(groups) > 1:
+        # the ground loads are published once, rather than pickled with every group
+        with SharedArrayStore() as store, \
+                ProcessPoolExecutor(max_workers=min(jobs, len(groups)), initializer=set_cache_size,
+                                    initargs=(cache_size,)) as executor:
+            shared_inputs = share_inputs(inputs, store)
+            futures = [executor.submit(run_sweep_group, shared_inputs, group, input_directory)
+                       for group in group_points_list]
+            group_rows = [future.result() for future in futures]
+    else:
+        cache_sizes = [cache.maxsize for cache in ALL_CACHES]
+        set_cache_size(cache_size)
+        try:
+            group_rows = [run_sweep_group(inputs, group, input_directory) for group in group_points_list]
+        finally:
+            for cache, maxsize in zip(ALL_CACHES, cache_sizes):
+                cache.maxsize = maxsize
+
+    rows = [None] * len(points)
+    for indices, group in zip(groups, group_rows):
+        for idx, row in zip(indices, group):
+            rows[idx] = {'point': idx, **row}
+    return rows
+
+
+def write_sweep_results(rows: List[dict], output_file_path: Path) -> None:
+    """
+    Writes the sweep results table, as JSON if the file has a .json suffix, and as CSV otherwise.
+    """
+
+    output_file_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_file_path.suffix.lower() == '.json':
+        output_file_path.write_text(dumps(rows, indent=2))
+        return
+
+    with open(output_file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+@click.command(name="GHEDesignerSweep")
+@click.argument("input-file", type=click.Path(exists=True, dir_okay=False), required=True)
+@click.argument("grid-file", type=click.Path(exists=True, dir_okay=False), required=True)
+@click.argument("output-file", type=click.Path(dir_okay=False), required=True)
+@click.version_option(VERSION)
+@click.option("-j", "--jobs", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Number of groups of sweep points to run in parallel.")
+@click.option("--cache-size", default=256, show_default=True, type=click.IntRange(min=0),
+              help="Max number of entries in each g-function, STS, load and domain cache.")
+def run_sweep_from_cli(input_file, grid_file, output_file, jobs, cache_size):
+    input_file_path = Path(input_file).resolve()
+    if validate_input_file(input_file_path) != 0:
+        print("Schema validation error. See previous error messages for details.", file=stderr)
+        return 1
+
+    inputs = loads(input_file_path.read_text())
+    grid = loads(Path(grid_file).read_text())
+    try:
+        rows = run_sweep(inputs, grid, input_file_path.parent, jobs, cache_size)
+    except ValueError as e:
+        print(e, file=stderr)
+        return 1
+
+    write_sweep_results(rows, Path(output_file).resolve())
+    num_failed = sum(1 for row in rows if row['status'] != 'Success')
+    print(f"Sweep complete: {len(rows) - num_failed} succeeded, {num_failed} failed.")
+    return 0 if num_failed == 0 else 1
+
+
+if __name__ == "__main__":
+    run_sweep_from_cli()
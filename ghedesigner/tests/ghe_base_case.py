@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import List, Optional
 from unittest import TestCase
 
+from ghedesigner.tests.shared_inputs import DEMOS_DIRECTORY, TEST_DATA_DIRECTORY, TESTS_DIRECTORY, read_test_loads
+
 LOG_FILE: Optional[Path] = None
 
 
@@ -35,13 +37,12 @@ class GHEBaseTest(TestCase):
         self.log("Tests Initialized")
 
     def setUp(self) -> None:
-        cur_file = Path(__file__).resolve()
-        self.tests_directory = cur_file.parent
-        self.test_data_directory = self.tests_directory / 'test_data'
+        self.tests_directory = TESTS_DIRECTORY
+        self.test_data_directory = TEST_DATA_DIRECTORY
         self.project_root_directory = self.tests_directory.parent
         self.test_outputs_directory = self.tests_directory / 'test_outputs'
         self.test_outputs_directory.mkdir(exist_ok=True)
-        self.demos_path = Path(__file__).parent.parent.parent / "demos"
+        self.demos_path = DEMOS_DIRECTORY
         self.demo_output_parent_dir = Path(__file__).parent.parent.parent / "demo_outputs"
 
     # noinspection PyMethodMayBeStatic
@@ -56,15 +57,11 @@ class GHEBaseTest(TestCase):
 
     def get_atlanta_loads(self) -> List[float]:
         # read in the csv file and convert the loads to a list of length 8760
-        glhe_json_data = self.test_data_directory / 'Atlanta_Office_Building_Loads.csv'
-        raw_lines = glhe_json_data.read_text().split('\n')
-        return [float(x) for x in raw_lines[1:] if x.strip() != '']
+        return read_test_loads('Atlanta_Office_Building_Loads.csv')
 
     def get_multiyear_loads(self) -> List[float]:
         # read in the csv file and convert the loads to a list of length 8760
-        glhe_json_data = self.test_data_directory / 'Multiyear_Loading_Example.csv'
-        raw_lines = glhe_json_data.read_text().split('\n')
-        return [float(x) for x in raw_lines[1:] if x.strip() != '']
+        return read_test_loads('Multiyear_Loading_Example.csv')
 
     @staticmethod
     def rel_error_within_tol(test: float, base: float, tol: float) -> bool:
@@ -0,0 +1,56 @@
+from pathlib import Path
+from typing import List, NamedTuple
+
+import numpy as np
+
+from ghedesigner.borehole import GHEBorehole
+from ghedesigner.media import GHEFluid, Grout, Pipe, Soil
+from ghedesigner.simulation import SimulationParameters
+from ghedesigner.utilities import eskilson_log_times
+
+TESTS_DIRECTORY = Path(__file__).resolve().parent
+TEST_DATA_DIRECTORY = TESTS_DIRECTORY / 'test_data'
+DEMOS_DIRECTORY = TESTS_DIRECTORY.parent.parent / 'demos'
+
+
+def read_test_loads(file_name: str) -> List[float]:
+    # read in a csv file of the test data, with a header line and one load per line
+    raw_lines = (TEST_DATA_DIRECTORY / file_name).read_text().split('\n')
+    return [float(x) for x in raw_lines[1:] if x.strip() != '']
+
+
+class SingleUTubeInputs(NamedTuple):
+    fluid: GHEFluid
+    grout: Grout
+    soil: Soil
+    pipe: Pipe
+    borehole: GHEBorehole
+    b: float
+    m_flow_borehole: float
+    log_time: list
+    sim_params: SimulationParameters
+    hourly_loads: np.ndarray
+
+
+def single_u_tube_inputs() -> SingleUTubeInputs:
+    """
+    Inputs of a single u-tube borehole field with the Atlanta office building loads, used by tests and benchmarks.
+    """
+
+    fluid = GHEFluid(fluid_str="Water", percent=0.0)
+    r_out = 0.02667 / 2.0
+    r_in = 0.0216 / 2.0
+    shank_spacing = 0.0323
+    pipe = Pipe(Pipe.place_pipes(shank_spacing, r_out, 1), r_in, r_out, shank_spacing, 1.0e-6, 0.4, 1542000.0)
+    return SingleUTubeInputs(
+        fluid=fluid,
+        grout=Grout(1.0, 3901000.0),
+        soil=Soil(2.0, 2343493.0, 18.3),
+        pipe=pipe,
+        borehole=GHEBorehole(100.0, 2.0, 0.075, x=0.0, y=0.0),
+        b=5.0,
+        m_flow_borehole=0.2 / 1000.0 * fluid.rho,
+        log_time=eskilson_log_times(),
+        sim_params=SimulationParameters(1, 240, 35, 5, 384, 24),
+        hourly_loads=np.array(read_test_loads('Atlanta_Office_Building_Loads.csv')),
+    )
@@ -0,0 +1,96 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from json import loads
+from threading import Event
+
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.progress import DesignCancelled, ProgressEvent, progress_reporting, report_progress
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestAsyncDesign(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        self.inputs = loads(input_file.read_text())
+        self.manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+
+    def test_progress_reporting(self):
+        events = []
+        with progress_reporting(events.append):
+            report_progress('search_iteration', iteration=1)
+        report_progress('search_iteration', iteration=2)
+        self.assertEqual(len(events), 1)
+        self.assertIsInstance(events[0], ProgressEvent)
+        self.assertEqual(events[0].as_dict()['data'], {'iteration': 1})
+
+    def test_design_events(self):
+        async def collect():
+            return [event async for event in self.manager.iter_design_events()]
+
+        events = asyncio.run(collect())
+        kinds = {event.kind for event in events}
+        self.assertTrue({'candidate_evaluated', 'g_function_solved', 'sizing_iteration'} <= kinds)
+        self.assertEqual(events[-1].kind, 'design_finished')
+        self.assertEqual(events[-1].data['number_of_boreholes'], self.manager._search.ghe.nbh)
+
+    def test_cancel_design(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        events = []
+
+        async def cancel_after_first_candidate():
+            first_candidate = asyncio.Event()
+
+            def on_progress(event):
+                events.append(event)
+                if event.kind == 'candidate_evaluated':
+                    first_candidate.set()
+
+            task = asyncio.ensure_future(self.manager.find_design_async(on_progress, executor))
+            await first_candidate.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_after_first_candidate())
+        # the design stops at its next progress event instead of running to the end
+        future = executor.submit(lambda: None)
+        executor.shutdown(wait=True)
+        self.assertTrue(future.done())
+        self.assertNotIn('design_finished', [event.kind for event in events])
+        self.assertIsNone(self.manager._search)
+
+    def test_cancelled_thread(self):
+        cancel_event = Event()
+        cancel_event.set()
+        with progress_reporting(None, cancel_event):
+            with self.assertRaises(DesignCancelled):
+                report_progress('search_iteration', iteration=1)
+
+    def test_cancel_final_sizing(self):
+        sizing_events = []
+        with progress_reporting(sizing_events.append):
+            self.manager.find_design()
+        num_sizing_iterations = [event.kind for event in sizing_events].count('sizing_iteration')
+
+        # cancel at the last sizing iteration, which belongs to the sizing of the selected field
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        cancel_event = Event()
+        sizing_iterations = []
+
+        def on_progress(event):
+            if event.kind == 'sizing_iteration':
+                sizing_iterations.append(event)
+                if len(sizing_iterations) == num_sizing_iterations:
+                    cancel_event.set()
+
+        with progress_reporting(on_progress, cancel_event):
+            with self.assertRaises(DesignCancelled):
+                manager.find_design()
+        self.assertIsNone(manager._search)
+
+    def test_process_executor(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            with self.assertRaises(TypeError):
+                asyncio.run(self.manager.find_design_async(executor=executor))
@@ -0,0 +1,56 @@
+from json import loads
+
+import numpy as np
+
+from ghedesigner.enums import TimestepType
+from ghedesigner.ground_heat_exchangers import GHE
+from ghedesigner.manager import GHEManager, setup_manager_from_inputs
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestLoadCapacity(GHEBaseTest):
+
+    def test_before_find_design(self):
+        with self.assertRaises(ValueError):
+            GHEManager().get_load_capacity()
+        self.assertIsNone(GHEManager().get_load_capacity(throw=False))
+
+    def test_load_capacity(self):
+        inputs = loads((self.demos_path / 'find_design_rectangle_single_u_tube.json').read_text())
+        manager = setup_manager_from_inputs(inputs, self.demos_path)
+        manager.find_design()
+        capacity = manager.get_load_capacity()
+        self.assertIs(manager.get_load_capacity(), capacity)
+
+        # the design is sized for the max fluid temperature, so the cooling loads cannot grow much
+        results = capacity.as_dict()
+        self.assertAlmostEqual(results['cooling_multiplier'], 1.0, delta=0.01)
+        self.assertGreater(results['heating_multiplier'], 1.0)
+        self.assertAlmostEqual(capacity.entering_temperature_range(results['cooling_multiplier'], 1.0)[0],
+                               manager._simulation_parameters.max_EFT_allowable)
+        self.assertAlmostEqual(capacity.entering_temperature_range(1.0, results['heating_multiplier'])[1],
+                               manager._simulation_parameters.min_EFT_allowable)
+
+        # matches a full simulation of the scaled loads
+        ghe = manager._search.ghe
+        raw_loads = np.asarray(ghe.hourly_extraction_ground_loads)
+        scaled_loads = np.where(raw_loads >= 0.0, 0.7 * raw_loads, 1.3 * raw_loads)
+        scaled_ghe = GHE(ghe.V_flow_system, ghe.B_spacing, ghe.bhe_type, ghe.bhe.fluid, ghe.bhe.b, ghe.bhe.pipe,
+                         ghe.bhe.grout, ghe.bhe.soil, ghe.gFunction, ghe.sim_params, scaled_loads,
+                         load_years=ghe.hybrid_load.years)
+        max_eft, min_eft = scaled_ghe.simulate(TimestepType.HYBRID)
+        self.assertAlmostEqual(capacity.entering_temperature_range(1.3, 0.7)[0], max_eft, delta=1.0e-6)
+        self.assertAlmostEqual(capacity.entering_temperature_range(1.3, 0.7)[1], min_eft, delta=1.0e-6)
+
+    def test_unbounded(self):
+        inputs = loads((self.demos_path / 'find_design_rectangle_single_u_tube.json').read_text())
+        manager = setup_manager_from_inputs(inputs, self.demos_path)
+        manager.find_design()
+        capacity = manager.get_load_capacity()
+        # without cooling loads, the heating loads alone keep the temperatures within limits
+        capacity.cooling_response = np.zeros_like(capacity.cooling_response)
+        self.assertIsNone(capacity.max_multiplier(cooling=True, heating=False))
+
+        # a temperature out of limits that the multiplied loads do not change
+        capacity.heating_response = np.full_like(capacity.heating_response, 20.0)
+        self.assertEqual(capacity.max_multiplier(cooling=True, heating=False), 0.0)
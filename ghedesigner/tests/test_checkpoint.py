@@ -0,0 +1,75 @@
+import shutil
+from json import loads
+
+from click.testing import CliRunner
+
+from ghedesigner.checkpoint import SearchCheckpoint, search_inputs_key
+from ghedesigner.manager import run_manager_from_cli, setup_manager_from_inputs
+from ghedesigner.search_budget import SearchBudget
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestCheckpoint(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.input_file = self.demos_path / 'find_design_bi_zoned_rectangle_single_u_tube.json'
+        self.inputs = loads(self.input_file.read_text())
+        # each test has its own directory, so the tests can run in parallel
+        output_dir = self.test_outputs_directory / 'checkpoint' / self._testMethodName
+        self.checkpoint_path = output_dir / 'SearchCheckpoint.json'
+        shutil.rmtree(self.checkpoint_path.parent, ignore_errors=True)
+
+    def test_resume_search(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        design = manager._design
+
+        # an interrupted search leaves its completed evaluations in the checkpoint
+        interrupted = design.find_design(budget=SearchBudget(max_evaluations=5),
+                                         checkpoint=SearchCheckpoint(self.checkpoint_path))
+        self.assertTrue(interrupted.budget_limited)
+        data = loads(self.checkpoint_path.read_text())
+        self.assertEqual(len(data['evaluations']), 5)
+        self.assertIn('bracket', data['state'])
+        self.assertIn('calculated_temperatures', data['state'])
+
+        # the resumed search reuses them, and finds the same design as an uninterrupted search
+        checkpoint = SearchCheckpoint(self.checkpoint_path, resume=True)
+        resumed = design.find_design(checkpoint=checkpoint)
+        self.assertFalse(resumed.budget_limited)
+        self.assertEqual(checkpoint.resumed_evaluations, 5)
+        search = design.find_design()
+        self.assertEqual(resumed.selected_coordinates.tolist(), search.selected_coordinates.tolist())
+
+        # a finished search is replayed without evaluating any candidate again
+        checkpoint = SearchCheckpoint(self.checkpoint_path, resume=True)
+        replayed = design.find_design(budget=SearchBudget(max_evaluations=0), checkpoint=checkpoint)
+        self.assertFalse(replayed.budget_limited)
+        self.assertEqual(replayed.selected_coordinates.tolist(), search.selected_coordinates.tolist())
+
+    def test_checkpoint_of_other_design(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        manager._design.find_design(budget=SearchBudget(max_evaluations=3),
+                                    checkpoint=SearchCheckpoint(self.checkpoint_path))
+
+        self.inputs['design']['max_eft'] -= 1.0
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        checkpoint = SearchCheckpoint(self.checkpoint_path, resume=True)
+        manager._design.find_design(budget=SearchBudget(max_evaluations=3), checkpoint=checkpoint)
+        self.assertEqual(checkpoint.resumed_evaluations, 0)
+
+    def test_inputs_key_of_load_years(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        search = manager._design.find_design(budget=SearchBudget(max_evaluations=3))
+        key = search_inputs_key(search)
+        # the same loads give other hybrid loads in a leap year
+        search.load_years = [2020]
+        self.assertNotEqual(search_inputs_key(search), key)
+
+    def test_cli_resume(self):
+        output_dir = self.checkpoint_path.parent
+        result = CliRunner().invoke(run_manager_from_cli, [str(self.input_file), str(output_dir), '--resume'])
+        self.assertIsNone(result.exception)
+        self.assertTrue((output_dir / 'SimulationSummary.json').exists())
+        # the checkpoint is removed once the design is found
+        self.assertFalse(self.checkpoint_path.exists())
@@ -0,0 +1,32 @@
+import csv
+import shutil
+
+from click.testing import CliRunner
+
+from ghedesigner.manager import run_manager_from_cli
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestCLIBatch(GHEBaseTest):
+
+    def test_batch_directory(self):
+        input_dir = self.test_outputs_directory / 'batch_inputs'
+        output_dir = self.test_outputs_directory / 'batch_outputs'
+        shutil.rmtree(input_dir, ignore_errors=True)
+        shutil.rmtree(output_dir, ignore_errors=True)
+        input_dir.mkdir()
+
+        shutil.copy(self.demos_path / 'input_bldg0000056_odd_loads.json', input_dir / 'good.json')
+        (input_dir / 'bad.json').write_text('{"version": "0.5"}')
+
+        runner = CliRunner()
+        result = runner.invoke(run_manager_from_cli, [str(input_dir), str(output_dir), '--jobs', '2'])
+        # the failed job makes the batch exit nonzero
+        self.assertEqual(result.exit_code, 1)
+
+        # the failed job is reported without stopping the successful one
+        with open(output_dir / 'BatchStatus.csv') as f:
+            rows = {row['Input File']: row for row in csv.DictReader(f)}
+        self.assertEqual(rows[str(input_dir / 'good.json')]['Status'], 'Success')
+        self.assertEqual(rows[str(input_dir / 'bad.json')]['Status'], 'Failed')
+        self.assertTrue((output_dir / 'good' / 'SimulationSummary.json').exists())
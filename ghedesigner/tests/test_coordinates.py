@@ -1,6 +1,8 @@
 import unittest
 
-from ghedesigner.coordinates import open_rectangle, rectangle
+import numpy as np
+
+from ghedesigner.coordinates import open_rectangle, rectangle, transpose_coordinates, zoned_rectangle
 
 
 class TestCoordinates(unittest.TestCase):
@@ -20,5 +22,19 @@ class TestCoordinates(unittest.TestCase):
         self.assertEqual(coords[-1][0], 3)
         self.assertEqual(coords[-1][1], 3)
 
+    def test_zoned_rectangle(self):
+        coords = zoned_rectangle(5, 5, 1, 1, 2, 2)
+        self.assertEqual(coords.shape, (20, 2))
+        self.assertEqual(coords.dtype, np.float64)
+        self.assertEqual(coords[-1][0], 8 / 3)
+        self.assertEqual(coords[-1][1], 8 / 3)
+
+    def test_transpose_coordinates(self):
+        coords = rectangle(2, 3, 1, 2)
+        coords_transposed = transpose_coordinates(coords)
+        self.assertTrue(np.shares_memory(coords, coords_transposed))
+        self.assertEqual(coords_transposed[-1][0], 4)
+        self.assertEqual(coords_transposed[-1][1], 1)
+
     # def test_c_shape(self):
     #     coords = c_shape(6, 6, 1, 1, 6)
@@ -0,0 +1,102 @@
+from json import loads
+
+from ghedesigner.borehole import GHEBorehole
+from ghedesigner.cache import G_FUNCTION_CACHE, cache_key, clear_caches, set_cache_size
+from ghedesigner.design_state import BoreholeState, DesignState, GroutState
+from ghedesigner.enums import BHPipeType, FlowConfigType, TimestepType
+from ghedesigner.gfunction import calc_g_func_for_design_state, calc_g_func_for_multiple_lengths
+from ghedesigner.ground_heat_exchangers import GHE
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.media import GHEFluid, Grout, Pipe, Soil
+from ghedesigner.simulation import SimulationParameters
+from ghedesigner.utilities import eskilson_log_times
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestDesignState(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.borehole = GHEBorehole(100.0, 2.0, 0.07, 0.0, 0.0)
+        pos = Pipe.place_pipes(0.0323, 0.0133, 1)
+        self.pipe = Pipe(pos, 0.0108, 0.0133, 0.0323, 1.0e-6, 0.4, 1542000.0)
+        self.grout = Grout(1.0, 3901000.0)
+        self.soil = Soil(2.0, 2343493.0, 18.3)
+        self.fluid = GHEFluid('water', 0.0, 20.0)
+
+    def make_state(self) -> DesignState:
+        return DesignState.from_media(BHPipeType.SINGLEUTUBE, self.borehole, self.pipe, self.grout, self.soil,
+                                      self.fluid, 0.2, FlowConfigType.BOREHOLE)
+
+    def test_value_semantics(self):
+        state = self.make_state()
+        self.assertEqual(state, self.make_state())
+        self.assertEqual(hash(state), hash(self.make_state()))
+        self.assertEqual(cache_key(state), cache_key(self.make_state()))
+
+        # updates return a new state
+        taller = state.with_height(150.0)
+        self.assertEqual(state.borehole.height, 100.0)
+        self.assertEqual(taller.borehole.height, 150.0)
+        self.assertNotEqual(state, taller)
+        self.assertNotEqual(state, state.replace(grout=GroutState(1.5, 3901000.0)))
+        with self.assertRaises(AttributeError):
+            state.borehole.height = 120.0
+
+    def test_to_media(self):
+        state = self.make_state()
+        borehole, pipe, grout, soil, fluid = state.to_media()
+        self.assertIsNot(borehole, self.borehole)
+        self.assertEqual(BoreholeState.from_borehole(borehole), state.borehole)
+        self.assertEqual(pipe.pos, self.pipe.pos)
+        self.assertEqual(pipe.n_pipes, self.pipe.n_pipes)
+        self.assertEqual(grout.k, self.grout.k)
+        self.assertEqual(soil.ugt, self.soil.ugt)
+        self.assertAlmostEqual(fluid.rho, self.fluid.rho)
+
+        # the media built from a state are not shared
+        borehole.H = 50.0
+        self.assertEqual(state.to_media()[0].H, 100.0)
+
+    def test_search_does_not_mutate_inputs(self):
+        input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        manager = setup_manager_from_inputs(loads(input_file.read_text()), self.demos_path)
+        height = manager._borehole.H
+        manager.find_design()
+        self.assertEqual(manager._borehole.H, height)
+        self.assertIsNot(manager._search.ghe.bhe.b, manager._borehole)
+        self.assertEqual(manager._search.design_state.borehole.height, height)
+
+    def test_g_function_cache_key(self):
+        coordinates = [(0.0, 0.0), (5.0, 0.0), (0.0, 5.0), (5.0, 5.0)]
+        log_time = eskilson_log_times()
+        set_cache_size(8)
+        try:
+            calc_g_func_for_multiple_lengths(5.0, [100.0], 0.07, 2.0, 0.2, BHPipeType.SINGLEUTUBE, log_time,
+                                             coordinates, self.fluid, self.pipe, self.grout, self.soil)
+            # equal inputs from other objects, or from a design state, share the cache entry
+            _, pipe, grout, soil, fluid = self.make_state().to_media()
+            calc_g_func_for_multiple_lengths(5.0, [100.0], 0.07, 2.0, 0.2, BHPipeType.SINGLEUTUBE, log_time,
+                                             coordinates, fluid, pipe, grout, soil)
+            calc_g_func_for_design_state(5.0, [100.0], self.make_state(), 0.2, log_time, coordinates)
+            self.assertEqual(G_FUNCTION_CACHE.misses, 1)
+            self.assertEqual(G_FUNCTION_CACHE.hits, 2)
+        finally:
+            set_cache_size(0)
+            clear_caches()
+
+    def test_size_from_design_state(self):
+        coordinates = [(0.0, 0.0), (5.0, 0.0), (0.0, 5.0), (5.0, 5.0)]
+        sim_params = SimulationParameters(1, 240, 35.0, 5.0, 135.0, 60.0)
+        state = self.make_state()
+        g_function = calc_g_func_for_design_state(5.0, [60.0, 97.5, 135.0], state, 0.2 * self.fluid.rho / 1000.0,
+                                                  eskilson_log_times(), coordinates)
+        ghe = GHE.from_design_state(state, 5.0, g_function, sim_params, self.get_atlanta_loads())
+        self.assertAlmostEqual(ghe.V_flow_system, 0.8)
+        self.assertEqual(ghe.design_state, state)
+
+        # sizing moves the GHE through new states, without changing the state it was built from
+        ghe.size(TimestepType.HYBRID)
+        self.assertEqual(state.borehole.height, 100.0)
+        self.assertNotEqual(ghe.design_state.borehole.height, 100.0)
+        self.assertEqual(ghe.bhe.b.H, ghe.design_state.borehole.height)
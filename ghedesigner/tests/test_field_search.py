@@ -0,0 +1,36 @@
+from json import loads
+
+from ghedesigner.enums import FieldSearchType
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestFieldSearch(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        self.inputs = loads(input_file.read_text())
+
+    def test_secant_search(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        bisection = manager._design.find_design(field_search=FieldSearchType.BISECTION)
+        secant = manager._design.find_design(field_search=FieldSearchType.SECANT)
+
+        # the secant search selects the same field, and the fields on both sides of it are evaluated
+        self.assertEqual(secant.selection_key, bisection.selection_key)
+        self.assertEqual(secant.selected_coordinates.tolist(), bisection.selected_coordinates.tolist())
+        self.assertLessEqual(secant.calculated_temperatures[secant.selection_key], 0.0)
+        self.assertGreater(secant.calculated_temperatures[secant.selection_key - 1], 0.0)
+        self.assertLess(secant.field_evaluations, bisection.field_evaluations)
+
+    def test_manager_field_search(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        with self.assertRaises(ValueError):
+            manager.find_design(field_search="golden")
+
+        manager.find_design(field_search="secant")
+        manager.prepare_results("Project", "Notes", "Author", "Iteration")
+        field_search = manager.results.output_dict['field_search']
+        self.assertEqual(field_search['method'], 'secant')
+        self.assertEqual(field_search['field_evaluations'], manager._search.field_evaluations)
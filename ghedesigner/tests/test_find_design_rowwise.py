@@ -96,3 +96,28 @@ class TestFindRowWiseDesign(GHEBaseTest):
         self.assertAlmostEqual(197.60, u_tube_height, delta=0.01)
         nbh = ghe.results.borehole_location_data_rows  # includes a header row
         self.assertEqual(38 + 1, len(nbh))
+
+    def test_find_row_wise_design_parallel_rotations(self):
+        ghe = GHEManager()
+        ghe.set_single_u_tube_pipe(
+            inner_diameter=0.0216, outer_diameter=0.02667, shank_spacing=0.0323,
+            roughness=1.0e-6, conductivity=0.4, rho_cp=1542000.0)
+        ghe.set_soil(conductivity=2.0, rho_cp=2343493.0, undisturbed_temp=18.3)
+        ghe.set_grout(conductivity=1.0, rho_cp=3901000.0)
+        ghe.set_fluid()
+        ghe.set_borehole(height=96.0, buried_depth=2.0, diameter=0.150)
+        ghe.set_simulation_parameters(num_months=240, max_eft=35, min_eft=5, max_height=200, min_height=60)
+        ghe.set_ground_loads_from_hourly_list(self.get_atlanta_loads())
+        ghe.set_geometry_constraints_rowwise(perimeter_spacing_ratio=None,
+                                             min_spacing=10.0, max_spacing=20.0, spacing_step=0.1,
+                                             min_rotation=-90.0, max_rotation=0.0, rotate_step=0.5,
+                                             property_boundary=prop_boundary, no_go_boundaries=no_go_zones,
+                                             rotate_workers=2)
+        ghe.set_design(flow_rate=0.2, flow_type_str="borehole")
+        ghe.find_design()
+        ghe.prepare_results("Project Name", "Notes", "Author", "Iteration Name")
+        # the parallel rotation sweeps find the same fields as the serial ones
+        u_tube_height = ghe.results.output_dict['ghe_system']['active_borehole_length']['value']
+        self.assertAlmostEqual(199.53, u_tube_height, delta=0.01)
+        nbh = ghe.results.borehole_location_data_rows  # includes a header row
+        self.assertEqual(38 + 1, len(nbh))
@@ -0,0 +1,72 @@
+import shutil
+import warnings
+
+import numpy as np
+from click.testing import CliRunner
+
+from ghedesigner.coordinates import rectangle
+from ghedesigner.enums import BHPipeType
+from ghedesigner.gfunction import GFunctionMemoryError, budget_settings, calculate_g_function, \
+    estimate_g_function_memory, set_g_function_memory_budget
+from ghedesigner.manager import run_manager_from_cli
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+from ghedesigner.tests.shared_inputs import single_u_tube_inputs
+
+
+class TestGFunctionMemoryBudget(GHEBaseTest):
+
+    def tearDown(self) -> None:
+        set_g_function_memory_budget(None)
+
+    def g_function_args(self, nx: int, ny: int) -> tuple:
+        f = single_u_tube_inputs()
+        alpha = f.soil.k / f.soil.rhoCp
+        time_values = np.exp(f.log_time) * f.borehole.H ** 2 / (9.0 * alpha)
+        return (f.m_flow_borehole, BHPipeType.SINGLEUTUBE, time_values, rectangle(nx, ny, f.b, f.b), f.borehole,
+                f.fluid, f.pipe, f.grout, f.soil)
+
+    def test_estimate(self):
+        # the similarities solve holds the response factors of all pairs of segments
+        self.assertAlmostEqual(estimate_g_function_memory(100, 800, 27, 'similarities'), 287.7, delta=0.1)
+        self.assertGreater(estimate_g_function_memory(1000, 0, 27, 'equivalent'),
+                           estimate_g_function_memory(100, 0, 27, 'equivalent'))
+
+    def test_budget_settings(self):
+        settings = budget_settings('similarities', 8, fixed_segments=False)
+        self.assertEqual(settings[0], ('similarities', 8, None))
+        self.assertEqual(settings[1], ('equivalent', 8, None))
+        self.assertEqual(settings[-1], ('equivalent', 4, 0))
+        self.assertEqual(budget_settings('equivalent', 8, fixed_segments=True),
+                         [('equivalent', 8, None), ('equivalent', 8, 0)])
+
+    def test_within_budget(self):
+        args = self.g_function_args(5, 5)
+        g_values = calculate_g_function(*args).gFunc
+        np.testing.assert_allclose(calculate_g_function(*args, memory_budget=1000.0).gFunc, g_values)
+
+        # the similarities solve does not fit, so the equivalent solver is used
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            g_budget = calculate_g_function(*args, solver='similarities', memory_budget=5.0).gFunc
+        np.testing.assert_allclose(g_budget, g_values)
+        self.assertIn('equivalent solver', str(caught[-1].message))
+
+    def test_over_budget(self):
+        args = self.g_function_args(10, 10)
+        with self.assertRaises(GFunctionMemoryError) as context:
+            calculate_g_function(*args, memory_budget=1.0)
+        self.assertIn('over the 1 MB memory budget', str(context.exception))
+
+        set_g_function_memory_budget(1.0)
+        with self.assertRaises(GFunctionMemoryError):
+            calculate_g_function(*args)
+
+    def test_cli_over_budget(self):
+        output_dir = self.test_outputs_directory / 'memory_budget_outputs'
+        shutil.rmtree(output_dir, ignore_errors=True)
+        input_file = self.demos_path / 'find_design_rectangle_single_u_tube.json'
+        result = CliRunner().invoke(run_manager_from_cli, [str(input_file), str(output_dir), '--memory-budget', '0.01'],
+                                    standalone_mode=False)
+        self.assertIsNone(result.exception)
+        self.assertEqual(result.return_value, 1)
+        self.assertFalse((output_dir / 'SimulationSummary.json').exists())
@@ -0,0 +1,62 @@
+from json import loads
+
+import numpy as np
+
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.search_routines import Bisection1D
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestLengthBound(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        self.inputs = loads(input_file.read_text())
+
+    def find_design(self, prune: bool = True):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        if prune:
+            return manager._design.find_design()
+        first_candidate_index = Bisection1D.first_candidate_index
+        Bisection1D.first_candidate_index = lambda search: 0
+        try:
+            return manager._design.find_design()
+        finally:
+            Bisection1D.first_candidate_index = first_candidate_index
+
+    def test_pruned_fields(self):
+        search = self.find_design()
+
+        # the smallest fields are ruled out without evaluating them, and the selected field is not one of them
+        self.assertGreater(search.pruned_fields, 0)
+        self.assertGreaterEqual(search.selection_key, search.pruned_fields)
+        self.assertNotIn(0, search.calculated_temperatures)
+
+        # the largest pruned field is evaluated, and is indeed undersized
+        self.assertGreater(search.calculated_temperatures[search.pruned_fields - 1], 0.0)
+
+    def test_seasonal_loads(self):
+        # most of the heat is rejected in the last months of each year
+        ground_loads = np.array(self.inputs['loads']['ground_loads'], dtype=np.float64)
+        ground_loads[:6570] *= 0.25
+        ground_loads[6570:] *= 2.5
+        self.inputs['loads']['ground_loads'] = ground_loads.tolist()
+
+        search = self.find_design()
+        unpruned = self.find_design(prune=False)
+        self.assertGreater(search.pruned_fields, 0)
+        self.assertEqual(unpruned.pruned_fields, 0)
+        self.assertEqual(search.selection_key, unpruned.selection_key)
+        self.assertEqual(search.selected_coordinates.tolist(), unpruned.selected_coordinates.tolist())
+
+    def test_bound_ruling_out_a_feasible_field(self):
+        # a bound ruling out all but the largest field is caught by evaluating the largest field it rules out
+        first_candidate_index = Bisection1D.first_candidate_index
+        Bisection1D.first_candidate_index = lambda search: len(search.coordinates_domain) - 1
+        try:
+            search = self.find_design()
+        finally:
+            Bisection1D.first_candidate_index = first_candidate_index
+        self.assertEqual(search.pruned_fields, 0)
+        self.assertEqual(search.selected_coordinates.tolist(), self.find_design().selected_coordinates.tolist())
@@ -0,0 +1,83 @@
+import shutil
+from json import dumps, loads
+
+import numpy as np
+
+from ghedesigner.manager import GHEManager, run_manager_from_cli_worker
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+from ghedesigner.utilities import read_hourly_loads
+from ghedesigner.validate import validate_input_file
+
+
+class TestLoadFiles(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.input_dir = self.test_outputs_directory / 'load_file_inputs'
+        shutil.rmtree(self.input_dir, ignore_errors=True)
+        self.input_dir.mkdir()
+        self.inputs = loads((self.demos_path / 'find_design_rectangle_single_u_tube.json').read_text())
+        self.ground_loads = self.inputs['loads']['ground_loads']
+
+    def test_read_hourly_loads(self):
+        np.save(self.input_dir / 'loads.npy', np.array(self.ground_loads, dtype=np.float32))
+        csv_rows = ''.join(f'{hour},{load!r}\n' for hour, load in enumerate(self.ground_loads))
+        (self.input_dir / 'loads.csv').write_text('Hour,Load (W)\n' + csv_rows)
+        (self.input_dir / 'loads_no_header.csv').write_text(''.join(f'{load!r}\n' for load in self.ground_loads))
+
+        for file_name in ['loads.csv', 'loads_no_header.csv']:
+            loads_arr = read_hourly_loads(self.input_dir / file_name)
+            self.assertEqual(loads_arr.dtype, np.float64)
+            self.assertTrue(np.array_equal(loads_arr, self.ground_loads))
+
+        # other types are converted to float64
+        loads_arr = read_hourly_loads(self.input_dir / 'loads.npy')
+        self.assertEqual(loads_arr.dtype, np.float64)
+        self.assertTrue(np.allclose(loads_arr, self.ground_loads, rtol=1e-6))
+
+    def test_npy_memory_mapped(self):
+        np.save(self.input_dir / 'loads.npy', np.array(self.ground_loads))
+        loads_arr = read_hourly_loads(self.input_dir / 'loads.npy')
+        self.assertIsInstance(loads_arr.base, np.memmap)
+
+    def test_design_from_load_file(self):
+        np.save(self.input_dir / 'loads.npy', np.array(self.ground_loads))
+        self.inputs['loads'] = {'ground_loads_file': 'loads.npy'}
+        input_file_path = self.input_dir / 'input.json'
+        input_file_path.write_text(dumps(self.inputs))
+        self.assertEqual(validate_input_file(input_file_path), 0)
+
+        output_dir = self.test_outputs_directory / 'load_file_outputs'
+        self.assertEqual(run_manager_from_cli_worker(input_file_path, output_dir), 0)
+        summary = loads((output_dir / 'SimulationSummary.json').read_text())
+        self.assertEqual(summary['ghe_system']['number_of_boreholes'], 88)
+
+    def test_load_file_extension(self):
+        input_file_path = self.input_dir / 'input.json'
+        for file_name, valid in [('LOADS.CSV', True), ('loads.Npy', True), ('loads.txt', False)]:
+            self.inputs['loads'] = {'ground_loads_file': file_name}
+            input_file_path.write_text(dumps(self.inputs))
+            self.assertEqual(validate_input_file(input_file_path) == 0, valid)
+
+    def test_missing_load_file(self):
+        self.inputs['loads'] = {'ground_loads_file': 'missing.csv'}
+        input_file_path = self.input_dir / 'input.json'
+        input_file_path.write_text(dumps(self.inputs))
+        output_dir = self.test_outputs_directory / 'load_file_outputs'
+        self.assertEqual(run_manager_from_cli_worker(input_file_path, output_dir), 1)
+
+    def test_load_file_length(self):
+        np.save(self.input_dir / 'short.npy', np.array(self.ground_loads[:100]))
+        np.save(self.input_dir / 'long.npy', np.array(self.ground_loads * 2))
+
+        manager = GHEManager()
+        for file_name in ['short.npy', 'long.npy']:
+            with self.assertRaises(ValueError):
+                manager.set_ground_loads_from_file(self.input_dir / file_name)
+            self.assertEqual(manager.set_ground_loads_from_file(self.input_dir / file_name, throw=False), 1)
+
+        self.inputs['loads'] = {'ground_loads_file': 'short.npy'}
+        input_file_path = self.input_dir / 'input.json'
+        input_file_path.write_text(dumps(self.inputs))
+        output_dir = self.test_outputs_directory / 'load_file_outputs'
+        self.assertEqual(run_manager_from_cli_worker(input_file_path, output_dir), 1)
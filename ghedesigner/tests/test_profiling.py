@@ -0,0 +1,83 @@
+import shutil
+from json import loads
+from threading import Thread
+
+from click.testing import CliRunner
+
+from ghedesigner.manager import run_manager_from_cli
+from ghedesigner.cache import LRUCache, set_cache_size
+from ghedesigner.profiling import PHASE_STATS, collect_design_stats, performance_difference, performance_snapshot, timed
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+@timed('test_phase')
+def timed_function(x):
+    if x < 0:
+        raise ValueError("negative")
+    return 2 * x
+
+
+class TestProfiling(GHEBaseTest):
+
+    def test_timed(self):
+        before = performance_snapshot()
+        self.assertEqual(timed_function(2), 4)
+        with self.assertRaises(ValueError):
+            timed_function(-1)
+        diff = performance_difference(before, performance_snapshot())
+
+        # calls that raise are counted too
+        self.assertEqual(diff['phases']['test_phase']['calls'], 2)
+        self.assertGreaterEqual(diff['phases']['test_phase']['time'], 0.0)
+        self.assertEqual(timed_function.__name__, 'timed_function')
+
+    def test_clear(self):
+        timed_function(1)
+        PHASE_STATS.clear()
+        self.assertNotIn('test_phase', performance_snapshot()['phases'])
+
+    def test_design_stats(self):
+        cache = LRUCache('test_cache', maxsize=1)
+        cache.put(1, 'a')
+        with collect_design_stats() as stats:
+            timed_function(1)
+            cache.get(1)
+            cache.get(2)
+
+            # work of other threads, e.g. other designs, is not collected
+            with collect_design_stats() as other_stats:
+                other = Thread(target=timed_function, args=(1,))
+                other.start()
+                other.join()
+        timed_function(1)
+
+        report = stats.report()
+        self.assertEqual(report['phases']['test_phase']['calls'], 1)
+        self.assertNotIn('test_phase', other_stats.report()['phases'])
+        self.assertEqual(stats.cache_hits, {'test_cache': 1})
+        self.assertEqual(stats.cache_misses, {'test_cache': 1})
+        # the caches are disabled by default, so none are reported
+        self.assertEqual(report['caches'], {})
+        set_cache_size(4)
+        try:
+            self.assertEqual(set(stats.report()['caches']),
+                             {'g_function', 'sts_g_function', 'load_preprocessing', 'field_domain'})
+        finally:
+            set_cache_size(0)
+
+    def test_profile_cli(self):
+        output_dir = self.test_outputs_directory / 'profile_outputs'
+        shutil.rmtree(output_dir, ignore_errors=True)
+        input_file = self.demos_path / 'find_design_rectangle_single_u_tube.json'
+
+        runner = CliRunner()
+        result = runner.invoke(run_manager_from_cli, [str(input_file), str(output_dir), '--profile'])
+        self.assertIsNone(result.exception)
+
+        self.assertTrue((output_dir / 'Profile.prof').exists())
+        self.assertIn('cumulative', (output_dir / 'Profile.txt').read_text())
+
+        performance = loads((output_dir / 'SimulationSummary.json').read_text())['performance']
+        for phase in ['field_search', 'g_function', 'sts_g_function', 'hybrid_load', 'sizing']:
+            self.assertGreater(performance['phases'][phase]['calls'], 0)
+        self.assertNotIn('caches', performance)
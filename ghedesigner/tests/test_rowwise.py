@@ -3,7 +3,9 @@ from math import pi
 import numpy as np
 import pandas as pd
 
-from ghedesigner.rowwise import field_optimization_fr, field_optimization_wp_space_fr, gen_borehole_config, gen_shape
+from ghedesigner.rowwise import (dist_from_line, field_optimization_fr, field_optimization_wp_space_fr, find_duplicates,
+                                 gen_borehole_config, gen_shape, points_too_close, remove_duplicates,
+                                 rotation_angles)
 from ghedesigner.tests.ghe_base_case import GHEBaseTest
 
 
@@ -183,3 +185,75 @@ class TestRowWise(GHEBaseTest):
         reference_values = self.reference_values["test_perimeter_spacing_lengths"].to_list()
         for rv, nbh in zip(reference_values, num_bhs):
             self.assertAlmostEqual(rv, nbh, delta=0.001)
+
+    def test_remove_duplicates(self):
+
+        # near-duplicates fall within 10% of the spacing, also across bucket edges
+        borefield = [[0.0, 0.0], [10.0, 0.0], [0.05, 0.05], [9.99, -0.01], [20.0, 20.0], [0.0, 0.0]]
+        self.assertEqual(find_duplicates(borefield, 1.0), [(0, 2), (0, 5), (1, 3), (2, 5)])
+        self.assertEqual(remove_duplicates(borefield, 1.0), [[0.0, 0.0], [10.0, 0.0], [20.0, 20.0]])
+
+    def test_rotation_sweep_modes(self):
+
+        target_spacing = 15.0
+        serial_field, serial_name = field_optimization_fr(
+            target_spacing,
+            self.rotation_step,
+            self.property,
+            ng_zones=self.buildings,
+            rotate_start=self.rotation_start,
+            rotate_stop=self.rotation_stop,
+        )
+
+        # same field from a process pool over the same step grid
+        parallel_field, parallel_name = field_optimization_fr(
+            target_spacing,
+            self.rotation_step,
+            self.property,
+            ng_zones=self.buildings,
+            rotate_start=self.rotation_start,
+            rotate_stop=self.rotation_stop,
+            workers=2,
+        )
+        self.assertEqual(serial_name, parallel_name)
+        self.assertTrue(np.array_equal(serial_field, parallel_field))
+
+        # coarse-to-fine refines around the best coarse angles, and finds the best rotation of the full sweep
+        coarse_field, coarse_name = field_optimization_fr(
+            target_spacing,
+            self.rotation_step,
+            self.property,
+            ng_zones=self.buildings,
+            rotate_start=self.rotation_start,
+            rotate_stop=self.rotation_stop,
+            coarse_factor=5,
+        )
+        self.assertEqual(len(coarse_field), len(serial_field))
+        self.assertEqual(coarse_name, serial_name)
+        self.assertTrue(np.array_equal(serial_field, coarse_field))
+
+        # refining around every coarse angle checks every angle of the full sweep
+        refined_field, refined_name = field_optimization_fr(
+            target_spacing,
+            self.rotation_step,
+            self.property,
+            ng_zones=self.buildings,
+            rotate_start=self.rotation_start,
+            rotate_stop=self.rotation_stop,
+            coarse_factor=5,
+            refine_count=len(rotation_angles(self.rotation_start, self.rotation_stop, self.rotation_step)),
+        )
+        self.assertEqual(refined_name, serial_name)
+        self.assertTrue(np.array_equal(serial_field, refined_field))
+
+    def test_points_too_close(self):
+
+        holes = [[100.0, 70.0], [20.0, 80.0], [60.0, 30.0], [110.0, 130.0]]
+        too_close = points_too_close(self.property, holes, 10.0, no_go_zones=self.buildings)
+        chunked = points_too_close(self.property, holes, 10.0, no_go_zones=self.buildings, max_chunk_size=1)
+        self.assertEqual(too_close.tolist(), chunked.tolist())
+
+        # same cutoff as checking each edge with dist_from_line
+        edges = [(shape.c[i - 1], shape.c[i]) for shape in [self.property] + self.buildings for i in range(len(shape.c))]
+        expected = [any(dist_from_line(p1, p2, hole) < 10.0 for p1, p2 in edges) for hole in holes]
+        self.assertEqual(too_close.tolist(), expected)
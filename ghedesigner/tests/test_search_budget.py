@@ -0,0 +1,82 @@
+from json import loads
+from threading import Event
+
+from ghedesigner.enums import FieldSearchType
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.search_budget import SearchBudget, SearchBudgetExpired
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestSearchBudget(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        self.inputs = loads(input_file.read_text())
+
+    def test_budget(self):
+        budget = SearchBudget(max_evaluations=2)
+        budget.check()
+        budget.check()
+        with self.assertRaises(SearchBudgetExpired):
+            budget.check()
+        self.assertTrue(budget.expired)
+        self.assertEqual(budget.evaluations, 2)
+
+        budget = SearchBudget(max_time=0.0)
+        with self.assertRaises(SearchBudgetExpired):
+            budget.check()
+
+    def test_unlimited_budget(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        manager.find_design()
+        nbh = manager._search.ghe.nbh
+
+        manager.find_design(time_budget=3600.0, max_evaluations=1000)
+        self.assertFalse(manager._search.budget_limited)
+        self.assertEqual(manager._search.ghe.nbh, nbh)
+
+        manager.prepare_results("Project", "Notes", "Author", "Iteration")
+        self.assertFalse(manager.results.output_dict['search_budget']['budget_limited'])
+
+    def test_evaluation_budget(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        refined = Event()
+        refined_searches = []
+
+        def on_refined(search):
+            refined_searches.append(search)
+            refined.set()
+
+        manager.find_design(max_evaluations=4, on_refined=on_refined)
+        search = manager._search
+        self.assertTrue(search.budget_limited)
+        self.assertEqual(search.budget.evaluations, 4)
+        self.assertTrue(search.searchTracker[-1][0].startswith("Budget expired, bracket:"))
+        # the selected field is feasible
+        self.assertLessEqual(search.searchTracker[-1][1], 0.0)
+
+        manager.prepare_results("Project", "Notes", "Author", "Iteration")
+        self.assertTrue(manager.results.output_dict['search_budget']['budget_limited'])
+
+        # the unbudgeted search finds a field no larger than the budget-limited one
+        self.assertTrue(refined.wait(300))
+        self.assertFalse(refined_searches[0].budget_limited)
+        self.assertLessEqual(refined_searches[0].ghe.nbh, search.ghe.nbh)
+
+    def test_refine_error(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        errors = []
+
+        def find_design(**_):
+            raise RuntimeError("refinement failed")
+
+        # a failed refinement is reported instead of ending the background thread silently
+        manager._design.find_design = find_design
+        manager._refine_design(lambda search: self.fail("refined"), FieldSearchType.BISECTION, errors.append)
+        self.assertEqual([str(e) for e in errors], ["refinement failed"])
+
+    def test_no_feasible_field(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        with self.assertRaises(ValueError):
+            manager.find_design(max_evaluations=0)
@@ -0,0 +1,60 @@
+from json import dumps, loads
+from threading import Thread
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from ghedesigner.cache import clear_caches, set_cache_size
+from ghedesigner.server import DesignServer, DesignService
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestServer(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.server = DesignServer(('127.0.0.1', 0), DesignService(max_workers=1))
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        set_cache_size(0)
+        clear_caches()
+
+    def post(self, path: str, body: dict):
+        request = Request(self.url + path, data=dumps(body).encode(), headers={'Content-Type': 'application/json'})
+        with urlopen(request) as response:
+            return response.status, loads(response.read())
+
+    def get(self, path: str):
+        with urlopen(self.url + path) as response:
+            return response.status, loads(response.read())
+
+    def test_health(self):
+        status, body = self.get('/health')
+        self.assertEqual(200, status)
+        self.assertEqual('ok', body['status'])
+
+    def test_design(self):
+        inputs = loads((self.demos_path / 'input_bldg0000056_odd_loads.json').read_text())
+
+        status, body = self.post('/design', inputs)
+        self.assertEqual(200, status)
+        self.assertEqual(2, body['ghe_system']['number_of_boreholes'])
+        self.assertAlmostEqual(78.29, body['ghe_system']['active_borehole_length']['value'], delta=0.01)
+
+        # the repeated request is served from the result cache
+        status, cached_body = self.post('/design', inputs)
+        self.assertEqual(body, cached_body)
+
+        _, metrics = self.get('/metrics')
+        self.assertEqual(2, metrics['requests'])
+        self.assertEqual(1, metrics['designs'])
+        result_cache = [cache for cache in metrics['caches'] if cache['name'] == 'design_result'][0]
+        self.assertEqual(1, result_cache['hits'])
+
+    def test_invalid_design(self):
+        with self.assertRaises(HTTPError) as cm:
+            self.post('/design', {'version': '1.3'})
+        self.assertEqual(400, cm.exception.code)
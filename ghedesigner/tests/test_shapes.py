@@ -3,7 +3,7 @@ from math import sqrt
 from unittest import TestCase
 
 
-from ghedesigner.shape import point_polygon_check
+from ghedesigner.shape import Shapes, point_polygon_check, points_polygon_check
 
 
 class TestShapes(TestCase):
@@ -64,3 +64,28 @@ class TestShapes(TestCase):
         # below
         point = (-2, 2)
         self.assertEqual(point_polygon_check(l_shape, point), OUTSIDE)
+
+    def test_points_polygon_check(self):
+
+        # non-convex L-shape, see test_point_polygon_check
+        l_shape = [(0, 0), (4, 0), (4, 4), (3, 4), (3, 1), (0, 1)]
+        points = [(0.5, 0.5), (2, 0), (2, 2), (-2, 2), (3.5, 4), (3.5, 3)]
+
+        expected = [point_polygon_check(l_shape, point) for point in points]
+        self.assertEqual(points_polygon_check(l_shape, points).tolist(), expected)
+        self.assertEqual(expected, [1, 0, -1, -1, 0, 1])
+
+    def test_lines_intersect(self):
+
+        # non-convex L-shape, see test_point_polygon_check
+        l_shape = Shapes([(0, 0), (4, 0), (4, 4), (3, 4), (3, 1), (0, 1)])
+        lines = [[-1, 0.5, 5, 0.5], [3.5, -1, 3.5, 5], [-1, 2, 5, 2], [-1, -1, 5, 5], [-1, 6, 5, 6]]
+
+        # the diagonal meets the corners (0, 0) and (4, 4) once per edge
+        expected = [[[0.0, 0.5], [4.0, 0.5]],
+                    [[3.5, 0.0], [3.5, 4.0]],
+                    [[3.0, 2.0], [4.0, 2.0]],
+                    [[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [3.0, 3.0], [4.0, 4.0], [4.0, 4.0]],
+                    []]
+        self.assertEqual(l_shape.lines_intersect(lines), expected)
+        self.assertEqual([l_shape.line_intersect(line) for line in lines], expected)
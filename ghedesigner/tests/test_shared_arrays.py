@@ -0,0 +1,53 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from types import SimpleNamespace
+
+import numpy as np
+
+from ghedesigner.shared_arrays import SharedArray, SharedArrayStore, attach_attributes
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+def _sum_shared(shared: SharedArray) -> float:
+    return float(shared.attach().sum())
+
+
+class TestSharedArrays(GHEBaseTest):
+
+    def test_publish_and_attach(self):
+        loads = np.linspace(-1.0, 1.0, 8760).reshape(365, 24)
+        with SharedArrayStore() as store:
+            shared = store.publish(loads)
+            self.assertLess(len(pickle.dumps(shared)), 200)
+
+            view = shared.attach()
+            np.testing.assert_array_equal(view, loads)
+            self.assertFalse(view.flags.writeable)
+            with self.assertRaises(ValueError):
+                view[0, 0] = 2.0
+            del view
+
+        # the block is unlinked when the store is closed
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=shared.name)
+
+    def test_attach_in_workers(self):
+        values = np.arange(1000, dtype=np.float64)
+        with SharedArrayStore() as store:
+            shared = store.publish(values)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                sums = list(executor.map(_sum_shared, [shared] * 4))
+        self.assertEqual(sums, [float(values.sum())] * 4)
+
+    def test_share_attributes(self):
+        obj = SimpleNamespace(coordinates=np.ones((10, 2)), name='field')
+        with SharedArrayStore() as store:
+            shared = store.share_attributes(obj, ['coordinates'])
+            self.assertIsInstance(shared.coordinates, SharedArray)
+            self.assertIsInstance(obj.coordinates, np.ndarray)
+
+            attached = attach_attributes(pickle.loads(pickle.dumps(shared)))
+            np.testing.assert_array_equal(attached.coordinates, obj.coordinates)
+            self.assertEqual(attached.name, 'field')
+            del attached
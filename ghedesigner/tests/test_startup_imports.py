@@ -0,0 +1,24 @@
+import subprocess
+import sys
+
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestStartupImports(GHEBaseTest):
+
+    def imported_modules(self, *args) -> set:
+        proc = subprocess.run([sys.executable, "-X", "importtime"] + list(args), stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(proc.returncode, 0)
+        return {line.split('|')[-1].strip() for line in proc.stderr.splitlines() if line.startswith('import time:')}
+
+    def test_validate_does_not_import_solver(self):
+        input_file = self.demos_path / 'find_design_rectangle_single_u_tube.json'
+        modules = self.imported_modules('-m', 'ghedesigner.manager', '--validate', str(input_file))
+        for module in ['numpy', 'scipy', 'pygfunction', 'ghedesigner.design']:
+            self.assertNotIn(module, modules)
+
+    def test_version_does_not_import_solver(self):
+        modules = self.imported_modules('-m', 'ghedesigner.manager', '--version')
+        self.assertNotIn('pygfunction', modules)
+        self.assertNotIn('numpy', modules)
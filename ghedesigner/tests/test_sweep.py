@@ -0,0 +1,96 @@
+import csv
+from json import dumps, loads
+
+from click.testing import CliRunner
+
+from ghedesigner.cache import DOMAIN_CACHE, G_FUNCTION_CACHE
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.shared_arrays import SharedArray, SharedArrayStore
+from ghedesigner.sweep import attach_inputs, check_grid, expand_grid, group_points, invalidated_stages, run_sweep, \
+    run_sweep_from_cli, share_inputs
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+
+class TestSweep(GHEBaseTest):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.input_file = self.demos_path / 'find_design_near_square_single_u_tube.json'
+        self.inputs = loads(self.input_file.read_text())
+
+    def test_invalidated_stages(self):
+        self.assertEqual(invalidated_stages('design.max_eft'), ['search'])
+        self.assertNotIn('domain', invalidated_stages('grout.conductivity'))
+        self.assertIn('sts', invalidated_stages('grout.conductivity'))
+        self.assertIn('domain', invalidated_stages('geometric_constraints.b'))
+        with self.assertRaises(ValueError):
+            invalidated_stages('output.name')
+
+    def test_check_grid(self):
+        check_grid(self.inputs, {'design.max_eft': [35.0], 'pipe': [{'inner_diameter': 0.02}]})
+        for grid in [{}, {'design.max_eft': []}, {'design.max_temp': [35.0]}, {'pipe': [0.02]}]:
+            with self.assertRaises(ValueError):
+                check_grid(self.inputs, grid)
+
+    def test_group_points(self):
+        points = expand_grid({'grout.conductivity': [1.0, 1.5], 'design.max_eft': [35.0, 33.0]})
+        self.assertEqual(len(points), 4)
+        self.assertEqual(points[1], {'grout.conductivity': 1.0, 'design.max_eft': 33.0})
+
+        # the EFT limits do not change the g-functions, so those points share a group
+        self.assertEqual(sorted(sorted(group) for group in group_points(points)), [[0, 1], [2, 3]])
+
+    def test_share_inputs(self):
+        with SharedArrayStore() as store:
+            shared = share_inputs(self.inputs, store)
+            self.assertIsInstance(shared['loads']['ground_loads'], SharedArray)
+            self.assertIsInstance(self.inputs['loads']['ground_loads'], list)
+
+            loads = attach_inputs(shared)['loads']['ground_loads']
+            self.assertEqual(loads.tolist(), self.inputs['loads']['ground_loads'])
+            del loads
+
+    def test_parallel_sweep(self):
+        rows = run_sweep(self.inputs, {'grout.conductivity': [1.0, 1.5]}, self.demos_path, jobs=2)
+        self.assertEqual([row['status'] for row in rows], ['Success', 'Success'])
+        self.assertLessEqual(rows[1]['total_drilling'], rows[0]['total_drilling'])
+
+    def test_manager_sweep(self):
+        manager = setup_manager_from_inputs(self.inputs, self.demos_path)
+        with self.assertRaises(ValueError):
+            manager.run_sweep({'design.max_temp': [35.0]})
+        self.assertIsNone(manager.run_sweep({'design.max_temp': [35.0]}, throw=False))
+
+        domain_hits = DOMAIN_CACHE.hits
+        g_function_hits = G_FUNCTION_CACHE.hits
+        rows = manager.run_sweep({'design.max_eft': [35.0, 34.0]})
+        self.assertEqual([row['status'] for row in rows], ['Success', 'Success'])
+        self.assertEqual([row['design.max_eft'] for row in rows], [35.0, 34.0])
+        self.assertEqual(rows[1]['recomputed_stages'], 'search')
+        self.assertGreater(DOMAIN_CACHE.hits, domain_hits)
+        self.assertGreater(G_FUNCTION_CACHE.hits, g_function_hits)
+        self.assertLessEqual(rows[1]['max_hp_entering_temp'], 34.0 + 1.0e-3)
+
+        # the caches are only enabled for the sweep
+        self.assertEqual(G_FUNCTION_CACHE.maxsize, 0)
+
+        # the sweep finds the same design as a separate run
+        manager.find_design()
+        self.assertEqual(rows[0]['number_of_boreholes'], manager._search.ghe.nbh)
+        self.assertAlmostEqual(rows[0]['borehole_height'], manager._search.ghe.bhe.b.H, delta=1.0e-6)
+
+    def test_cli_sweep(self):
+        grid_file = self.test_outputs_directory / 'sweep_grid.json'
+        output_file = self.test_outputs_directory / 'sweep_outputs' / 'SweepResults.csv'
+        grid_file.write_text(dumps({'pipe': [{'inner_diameter': 0.0216, 'outer_diameter': 0.02667}]}))
+        result = CliRunner().invoke(run_sweep_from_cli, [str(self.input_file), str(grid_file), str(output_file)],
+                                    standalone_mode=False)
+        self.assertIsNone(result.exception)
+        self.assertEqual(result.return_value, 0)
+
+        with open(output_file) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['status'], 'Success')
+        self.assertEqual(float(rows[0]['pipe.outer_diameter']), 0.02667)
+        self.assertEqual(rows[0]['recomputed_stages'], 'domain;g_function;sts;hybrid_load;search')
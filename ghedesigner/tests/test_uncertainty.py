@@ -0,0 +1,65 @@
+from json import loads
+
+import numpy as np
+
+from ghedesigner.enums import TimestepType
+from ghedesigner.manager import GHEManager, setup_manager_from_inputs
+from ghedesigner.profiling import performance_difference, performance_snapshot
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+from ghedesigner.uncertainty import UncertaintyModel, sample_inputs
+
+
+class TestUncertainty(GHEBaseTest):
+
+    def test_sample_inputs(self):
+        manager = GHEManager()
+        manager.set_soil(2.0, 2343493.0, 18.3)
+        manager.set_grout(1.0, 3901000.0)
+        samples = sample_inputs(20000, manager._soil, manager._grout, soil_conductivity_cov=0.2, seed=1)
+        self.assertAlmostEqual(np.mean(samples['soil_conductivity']), 2.0, delta=0.02)
+        self.assertAlmostEqual(np.std(samples['soil_conductivity']) / 2.0, 0.2, delta=0.01)
+        self.assertTrue(np.all(samples['grout_conductivity'] == 1.0))
+        self.assertTrue(np.all(samples['load_scale'] == 1.0))
+        np.testing.assert_array_equal(samples['soil_heat_capacity'],
+                                      sample_inputs(20000, manager._soil, manager._grout, soil_conductivity_cov=0.2,
+                                                    seed=1)['soil_heat_capacity'])
+
+    def test_before_find_design(self):
+        with self.assertRaises(ValueError):
+            GHEManager().run_uncertainty_analysis(num_samples=10)
+        self.assertIsNone(GHEManager().run_uncertainty_analysis(num_samples=10, throw=False))
+
+    def test_uncertainty_analysis(self):
+        inputs = loads((self.demos_path / 'find_design_rectangle_single_u_tube.json').read_text())
+        manager = setup_manager_from_inputs(inputs, self.demos_path)
+        manager.find_design()
+        ghe = manager._search.ghe
+        design_height = ghe.bhe.b.H
+        max_eft, min_eft = ghe.simulate(TimestepType.HYBRID)
+
+        # the design values reproduce the design
+        model = UncertaintyModel(ghe)
+        sample = (ghe.bhe.soil.k, ghe.bhe.soil.rhoCp, ghe.bhe.grout.k, ghe.bhe.grout.rhoCp, 1.0)
+        sample_max_eft, sample_min_eft, required_height = model.evaluate(sample)
+        self.assertAlmostEqual(sample_max_eft, max_eft, delta=1.0e-6)
+        self.assertAlmostEqual(sample_min_eft, min_eft, delta=1.0e-6)
+        self.assertAlmostEqual(required_height, design_height, delta=1.0e-3)
+
+        # a larger load needs a deeper field
+        self.assertGreater(model.evaluate(sample[:4] + (1.05,))[2], design_height)
+
+        before = performance_snapshot()
+        results = manager.run_uncertainty_analysis(num_samples=20, load_scale_cov=0.05, seed=2)
+        diff = performance_difference(before, performance_snapshot())
+        self.assertNotIn('g_function_solve', diff['phases'])
+        self.assertEqual(ghe.bhe.b.H, design_height)
+
+        self.assertEqual(results['number_of_samples'], 20)
+        heights = results['required_borehole_height']
+        self.assertLessEqual(heights['P10'], heights['P50'])
+        self.assertLessEqual(heights['P50'], heights['P90'])
+        self.assertEqual(results['p_level_borehole_height'], heights['P90'])
+        self.assertAlmostEqual(results['p_level_total_drilling'], heights['P90'] * results['number_of_boreholes'])
+
+        parallel = manager.run_uncertainty_analysis(num_samples=20, load_scale_cov=0.05, seed=2, workers=2)
+        self.assertEqual(parallel, results)
@@ -0,0 +1,24 @@
+from json import loads
+
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+from ghedesigner.validate import get_schema_validator, schema_errors, validate_input_dict, validate_input_file
+
+
+class TestValidate(GHEBaseTest):
+
+    def test_demo_files_valid(self):
+        for input_file_path in sorted(self.demos_path.glob('*.json')):
+            self.assertEqual(validate_input_file(input_file_path), 0, msg=input_file_path.name)
+
+    def test_validator_compiled_once(self):
+        self.assertIs(get_schema_validator('grout.schema.json'), get_schema_validator('grout.schema.json'))
+
+    def test_errors_aggregated(self):
+        inputs = loads((self.demos_path / 'find_design_rectangle_single_u_tube.json').read_text())
+        inputs['grout']['conductivity'] = 'high'
+        inputs['soil'] = {'conductivity': -1.0}
+        del inputs['design']
+
+        # one error for each invalid object, and a missing object does not stop the others
+        self.assertEqual(validate_input_dict(inputs), 3)
+        self.assertEqual(len(schema_errors('soil.schema.json', inputs['soil'])), 3)
@@ -0,0 +1,222 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ghedesigner.borehole_heat_exchangers import get_bhe_object
+from ghedesigner.constants import TWO_PI
+from ghedesigner.ground_heat_exchangers import GHE, BaseGHE
+from ghedesigner.media import Grout, Soil
+from ghedesigner.profiling import timed
+from ghedesigner.radial_numerical_borehole import RadialNumericalBH
+from ghedesigner.shared_arrays import SharedArrayStore, attach_attributes
+from ghedesigner.utilities import solve_root
+
+SAMPLED_INPUTS = ['soil_conductivity', 'soil_heat_capacity', 'grout_conductivity', 'grout_heat_capacity', 'load_scale']
+
+
+def sample_lognormal(rng: np.random.Generator, mean: float, cov: float, num_samples: int) -> np.ndarray:
+    """
+    Samples a positive input from a log-normal distribution with the given mean and coefficient of variation.
+    """
+
+    if cov <= 0.0:
+        return np.full(num_samples, mean, dtype=np.float64)
+    sigma = np.sqrt(np.log(1.0 + cov ** 2))
+    return rng.lognormal(np.log(mean) - 0.5 * sigma ** 2, sigma, num_samples)
+
+
+def sample_inputs(num_samples: int, soil: Soil, grout: Grout, soil_conductivity_cov: float = 0.1,
+                  soil_heat_capacity_cov: float = 0.1, grout_conductivity_cov: float = 0.0,
+                  grout_heat_capacity_cov: float = 0.0, load_scale_cov: float = 0.0,
+                  seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Samples the uncertain inputs around the design values.
+
+    Each input is log-normal, with the design value as mean and the given coefficient of variation.
+    A coefficient of variation of zero keeps the input at its design value.
+
+    :returns: the samples of each input, by name
+    """
+
+    rng = np.random.default_rng(seed)
+    return {
+        'soil_conductivity': sample_lognormal(rng, soil.k, soil_conductivity_cov, num_samples),
+        'soil_heat_capacity': sample_lognormal(rng, soil.rhoCp, soil_heat_capacity_cov, num_samples),
+        'grout_conductivity': sample_lognormal(rng, grout.k, grout_conductivity_cov, num_samples),
+        'grout_heat_capacity': sample_lognormal(rng, grout.rhoCp, grout_heat_capacity_cov, num_samples),
+        'load_scale': sample_lognormal(rng, 1.0, load_scale_cov, num_samples),
+    }
+
+
+class UncertaintyModel:
+    """
+    Evaluates the sized field of a design for sampled soil, grout and load scaling.
+
+    The long time step g-functions depend on the soil only through the characteristic time
+    ts = H^2 / (9 alpha), so the g-curves of the design are reused for every sample and no
+    g-function is recomputed. The hybrid loads of the design are reused and scaled, as the
+    design search does when the borehole height changes. Each sample computes its own borehole
+    resistance and short time step g-function, and is simulated with the superposition written
+    as one matrix-vector product.
+    """
+
+    # arrays published to shared memory for parallel evaluation
+    shared_arrays = ['q_dot_b', 'q_dot_b_dt', 'mask', 'log_elapsed']
+
+    def __init__(self, ghe: GHE):
+        # only the parts of the ground heat exchanger the samples need are kept, so the model pickles small
+        self.bhe = ghe.bhe
+        self.bhe_type = ghe.bhe_type
+        self.g_function = ghe.gFunction
+        self.nbh = ghe.nbh
+        self.b_spacing = ghe.B_spacing
+        self.design_height = ghe.bhe.b.H
+        self.min_height = ghe.sim_params.min_height
+        self.max_height = ghe.sim_params.max_height
+        self.min_eft_allowable = ghe.sim_params.min_EFT_allowable
+        self.max_eft_allowable = ghe.sim_params.max_EFT_allowable
+
+        # heat rejection per borehole, W, at each hybrid time step, with no load at time zero
+        q_dot_b = np.hstack((0.0, ghe.hybrid_load.load[2:] * 1000.0 / float(self.nbh)))
+        time_values = np.hstack((0.0, ghe.hybrid_load.hour[2:]))
+        self.q_dot_b = q_dot_b[1:]
+        self.q_dot_b_dt = q_dot_b[1:] - q_dot_b[:-1]
+
+        # ln of the elapsed time, in s, from the start of each load step to the end of each time step
+        n = self.q_dot_b.size
+        self.mask = np.tri(n, dtype=bool)
+        elapsed = (time_values[1:, None] - time_values[None, :-1])[self.mask]
+        self.log_elapsed = np.log(elapsed * 3600.0)
+
+    def sample_ghe(self, soil_conductivity: float, soil_heat_capacity: float, grout_conductivity: float,
+                   grout_heat_capacity: float):
+        """
+        Builds the borehole heat exchanger of a sample, and its short time step g-function at the design height.
+
+        :returns: the borehole heat exchanger, and the short time step g-function against time, in s
+        """
+
+        bhe = self.bhe
+        soil = Soil(soil_conductivity, soil_heat_capacity, bhe.soil.ugt)
+        grout = Grout(grout_conductivity, grout_heat_capacity)
+        borehole = deepcopy(bhe.b)
+        borehole.H = self.design_height
+        sample_bhe = get_bhe_object(self.bhe_type, bhe.m_flow_borehole, bhe.fluid, borehole, bhe.pipe, grout,
+                                    soil)
+        bhe_eq = sample_bhe.to_single()
+        radial_numerical = RadialNumericalBH(bhe_eq)
+        radial_numerical.calc_sts_g_functions(bhe_eq)
+        log_time_sts = radial_numerical.lntts + np.log(radial_numerical.t_s)
+        return sample_bhe, log_time_sts, radial_numerical.g
+
+    def simulate(self, sample_bhe, log_time_sts: np.ndarray, g_sts: np.ndarray, load_scale: float,
+                 height: float) -> Tuple[float, float]:
+        """
+        Simulates a sample at a borehole height.
+
+        :returns: the max and min heat pump entering fluid temperatures, in C
+        """
+
+        sample_bhe.b.H = height
+        soil = sample_bhe.soil
+        ts = height ** 2 / (9.0 * soil.k / soil.rhoCp)
+        log_ts = np.log(ts)
+
+        # long time step g-function of the design field, interpolated for B/H
+        g_function = self.g_function
+        g_lts, rb_value, _, _ = g_function.g_function_interpolation(self.b_spacing / height)
+        g_lts = g_function.borehole_radius_correction(g_lts, rb_value, sample_bhe.b.r_b)
+        g = BaseGHE.combine_sts_lts(g_function.log_time, g_lts, (log_time_sts - log_ts).tolist(), g_sts.tolist())
+
+        g_matrix = np.zeros(self.mask.shape)
+        g_matrix[self.mask] = g(self.log_elapsed - log_ts)
+
+        q_dot_b = load_scale * self.q_dot_b
+        delta_tb = g_matrix.dot(load_scale * self.q_dot_b_dt) / (height * TWO_PI * soil.k)
+        tf_bulk = soil.ugt + delta_tb + q_dot_b / height * sample_bhe.calc_effective_borehole_resistance()
+        hp_eft = tf_bulk - q_dot_b / (2.0 * sample_bhe.m_flow_borehole * sample_bhe.fluid.cp)
+        return float(hp_eft.max()), float(hp_eft.min())
+
+    def cost(self, max_eft: float, min_eft: float) -> float:
+        return max(max_eft - self.max_eft_allowable, self.min_eft_allowable - min_eft)
+
+    def evaluate(self, sample: Tuple[float, float, float, float, float]) -> Tuple[float, float, float]:
+        """
+        Evaluates a sample of soil conductivity and heat capacity, grout conductivity and heat capacity,
+        and load scale.
+
+        :returns: the max and min heat pump entering fluid temperatures at the design height, in C,
+         and the borehole height required by the sample, in m
+        """
+
+        *properties, load_scale = sample
+        sample_bhe, log_time_sts, g_sts = self.sample_ghe(*properties)
+        max_eft, min_eft = self.simulate(sample_bhe, log_time_sts, g_sts, load_scale, self.design_height)
+
+        def local_objective(h):
+            return self.cost(*self.simulate(sample_bhe, log_time_sts, g_sts, load_scale, h))
+
+        required_height = solve_root(self.design_height, local_objective, lower=self.min_height,
+                                     upper=self.max_height, abs_tol=1.0e-6, rel_tol=1.0e-6, max_iter=50)
+        return max_eft, min_eft, required_height
+
+
+@timed('uncertainty_analysis')
+def run_uncertainty_analysis(ghe: GHE, samples: Dict[str, np.ndarray], percentiles: List[float] = (10, 50, 90),
+                             p_level: float = 90.0, workers: Optional[int] = None) -> dict:
+    """
+    Evaluates the sized field of a design for each sample of the uncertain inputs.
+
+    :param ghe: sized ground heat exchanger of the design.
+    :param samples: samples of each input, as returned by sample_inputs.
+    :param percentiles: percentiles of the fluid temperatures and required heights to report.
+    :param p_level: percentile of the required height to size for, e.g. 90 for a P90 design.
+    :param workers: number of worker processes to evaluate the samples with, runs serially if None or 1.
+    :returns: the fluid temperature and required height percentiles, and the P-level required length
+    """
+
+    model = UncertaintyModel(ghe)
+    rows = list(zip(*[np.asarray(samples[name], dtype=np.float64).tolist() for name in SAMPLED_INPUTS]))
+
+    if workers is not None and workers > 1:
+        # the model is sent once to each worker, with its arrays attached from shared memory
+        with SharedArrayStore() as store, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(store.share_attributes(model, model.shared_arrays),)) as executor:
+            chunk_size = max(1, len(rows) // (4 * workers))
+            results = list(executor.map(_evaluate_sample, rows, chunksize=chunk_size))
+    else:
+        results = [model.evaluate(row) for row in rows]
+
+    max_eft, min_eft, required_height = (np.array(x) for x in zip(*results))
+
+    def percentile_dict(values: np.ndarray) -> dict:
+        return {f"P{p:g}": float(np.percentile(values, p)) for p in percentiles}
+
+    p_level_height = float(np.percentile(required_height, p_level))
+    return {
+        'number_of_samples': len(rows),
+        'number_of_boreholes': model.nbh,
+        'design_borehole_height': model.design_height,
+        'max_hp_entering_temp': percentile_dict(max_eft),
+        'min_hp_entering_temp': percentile_dict(min_eft),
+        'required_borehole_height': percentile_dict(required_height),
+        'p_level': p_level,
+        'p_level_borehole_height': p_level_height,
+        'p_level_total_drilling': p_level_height * model.nbh,
+        'samples_at_max_height': int(np.sum(required_height >= model.max_height)),
+    }
+
+
+_WORKER_MODEL = None  # type: Optional[UncertaintyModel]
+
+
+def _init_worker(model: UncertaintyModel) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = attach_attributes(model)
+
+
+def _evaluate_sample(sample: tuple) -> Tuple[float, float, float]:
+    return _WORKER_MODEL.evaluate(sample)
@@ -2,10 +2,10 @@ from json import loads
 from math import sqrt
 from pathlib import Path
 
-from scipy.optimize import brentq
-
 import numpy as np
 
+from ghedesigner.coordinates import as_coordinate_array
+
 
 # Time functions
 # --------------
@@ -19,13 +19,14 @@ def eskilson_log_times():
 # -----------------
 def borehole_spacing(borehole, coordinates):
     # Use the distance between the first pair of coordinates as the B-spacing
+    coordinates = as_coordinate_array(coordinates)
     x_0, y_0 = coordinates[0]
     if len(coordinates) == 1:
         # Set the spacing to be the borehole radius if there's just one borehole
         return borehole.r_b
     elif len(coordinates) > 1:
         x_1, y_1 = coordinates[1]
-        return max(borehole.r_b, sqrt((x_1 - x_0) ** 2 + (y_1 - y_0) ** 2))
+        return max(borehole.r_b, float(sqrt((x_1 - x_0) ** 2 + (y_1 - y_0) ** 2)))
     else:
         raise ValueError("The coordinates_domain needs to contain a positive number of (x, y) pairs.")
 
@@ -34,6 +35,38 @@ def length_of_side(n, b):
     return (n - 1) * b
 
 
+# Load functions
+# --------------
+def read_hourly_loads(load_file_path: Path) -> np.ndarray:
+    """
+    Reads hourly loads from a CSV or NumPy .npy file.
+
+    .npy files are memory-mapped rather than read into memory. CSV files hold one value per row,
+    optionally after a header row; when rows have several columns, the last column is used.
+
+    :param load_file_path: path to the load file.
+    :returns: 1D float64 array of hourly loads
+    """
+
+    if load_file_path.suffix.lower() == '.npy':
+        loads_arr = np.load(load_file_path, mmap_mode='r')
+    else:
+        with open(load_file_path) as f:
+            first_field = f.readline().split(',')[-1]
+        try:
+            float(first_field)
+            skip_rows = 0
+        except ValueError:
+            skip_rows = 1
+        loads_arr = np.loadtxt(load_file_path, delimiter=',', skiprows=skip_rows, ndmin=2)[:, -1]
+
+    if loads_arr.ndim != 1:
+        raise ValueError(f"Load file must hold a single column of loads: {load_file_path}")
+
+    # only copies when the file holds another type
+    return np.asarray(loads_arr, dtype=np.float64)
+
+
 # Design oriented functions
 # -------------------------
 def sign(x: float) -> int:
@@ -81,6 +114,7 @@ def solve_root(x, objective_function, lower=None, upper=None, abs_tol=1.0e-6, re
 
     # Solve the root if we can, if not, take the higher value
     if kg_plus_sign != kg_minus_sign:
+        from scipy.optimize import brentq
         x = brentq(objective_function, lower, upper, xtol=abs_tol, rtol=rel_tol, maxiter=max_iter)
     elif kg_plus_sign == -1 and kg_minus_sign == -1:
         x = lower
@@ -1,8 +1,10 @@
 import sys
+from functools import lru_cache
 from json import loads
 from pathlib import Path
+from typing import List
 
-from jsonschema import validate, ValidationError
+from jsonschema.validators import validator_for
 
 from ghedesigner.enums import BHPipeType, DesignGeomType
 
@@ -12,19 +14,44 @@ from ghedesigner.enums import BHPipeType, DesignGeomType
 #       More details here: https://github.com/json-schema-org/community/discussions/148
 
 
+@lru_cache(maxsize=None)
+def get_schema_validator(schema_file_name: str):
+    """
+    Reads a schema file and compiles its validator, once per process
+    """
+    schema_dir = Path(__file__).parent / "schemas"
+    schema_path = schema_dir / schema_file_name
+    schema = loads(schema_path.read_text())
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def schema_errors(schema_file_name: str, instance) -> List[str]:
+    """
+    Collects all errors of a schema instance, rather than stopping at the first one
+    """
+    validator = get_schema_validator(schema_file_name)
+    return [f"{error.json_path}: {error.message}" for error in validator.iter_errors(instance)]
+
+
 def validate_schema_instance(schema_file_name: str, instance: dict, error_msg: str) -> int:
     """
     Base-level worker function to validate schema instances
     """
-    try:
-        schema_dir = Path(__file__).parent / "schemas"
-        schema_path = schema_dir / schema_file_name
-        schema = loads(schema_path.read_text())
-        validate(instance=instance, schema=schema)
+    errors = schema_errors(schema_file_name, instance)
+    if not errors:
         return 0
-    except ValidationError:
-        print(error_msg, file=sys.stderr)
-        return 1
+    print(error_msg, file=sys.stderr)
+    for error in errors:
+        print(f"  {error}", file=sys.stderr)
+    return 1
+
+
+def upper_case_field(instance: dict, field: str) -> str:
+    if field in instance:
+        instance[field] = str(instance[field]).upper()
+    return instance.get(field, "")
 
 
 def validate_file_structure(instance: dict) -> int:
@@ -36,8 +63,7 @@ def validate_file_structure(instance: dict) -> int:
 
 
 def validate_fluid(instance: dict) -> int:
-    fluid_name = str(instance["fluid_name"]).upper()
-    instance["fluid_name"] = fluid_name
+    upper_case_field(instance, "fluid_name")
     return validate_schema_instance(
         schema_file_name="fluid.schema.json",
         instance=instance,
@@ -62,8 +88,7 @@ def validate_soil(instance: dict) -> int:
 
 
 def validate_pipe(instance: dict) -> int:
-    pipe_arrangement = str(instance["arrangement"]).upper()
-    instance["arrangement"] = pipe_arrangement
+    pipe_arrangement = upper_case_field(instance, "arrangement")
 
     schema_map = {
         BHPipeType.SINGLEUTUBE.name: "pipe_single_double_u_tube.schema.json",
@@ -92,9 +117,7 @@ def validate_borehole(instance: dict) -> int:
 
 
 def validate_simulation(instance: dict) -> int:
-    if "timestep" in instance:
-        timestep = str(instance["timestep"]).upper()
-        instance["timestep"] = timestep
+    upper_case_field(instance, "timestep")
 
     return validate_schema_instance(
         schema_file_name="simulation.schema.json",
@@ -104,8 +127,7 @@ def validate_simulation(instance: dict) -> int:
 
 
 def validate_geometric(instance: dict) -> int:
-    method = str(instance["method"]).upper()
-    instance["method"] = method
+    method = upper_case_field(instance, "method")
 
     schema_map = {
         DesignGeomType.BIRECTANGLE.name: "geometric_bi_rectangle.schema.json",
@@ -128,8 +150,7 @@ def validate_geometric(instance: dict) -> int:
 
 
 def validate_design(instance: dict) -> int:
-    flow_type = str(instance["flow_type"]).upper()
-    instance["flow_type"] = flow_type
+    upper_case_field(instance, "flow_type")
     return validate_schema_instance(
         schema_file_name="design.schema.json",
         instance=instance,
@@ -137,6 +158,14 @@ def validate_design(instance: dict) -> int:
     )
 
 
+def validate_loads(instance: dict) -> int:
+    return validate_schema_instance(
+        schema_file_name="loads.schema.json",
+        instance=instance,
+        error_msg="Errors in \"loads\" input object."
+    )
+
+
 def validate_input_file(input_file_path: Path) -> int:
     """
     Validate input file against all schemas
@@ -144,18 +173,36 @@ def validate_input_file(input_file_path: Path) -> int:
 
     # get instance data
     instance = loads(input_file_path.read_text())
+    return validate_input_dict(instance)
+
+
+def validate_input_dict(instance: dict) -> int:
+    """
+    Validate input data, as read from an input file, against all schemas
+
+    All input objects are validated in a single pass, so every error is reported
+    rather than only the first one. Objects that are missing or of the wrong type
+    are reported by the file structure check and skipped.
+    """
+
+    object_validators = {
+        "fluid": validate_fluid,
+        "grout": validate_grout,
+        "soil": validate_soil,
+        "pipe": validate_pipe,
+        "borehole": validate_borehole,
+        "simulation": validate_simulation,
+        "geometric_constraints": validate_geometric,
+        "design": validate_design,
+        "loads": validate_loads,
+    }
 
-    # validate
-    err_count = 0
-    err_count += validate_file_structure(instance)
-    err_count += validate_fluid(instance["fluid"])
-    err_count += validate_grout(instance["grout"])
-    err_count += validate_soil(instance["soil"])
-    err_count += validate_pipe(instance["pipe"])
-    err_count += validate_borehole(instance["borehole"])
-    err_count += validate_simulation(instance["simulation"])
-    err_count += validate_geometric(instance["geometric_constraints"])
-    err_count += validate_design(instance["design"])
+    err_count = validate_file_structure(instance)
+    if not isinstance(instance, dict):
+        return err_count
+    for key, validate_object in object_validators.items():
+        if isinstance(instance.get(key), dict):
+            err_count += validate_object(instance[key])
     return err_count
 
 
@@ -0,0 +1,84 @@
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEMO_FILE = ROOT_DIR / "demos" / "find_design_rectangle_single_u_tube.json"
+HEAVY_MODULES = ["numpy", "scipy", "pygfunction"]
+
+
+def entry_paths(summary_path: Path) -> Dict[str, List[str]]:
+    """
+    Returns the interpreter arguments of each entry path, which is run in a fresh interpreter with the
+    arguments passed to the CLI. The run path only imports the modules a design needs, since running one
+    takes minutes.
+
+    :param summary_path: SimulationSummary.json converted by the convert path.
+    """
+    return {
+        "version": ["-m", "ghedesigner.manager", "--version"],
+        "validate": ["-m", "ghedesigner.manager", "--validate", str(DEMO_FILE)],
+        "convert": ["-m", "ghedesigner.manager", "--convert", "IDF", str(summary_path)],
+        "run": ["-c", "import ghedesigner.manager, ghedesigner.design, ghedesigner.output"],
+    }
+
+
+def write_summary(output_directory: Path) -> Path:
+    """Runs the demo design once, for the summary and g-function files read by the convert path."""
+    subprocess.run([sys.executable, "-m", "ghedesigner.manager", str(DEMO_FILE), str(output_directory)],
+                   cwd=ROOT_DIR, stdout=subprocess.DEVNULL, check=True)
+    return output_directory / "SimulationSummary.json"
+
+
+IMPORT_TIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure_entry_path(args: List[str]) -> Dict:
+    """
+    Runs an entry path with 'python -X importtime' and collects its import statistics.
+
+    :param args: interpreter arguments of the entry path.
+    :returns: the total import time in seconds, the number of modules imported,
+              and which of the heavy solver modules were imported.
+    """
+    # an entry path that fails would time its error path, so failures are raised
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT_DIR,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        match = IMPORT_TIME_RE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        modules.add(module)
+        if len(indent) == 1:
+            # top level imports, their cumulative time includes the nested ones
+            total_us += int(cumulative)
+    return {"import_time": total_us / 1e6, "num_modules": len(modules),
+            "heavy_modules": [m for m in HEAVY_MODULES if m in modules]}
+
+
+def benchmark_startup(repeats: int = 5) -> Dict[str, Dict]:
+    """Measures each entry path 'repeats' times and keeps the fastest import time."""
+    results = {}
+    with TemporaryDirectory() as output_directory:
+        summary_path = write_summary(Path(output_directory))
+        for name, args in entry_paths(summary_path).items():
+            runs = [measure_entry_path(args) for _ in range(repeats)]
+            results[name] = min(runs, key=lambda r: r["import_time"])
+    return results
+
+
+if __name__ == "__main__":
+    num_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    all_results = benchmark_startup(num_repeats)
+    for entry_name, result in all_results.items():
+        print(f"{entry_name:10s} {result['import_time']:8.3f} s {result['num_modules']:5d} modules  "
+              f"heavy: {', '.join(result['heavy_modules']) or '-'}")
+    if len(sys.argv) > 2:
+        Path(sys.argv[2]).write_text(json.dumps(all_results, indent=2))
@@ -0,0 +1,174 @@
+from json import loads
+from math import pi
+from typing import Callable, Dict, NamedTuple
+
+import numpy as np
+
+from ghedesigner.borehole import GHEBorehole
+from ghedesigner.borehole_heat_exchangers import SingleUTube
+from ghedesigner.coordinates import rectangle
+from ghedesigner.enums import BHPipeType, TimestepType
+from ghedesigner.gfunction import calc_g_func_for_multiple_lengths, calculate_g_function
+from ghedesigner.ground_heat_exchangers import GHE
+from ghedesigner.ground_loads import HybridLoad
+from ghedesigner.manager import setup_manager_from_inputs
+from ghedesigner.radial_numerical_borehole import RadialNumericalBH
+from ghedesigner.rowwise import field_optimization_fr, field_optimization_wp_space_fr, gen_shape
+from ghedesigner.tests.shared_inputs import DEMOS_DIRECTORY, TEST_DATA_DIRECTORY, single_u_tube_inputs
+
+
+class BenchmarkCase(NamedTuple):
+    # returns the arguments passed to run, setup is not timed
+    setup: Callable
+    run: Callable
+    repeat: int = 3
+
+
+class BenchmarkFixtures:
+    """
+    The inputs shared by the benchmark cases, built from the shared test inputs and demo files.
+    """
+
+    def __init__(self):
+        inputs = single_u_tube_inputs()
+        self.fluid = inputs.fluid
+        self.grout = inputs.grout
+        self.soil = inputs.soil
+        self.pipe = inputs.pipe
+        self.borehole = inputs.borehole
+        self.b = inputs.b
+        self.m_flow_borehole = inputs.m_flow_borehole
+        self.log_time = inputs.log_time
+        self.sim_params = inputs.sim_params
+        self.hourly_loads = inputs.hourly_loads
+        self._g_function = None
+
+    def single_u_tube(self) -> SingleUTube:
+        return SingleUTube(self.m_flow_borehole, self.fluid, self.borehole, self.pipe, self.grout, self.soil)
+
+    def ghe(self) -> GHE:
+        # 12 x 13 field, as in the simulation tests
+        nx = 12
+        ny = 13
+        if self._g_function is None:
+            coordinates = rectangle(nx, ny, self.b, self.b)
+            self._g_function = calc_g_func_for_multiple_lengths(
+                self.b, [24.0, 48.0, 96.0, 192.0, 384.0], self.borehole.r_b, self.borehole.D, self.m_flow_borehole,
+                BHPipeType.SINGLEUTUBE, self.log_time, coordinates, self.fluid, self.pipe, self.grout, self.soil)
+        borehole = GHEBorehole(self.borehole.H, self.borehole.D, self.borehole.r_b, x=0.0, y=0.0)
+        return GHE(0.2 * nx * ny, self.b, BHPipeType.SINGLEUTUBE, self.fluid, borehole, self.pipe,
+                   self.grout, self.soil, self._g_function, self.sim_params, self.hourly_loads)
+
+    def demo_manager(self, demo_file_name: str):
+        inputs = loads((DEMOS_DIRECTORY / demo_file_name).read_text())
+        return setup_manager_from_inputs(inputs, DEMOS_DIRECTORY)
+
+    def polygon(self, file_name: str) -> list:
+        return np.loadtxt(TEST_DATA_DIRECTORY / file_name, delimiter=',', skiprows=1).tolist()
+
+
+FIXTURES: Dict[str, BenchmarkFixtures] = {}
+
+
+def fixtures() -> BenchmarkFixtures:
+    # built on first use, so listing the cases stays cheap
+    if 'default' not in FIXTURES:
+        FIXTURES['default'] = BenchmarkFixtures()
+    return FIXTURES['default']
+
+
+def g_function_case(nx: int, ny: int) -> BenchmarkCase:
+    def setup():
+        f = fixtures()
+        alpha = f.soil.k / f.soil.rhoCp
+        time_values = np.exp(f.log_time) * f.borehole.H ** 2 / (9.0 * alpha)
+        return (f.m_flow_borehole, BHPipeType.SINGLEUTUBE, time_values, rectangle(nx, ny, f.b, f.b), f.borehole,
+                f.fluid, f.pipe, f.grout, f.soil)
+
+    return BenchmarkCase(setup, calculate_g_function, repeat=1 if nx * ny > 100 else 3)
+
+
+def setup_sts():
+    bhe = fixtures().single_u_tube()
+    return RadialNumericalBH(bhe), bhe
+
+
+def run_sts(radial_numerical, bhe):
+    radial_numerical.calc_sts_g_functions(bhe)
+
+
+def setup_hybrid_load():
+    f = fixtures()
+    bhe = f.single_u_tube()
+    radial_numerical = RadialNumericalBH(bhe)
+    radial_numerical.calc_sts_g_functions(bhe)
+    return f.hourly_loads, bhe, radial_numerical, f.sim_params
+
+
+def setup_simulate_hybrid():
+    ghe = fixtures().ghe()
+    g, _ = ghe.grab_g_function(ghe.B_spacing / ghe.bhe.b.H)
+    return ghe, ghe.hybrid_load.load[2:] * 1000.0, ghe.hybrid_load.hour[2:], g
+
+
+def setup_simulate_hourly():
+    # one year, the cost grows with the square of the number of hours
+    ghe = fixtures().ghe()
+    g, _ = ghe.grab_g_function(ghe.B_spacing / ghe.bhe.b.H)
+    return ghe, -1.0 * ghe.hourly_extraction_ground_loads, np.arange(1, 8761, dtype=np.float64), g
+
+
+def run_simulate_detailed(ghe, q_dot, time_values, g):
+    ghe._simulate_detailed(q_dot, time_values, g)
+
+
+def setup_size():
+    return fixtures().ghe(),
+
+
+def run_size(ghe):
+    ghe.size(method=TimestepType.HYBRID)
+
+
+def search_case(demo_file_name: str) -> BenchmarkCase:
+    def setup():
+        return fixtures().demo_manager(demo_file_name),
+
+    def run(manager):
+        manager._design.find_design()
+
+    return BenchmarkCase(setup, run, repeat=1)
+
+
+def setup_rowwise():
+    f = fixtures()
+    prop_bound, ng_zones = gen_shape(f.polygon('polygon_property_boundary.csv'),
+                                     ng_zones=[f.polygon('polygon_building.csv')])
+    return prop_bound, ng_zones
+
+
+def run_rowwise(prop_bound, ng_zones):
+    field_optimization_fr(15.0, 1, prop_bound, ng_zones=ng_zones, rotate_start=-pi / 2, rotate_stop=pi / 2)
+
+
+def run_rowwise_perimeter(prop_bound, ng_zones):
+    field_optimization_wp_space_fr(0.7, 15.0, 1, prop_bound, ng_zones=ng_zones, rotate_start=-pi / 2,
+                                   rotate_stop=pi / 2)
+
+
+BENCHMARKS: Dict[str, BenchmarkCase] = {
+    'g_function_5x5': g_function_case(5, 5),
+    'g_function_10x10': g_function_case(10, 10),
+    'g_function_20x20': g_function_case(20, 20),
+    'sts_g_function': BenchmarkCase(setup_sts, run_sts),
+    'hybrid_load': BenchmarkCase(setup_hybrid_load, HybridLoad),
+    'simulate_detailed_hybrid': BenchmarkCase(setup_simulate_hybrid, run_simulate_detailed),
+    'simulate_detailed_hourly': BenchmarkCase(setup_simulate_hourly, run_simulate_detailed, repeat=1),
+    'ghe_size': BenchmarkCase(setup_size, run_size),
+    'search_bisection_1d': search_case('find_design_near_square_single_u_tube.json'),
+    'search_bisection_2d': search_case('find_design_bi_rectangle_single_u_tube.json'),
+    'search_bisection_zd': search_case('find_design_bi_zoned_rectangle_single_u_tube.json'),
+    'search_rowwise': search_case('find_design_rowwise_single_u_tube.json'),
+    'rowwise_layout': BenchmarkCase(setup_rowwise, run_rowwise),
+    'rowwise_layout_perimeter': BenchmarkCase(setup_rowwise, run_rowwise_perimeter),
+}
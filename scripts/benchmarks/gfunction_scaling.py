@@ -0,0 +1,235 @@
+import sys
+import tracemalloc
+from itertools import product
+from json import dumps, loads
+from math import ceil, sqrt
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+import click
+import numpy as np
+
+from ghedesigner.coordinates import CoordinateArray, rectangle, zoned_rectangle
+from ghedesigner.enums import BHPipeType
+from ghedesigner.gfunction import calculate_g_function
+
+from .cases import fixtures
+
+DEFAULT_SIZES = [10, 25, 50, 100, 200, 500, 1000, 2000]
+SOLVERS = ["equivalent", "similarities", "detailed"]
+BOUNDARIES = ["UHTR", "UBWT", "MIFT"]
+LAYOUTS = ["rectangle", "zoned_rectangle"]
+
+
+def synthetic_field(num_boreholes: int, layout: str = "rectangle", spacing: float = 5.0) -> CoordinateArray:
+    """
+    Generates a near-square field with about the requested number of boreholes.
+
+    :param num_boreholes: requested number of boreholes.
+    :param layout: 'rectangle' for a full grid, 'zoned_rectangle' for a perimeter at the spacing
+     with a coarser interior grid, holding about half the boreholes.
+    :param spacing: borehole spacing, in m.
+    :returns: the borehole coordinates, whose length is the actual number of boreholes
+    """
+
+    if layout == "rectangle":
+        n_x = ceil(sqrt(num_boreholes))
+        n_y = max(1, round(num_boreholes / n_x))
+        return rectangle(n_x, n_y, spacing, spacing)
+    elif layout == "zoned_rectangle":
+        # n_x boreholes per side, so about 4 * n_x on the perimeter and the rest in the interior
+        n_x = max(3, ceil(num_boreholes / 8.0 + 1.0))
+        n_interior = max(1, round(sqrt(max(num_boreholes - 4 * (n_x - 1), 1))))
+        return zoned_rectangle(n_x, n_x, spacing, spacing, n_interior, n_interior)
+    raise ValueError(f"Unknown layout: {layout}")
+
+
+def measure_g_function(coordinates, solver: str, boundary: str, n_segments: int,
+                       measure_memory: bool = True) -> Tuple[float, Optional[float]]:
+    """
+    Runs calculate_g_function on a field with the fixture borehole, pipe and soil.
+
+    :returns: the run time in seconds, and the tracemalloc peak memory in MB, or None if not measured
+    """
+
+    f = fixtures()
+    alpha = f.soil.k / f.soil.rhoCp
+    time_values = np.exp(f.log_time) * f.borehole.H ** 2 / (9.0 * alpha)
+
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        start_time = perf_counter()
+        calculate_g_function(f.m_flow_borehole, BHPipeType.SINGLEUTUBE, time_values, coordinates, f.borehole,
+                             f.fluid, f.pipe, f.grout, f.soil, n_segments=n_segments, solver=solver,
+                             boundary=boundary)
+        elapsed = perf_counter() - start_time
+        peak_memory = tracemalloc.get_traced_memory()[1] / 1e6 if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return elapsed, peak_memory
+
+
+def fit_scaling(num_boreholes: List[int], values: List[float]) -> Optional[Dict[str, float]]:
+    """
+    Fits value = overhead + coefficient * num_boreholes ** exponent by least squares.
+
+    The fixed overhead, e.g. of the time steps and the solver setup, dominates small fields,
+    so it is fitted separately from the growth with the field size. With two field sizes, the
+    overhead is taken as zero.
+
+    :returns: the overhead, coefficient and exponent, or None if there are fewer than two usable points
+    """
+
+    points = sorted((n, v) for n, v in zip(num_boreholes, values) if n > 0 and v is not None and v > 0)
+    if len({n for n, _ in points}) < 2:
+        return None
+    n_arr = np.array([n for n, _ in points], dtype=np.float64)
+    v_arr = np.array([v for _, v in points], dtype=np.float64)
+
+    # power law fit in log-log space, also the initial guess of the full fit
+    exponent, log_coefficient = np.polyfit(np.log(n_arr), np.log(v_arr), 1)
+    fit = {'overhead': 0.0, 'coefficient': float(np.exp(log_coefficient)), 'exponent': float(exponent)}
+    if len(points) < 3:
+        return fit
+
+    from scipy.optimize import curve_fit
+
+    def model(n, overhead, coefficient, exp):
+        return overhead + coefficient * n ** exp
+
+    try:
+        p0 = [0.0, fit['coefficient'], min(max(fit['exponent'], 0.0), 4.0)]
+        params, _ = curve_fit(model, n_arr, v_arr, p0=p0, bounds=([0.0, 0.0, 0.0], [np.inf, np.inf, 4.0]),
+                              sigma=v_arr, maxfev=10000)
+    except (RuntimeError, ValueError):
+        return fit
+    return {'overhead': float(params[0]), 'coefficient': float(params[1]), 'exponent': float(params[2])}
+
+
+def predict(fit: Dict[str, float], num_boreholes: int) -> float:
+    return fit['overhead'] + fit['coefficient'] * num_boreholes ** fit['exponent']
+
+
+def config_name(layout: str, solver: str, boundary: str, n_segments: int) -> str:
+    return f"{layout}/{solver}/{boundary}/{n_segments}"
+
+
+def run_scaling_study(sizes: List[int], solvers: List[str], boundaries: List[str], n_segments_list: List[int],
+                      layouts: List[str], max_time: float = 60.0, measure_memory: bool = True) -> dict:
+    """
+    Measures the g-function cost of each configuration over the field sizes, and fits the scaling.
+
+    Sizes run in ascending order, and once a configuration takes longer than max_time,
+    its larger sizes are skipped.
+
+    :returns: the measurements, and the time and memory fits, by configuration name
+    """
+
+    configs = {}
+    for layout, solver, boundary, n_segments in product(layouts, solvers, boundaries, n_segments_list):
+        name = config_name(layout, solver, boundary, n_segments)
+        rows = []
+        for size in sorted(sizes):
+            coordinates = synthetic_field(size, layout)
+            elapsed, peak_memory = measure_g_function(coordinates, solver, boundary, n_segments, measure_memory)
+            rows.append({'num_boreholes': len(coordinates), 'time': elapsed, 'peak_memory': peak_memory})
+            memory_str = "" if peak_memory is None else f"{peak_memory:10.1f} MB"
+            print(f"{name:40s} {len(coordinates):6d} {elapsed:10.3f} s {memory_str}")
+            if elapsed > max_time:
+                break
+
+        num_boreholes = [r['num_boreholes'] for r in rows]
+        configs[name] = {
+            'layout': layout, 'solver': solver, 'boundary': boundary, 'n_segments': n_segments,
+            'measurements': rows,
+            'time_fit': fit_scaling(num_boreholes, [r['time'] for r in rows]),
+            'memory_fit': fit_scaling(num_boreholes, [r['peak_memory'] for r in rows]),
+        }
+    return configs
+
+
+def predict_costs(configs: dict, num_boreholes: int) -> List[dict]:
+    """
+    Predicts the g-function cost of each configuration for a field size, fastest first.
+
+    :param configs: results of run_scaling_study, or as read from its JSON output.
+    :param num_boreholes: number of boreholes of the field.
+    """
+
+    predictions = []
+    for name, config in configs.items():
+        if config['time_fit'] is None:
+            continue
+        largest = max(r['num_boreholes'] for r in config['measurements'])
+        predictions.append({
+            'config': name,
+            'time': predict(config['time_fit'], num_boreholes),
+            'peak_memory': None if config['memory_fit'] is None else predict(config['memory_fit'], num_boreholes),
+            'extrapolated': num_boreholes > largest,
+        })
+    return sorted(predictions, key=lambda p: p['time'])
+
+
+def format_fit_table(configs: dict) -> str:
+    lines = [f"{'Configuration':40s} {'Time fit (s)':>28s} {'Memory fit (MB)':>28s} {'Max nbh':>8s}"]
+    for name, config in configs.items():
+        fits = []
+        for fit in [config['time_fit'], config['memory_fit']]:
+            fits.append("-" if fit is None else
+                        f"{fit['overhead']:.2f} + {fit['coefficient']:.1e} * n^{fit['exponent']:.2f}")
+        largest = max(r['num_boreholes'] for r in config['measurements'])
+        lines.append(f"{name:40s} {fits[0]:>28s} {fits[1]:>28s} {largest:8d}")
+    return "\n".join(lines)
+
+
+def split_list(value: str, item_type=str) -> list:
+    return [item_type(x.strip()) for x in value.split(",") if x.strip()]
+
+
+@click.command(name="GHEDesignerGFunctionScaling")
+@click.option("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), show_default=True,
+              help="Comma separated numbers of boreholes.")
+@click.option("--solvers", default=",".join(SOLVERS), show_default=True, help="Comma separated pygfunction solvers.")
+@click.option("--boundaries", default=",".join(BOUNDARIES), show_default=True,
+              help="Comma separated boundary conditions.")
+@click.option("--n-segments", default="8", show_default=True, help="Comma separated numbers of segments.")
+@click.option("--layouts", default="rectangle", show_default=True,
+              help=f"Comma separated field layouts: {', '.join(LAYOUTS)}.")
+@click.option("--max-time", default=60.0, show_default=True, type=float,
+              help="Skip the larger fields of a configuration once it takes longer than this, in s.")
+@click.option("--no-memory", is_flag=True, default=False, help="Skip the tracemalloc peak memory measurements.")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Write the results and fits to this JSON file.")
+@click.option("--predict", "predict_nbh", type=click.IntRange(min=1),
+              help="Predict the cost of each configuration for this number of boreholes, from --results.")
+@click.option("--results", type=click.Path(exists=True, dir_okay=False),
+              help="Results of a previous run, used by --predict instead of running the study.")
+def run_scaling_study_from_cli(sizes, solvers, boundaries, n_segments, layouts, max_time, no_memory, output,
+                               predict_nbh, results):
+    if results:
+        configs = loads(Path(results).read_text())['configs']
+    else:
+        for layout in split_list(layouts):
+            if layout not in LAYOUTS:
+                print(f"Unknown layout: {layout}, aborting", file=sys.stderr)
+                sys.exit(1)
+        configs = run_scaling_study(split_list(sizes, int), split_list(solvers), split_list(boundaries),
+                                    split_list(n_segments, int), split_list(layouts), max_time, not no_memory)
+        if output:
+            Path(output).write_text(dumps({'configs': configs}, indent=2))
+
+    print(format_fit_table(configs))
+
+    if predict_nbh:
+        print(f"\nPredicted cost for {predict_nbh} boreholes, fastest first:")
+        for p in predict_costs(configs, predict_nbh):
+            memory_str = "" if p['peak_memory'] is None else f"{p['peak_memory']:10.1f} MB"
+            note = " (extrapolated)" if p['extrapolated'] else ""
+            print(f"{p['config']:40s} {p['time']:10.2f} s {memory_str}{note}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    run_scaling_study_from_cli()
@@ -0,0 +1,145 @@
+import platform
+import sys
+import tracemalloc
+from datetime import datetime
+from fnmatch import fnmatch
+from json import dumps, loads
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+import click
+
+from ghedesigner import VERSION
+
+from .cases import BENCHMARKS, BenchmarkCase
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def run_benchmark(case: BenchmarkCase, measure_memory: bool = True) -> dict:
+    """
+    Times a benchmark case and measures its peak memory.
+
+    The run time is the fastest of the repeats. The peak memory is measured with tracemalloc
+    in a separate run, since tracing slows down the run.
+
+    :param case: benchmark case.
+    :param measure_memory: whether to measure the peak memory.
+    :returns: the run time in seconds and the peak memory in MB, or None if not measured
+    """
+
+    times = []
+    for _ in range(case.repeat):
+        args = case.setup()
+        start_time = perf_counter()
+        case.run(*args)
+        times.append(perf_counter() - start_time)
+
+    peak_memory = None
+    if measure_memory:
+        args = case.setup()
+        tracemalloc.start()
+        try:
+            case.run(*args)
+            peak_memory = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+
+    return {'time': min(times), 'repeat': case.repeat, 'peak_memory': peak_memory}
+
+
+def run_benchmarks(names: List[str], measure_memory: bool = True) -> Dict[str, dict]:
+    results = {}
+    for name in names:
+        results[name] = run_benchmark(BENCHMARKS[name], measure_memory)
+        result = results[name]
+        memory_str = "" if result['peak_memory'] is None else f"{result['peak_memory']:10.1f} MB"
+        print(f"{name:30s} {result['time']:10.3f} s {memory_str}")
+    return results
+
+
+def compare_to_baseline(results: Dict[str, dict], baseline: Dict[str, dict], time_threshold: float,
+                        memory_threshold: float, min_time: float = 0.01) -> List[str]:
+    """
+    Compares benchmark results to a baseline.
+
+    :param results: benchmark results, by case name.
+    :param baseline: baseline results, by case name.
+    :param time_threshold: allowed relative increase of the run time.
+    :param memory_threshold: allowed relative increase of the peak memory.
+    :param min_time: run time increases smaller than this, in seconds, are treated as noise.
+    :returns: a message for each regression
+    """
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        if result['time'] > base['time'] * (1.0 + time_threshold) and result['time'] - base['time'] > min_time:
+            regressions.append(f"{name}: time {result['time']:.3f} s, baseline {base['time']:.3f} s")
+        if result['peak_memory'] is not None and base.get('peak_memory') is not None:
+            if result['peak_memory'] > base['peak_memory'] * (1.0 + memory_threshold):
+                regressions.append(f"{name}: peak memory {result['peak_memory']:.1f} MB, "
+                                   f"baseline {base['peak_memory']:.1f} MB")
+    return regressions
+
+
+@click.command(name="GHEDesignerBenchmarks")
+@click.option("-k", "--select", "patterns", multiple=True,
+              help="Only run cases matching this glob pattern, e.g. 'g_function_*'. Can be repeated.")
+@click.option("-o", "--output", type=click.Path(dir_okay=False), help="Write the results to this JSON file.")
+@click.option("--baseline", type=click.Path(dir_okay=False), default=str(BASELINE_PATH), show_default=True,
+              help="Baseline results to compare against.")
+@click.option("--update-baseline", is_flag=True, default=False, help="Write the results to the baseline file.")
+@click.option("--time-threshold", type=float, default=0.25, show_default=True,
+              help="Allowed relative increase of the run time.")
+@click.option("--memory-threshold", type=float, default=0.10, show_default=True,
+              help="Allowed relative increase of the peak memory.")
+@click.option("--no-memory", is_flag=True, default=False, help="Skip the peak memory measurements.")
+@click.option("--list", "list_cases", is_flag=True, default=False, help="List the cases and exit.")
+def run_benchmarks_from_cli(patterns, output, baseline, update_baseline, time_threshold, memory_threshold,
+                            no_memory, list_cases):
+    names = [name for name in BENCHMARKS if not patterns or any(fnmatch(name, p) for p in patterns)]
+    if list_cases:
+        print("\n".join(names))
+        sys.exit(0)
+    if not names:
+        print("No benchmark cases selected, aborting", file=sys.stderr)
+        sys.exit(1)
+
+    results = run_benchmarks(names, measure_memory=not no_memory)
+    results_dict = {
+        'version': VERSION,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'time_stamp': datetime.now().isoformat(timespec='seconds'),
+        'results': results,
+    }
+
+    if output:
+        Path(output).write_text(dumps(results_dict, indent=2))
+
+    baseline_path = Path(baseline)
+    if update_baseline:
+        # keep the baseline of the cases that were not run
+        if baseline_path.exists():
+            previous = loads(baseline_path.read_text())['results']
+            results_dict['results'] = {**previous, **results}
+        baseline_path.write_text(dumps(results_dict, indent=2))
+        sys.exit(0)
+
+    if not baseline_path.exists():
+        print(f"No baseline found at {baseline_path}, skipping comparison", file=sys.stderr)
+        sys.exit(0)
+
+    regressions = compare_to_baseline(results, loads(baseline_path.read_text())['results'], time_threshold,
+                                      memory_threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    run_benchmarks_from_cli()
@@ -0,0 +1,33 @@
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+from .cases import BENCHMARKS, BenchmarkCase
+from .run_benchmarks import compare_to_baseline, run_benchmark
+
+
+class TestBenchmarks(GHEBaseTest):
+
+    def test_run_benchmark(self):
+        case = BenchmarkCase(lambda: (10000,), lambda n: list(range(n)), repeat=2)
+        result = run_benchmark(case)
+        self.assertEqual(result['repeat'], 2)
+        self.assertGreater(result['time'], 0.0)
+        self.assertGreater(result['peak_memory'], 0.0)
+        self.assertIsNone(run_benchmark(case, measure_memory=False)['peak_memory'])
+
+    def test_compare_to_baseline(self):
+        baseline = {'a': {'time': 1.0, 'peak_memory': 10.0}, 'b': {'time': 0.001, 'peak_memory': None}}
+        results = {'a': {'time': 1.2, 'peak_memory': 10.5}, 'b': {'time': 0.005, 'peak_memory': 1.0},
+                   'c': {'time': 5.0, 'peak_memory': 1.0}}
+        self.assertEqual(compare_to_baseline(results, baseline, 0.25, 0.10), [])
+
+        results['a'] = {'time': 1.5, 'peak_memory': 12.0}
+        regressions = compare_to_baseline(results, baseline, 0.25, 0.10)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith('a:') for r in regressions))
+
+    def test_cases_cover_hot_paths(self):
+        for name in ['sts_g_function', 'hybrid_load', 'simulate_detailed_hybrid', 'simulate_detailed_hourly',
+                     'ghe_size', 'search_bisection_1d', 'search_bisection_2d', 'search_bisection_zd',
+                     'search_rowwise', 'rowwise_layout']:
+            self.assertIn(name, BENCHMARKS)
+        self.assertGreaterEqual(len([name for name in BENCHMARKS if name.startswith('g_function_')]), 3)
@@ -0,0 +1,54 @@
+from ghedesigner.tests.ghe_base_case import GHEBaseTest
+
+from .gfunction_scaling import fit_scaling, predict, predict_costs, run_scaling_study, synthetic_field
+
+
+class TestGFunctionScaling(GHEBaseTest):
+
+    def test_synthetic_field(self):
+        for num_boreholes in [10, 100, 1000]:
+            self.assertAlmostEqual(len(synthetic_field(num_boreholes)), num_boreholes, delta=0.25 * num_boreholes)
+        zoned = synthetic_field(100, layout='zoned_rectangle')
+        self.assertAlmostEqual(len(zoned), 100, delta=20)
+        with self.assertRaises(ValueError):
+            synthetic_field(10, layout='circle')
+
+    def test_fit_scaling(self):
+        num_boreholes = [10, 20, 50, 100, 200]
+        fit = fit_scaling(num_boreholes, [0.5 + 0.01 * n ** 1.5 for n in num_boreholes])
+        self.assertAlmostEqual(fit['overhead'], 0.5, delta=0.01)
+        self.assertAlmostEqual(fit['exponent'], 1.5, delta=0.01)
+        self.assertAlmostEqual(predict(fit, 1000), 0.5 + 0.01 * 1000 ** 1.5, delta=1.0)
+
+        # pure power law from two points
+        fit = fit_scaling([10, 100], [1.0, 100.0])
+        self.assertEqual(fit['overhead'], 0.0)
+        self.assertAlmostEqual(fit['exponent'], 2.0)
+
+        self.assertIsNone(fit_scaling([10], [1.0]))
+        self.assertIsNone(fit_scaling([10, 20], [None, None]))
+
+    def test_predict_costs(self):
+        measurements = [{'num_boreholes': 10}, {'num_boreholes': 100}]
+        configs = {
+            'slow': {'time_fit': {'overhead': 0.0, 'coefficient': 1.0, 'exponent': 2.0}, 'memory_fit': None,
+                     'measurements': measurements},
+            'fast': {'time_fit': {'overhead': 1.0, 'coefficient': 0.1, 'exponent': 1.0},
+                     'memory_fit': {'overhead': 0.0, 'coefficient': 1.0, 'exponent': 1.0},
+                     'measurements': measurements},
+            'none': {'time_fit': None, 'memory_fit': None, 'measurements': measurements},
+        }
+        predictions = predict_costs(configs, 50)
+        self.assertEqual([p['config'] for p in predictions], ['fast', 'slow'])
+        self.assertAlmostEqual(predictions[0]['time'], 6.0)
+        self.assertAlmostEqual(predictions[0]['peak_memory'], 50.0)
+        self.assertIsNone(predictions[1]['peak_memory'])
+        self.assertFalse(predictions[0]['extrapolated'])
+        self.assertTrue(predict_costs(configs, 500)[0]['extrapolated'])
+
+    def test_run_scaling_study(self):
+        configs = run_scaling_study([4, 9], ['equivalent'], ['UHTR'], [8], ['rectangle'], measure_memory=False)
+        config = configs['rectangle/equivalent/UHTR/8']
+        self.assertEqual([r['num_boreholes'] for r in config['measurements']], [4, 9])
+        self.assertIsNotNone(config['time_fit'])
+        self.assertIsNone(config['memory_fit'])
@@ -32,7 +32,11 @@ setup(
     author='Jeffrey D. Spitler',
     author_email='spitler@okstate.edu',
     entry_points={
-        'console_scripts': ['ghedesigner=ghedesigner.manager:run_manager_from_cli']
+        'console_scripts': [
+            'ghedesigner=ghedesigner.manager:run_manager_from_cli',
+            'ghedesigner-server=ghedesigner.server:run_server_from_cli',
+            'ghedesigner-sweep=ghedesigner.sweep:run_sweep_from_cli'
+        ]
     },
     python_requires='>=3.8',
     classifiers=[